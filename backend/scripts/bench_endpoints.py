@@ -0,0 +1,269 @@
+"""Benchmark the hot API routes and fail on latency regressions.
+
+Boots the FastAPI app in-process (httpx ASGI transport, no network), fills a
+throwaway database with the synthetic dataset and drives each route at the
+configured concurrency, reporting throughput and p50/p95/p99 latency:
+
+    python scripts/bench_endpoints.py --in-memory --requests 500 --concurrency 16
+    python scripts/bench_endpoints.py --mongo-url mongodb://localhost:27017 \\
+        --baseline bench_results/baseline.json --max-regression 0.25
+
+--in-memory uses mongomock-motor (pip install mongomock-motor) instead of a
+mongod; it is good for catching Python-side regressions, not query plans.
+Results are written to bench_results/<timestamp>.json. With --baseline the
+script exits with status 1 when a route's p95 is more than --max-regression
+slower than the baseline; --save-baseline stores this run as the baseline.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+# Must be set before server is imported: no real LLM calls, no rate limiting
+# of the benchmark client itself, and synthetic fixtures allowed.
+os.environ.setdefault("LLM_PROVIDER", "fake")
+os.environ.setdefault("JOB_WORKERS", "0")
+os.environ["CMS_ALLOW_SYNTHETIC_DATA"] = "1"
+for name in ("RATE_LIMIT_IP_BURST", "RATE_LIMIT_IP_PER_MINUTE", "RATE_LIMIT_EMAIL_BURST"):
+    os.environ.setdefault(name, "100000000")
+os.environ.setdefault("RATE_LIMIT_ROUTE_CONCURRENCY", "100000")
+
+
+def route_scenarios(pages: int, posts: int, admin_headers: dict) -> list:
+    """(name, method, url(i), json body(i) or None, headers) for every benchmarked route."""
+    return [
+        ("GET page by slug", "GET", lambda i: f"/api/pages/slug/synthetic-page-{i % pages}", None, {}),
+        ("GET menu (rendered)", "GET", lambda i: "/api/menus/header?lang=hr", None, {}),
+        ("GET menu (raw)", "GET", lambda i: "/api/menus/header", None, {}),
+        ("GET blog list", "GET", lambda i: f"/api/blog/posts?limit=10&offset={(i * 10) % max(posts, 1)}", None, {}),
+        ("GET blog search", "GET", lambda i: "/api/blog/posts?search=apartment&limit=10", None, {}),
+        ("GET faqs", "GET", lambda i: "/api/faqs", None, {}),
+        ("GET testimonials", "GET", lambda i: "/api/testimonials", None, {}),
+        ("GET snippets for path", "GET", lambda i: f"/api/settings/snippets?path=/blog/post-{i % 50}", None, {}),
+        (
+            "POST contact",
+            "POST",
+            lambda i: "/api/contact",
+            lambda i: {
+                "full_name": "Bench User",
+                "email": f"bench.{i}@example.com",
+                "subject": "Benchmark",
+                "message": "Benchmark message",
+            },
+            {},
+        ),
+        (
+            "POST newsletter subscribe",
+            "POST",
+            lambda i: "/api/newsletter/subscribe",
+            lambda i: {"email": f"bench.subscriber.{i}@example.com"},
+            {},
+        ),
+        (
+            "PATCH page title",
+            "PATCH",
+            lambda i: "/api/pages/{page_id}",
+            lambda i: [{"op": "replace", "path": "/title/en", "value": f"Benchmark {i}"}],
+            admin_headers,
+        ),
+    ]
+
+
+async def prepare_fixtures(server, args) -> dict:
+    await server.create_indexes()
+    await server.generate_synthetic_data(
+        server.SyntheticDataRequest(
+            seed=args.seed,
+            blog_posts=args.posts,
+            pages=args.pages,
+            sections_per_page=args.sections_per_page,
+            faqs=100,
+            testimonials=20,
+        )
+    )
+    await server.seed_core_pages_and_menus()
+    await server.save_snippet_settings(
+        server.SnippetSettings(
+            global_head_html="<meta name='bench'>",
+            rules=[
+                server.SnippetRule(name=f"rule {i}", path_pattern=f"/blog/post-{i}*", head_html=f"<!-- {i} -->")
+                for i in range(200)
+            ],
+        )
+    )
+    page = await server.db.pages.find_one({"slug": "synthetic-page-0"}, {"_id": 0, "id": 1})
+    tokens = await server.issue_session_tokens("bench", "owner")
+    return {"page_id": page["id"], "admin_headers": {"Authorization": f"Bearer {tokens['access_token']}"}}
+
+
+async def run_scenario(client, method, make_url, make_body, headers, fixtures, args) -> dict:
+    latencies = []
+    errors = 0
+    counter = iter(range(args.warmup + args.requests))
+    warmup_left = args.warmup
+
+    async def worker():
+        nonlocal errors, warmup_left
+        for i in counter:
+            url = make_url(i).replace("{page_id}", fixtures["page_id"])
+            body = make_body(i) if make_body else None
+            started = time.perf_counter()
+            response = await client.request(method, url, json=body, headers=headers)
+            elapsed = (time.perf_counter() - started) * 1000
+            if warmup_left > 0:
+                warmup_left -= 1
+                continue
+            latencies.append(elapsed)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    wall = time.perf_counter() - started
+
+    from server import percentile
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / wall, 1) if wall > 0 else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "max_ms": round(latencies[-1], 3) if latencies else 0.0,
+    }
+
+
+def compare_to_baseline(results: dict, baseline: dict, max_regression: float, min_delta_ms: float) -> list:
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get("routes", {}).get(name)
+        if not previous:
+            continue
+        limit = previous["p95_ms"] * (1 + max_regression)
+        if current["p95_ms"] > limit and current["p95_ms"] - previous["p95_ms"] > min_delta_ms:
+            regressions.append(f"{name}: p95 {current['p95_ms']:.2f} ms vs baseline {previous['p95_ms']:.2f} ms")
+    return regressions
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+async def main(args) -> int:
+    if args.in_memory:
+        os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+    else:
+        os.environ["MONGO_URL"] = args.mongo_url
+    os.environ["DB_NAME"] = args.db_name
+
+    import httpx
+    import server
+
+    if args.in_memory:
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError:
+            print("--in-memory needs mongomock-motor: pip install mongomock-motor", file=sys.stderr)
+            return 2
+        server.client = AsyncMongoMockClient()
+        server.db = server.client[args.db_name]
+    else:
+        await server.client.drop_database(args.db_name)
+
+    try:
+        fixtures = await prepare_fixtures(server, args)
+        scenarios = route_scenarios(args.pages, args.posts, fixtures["admin_headers"])
+        if args.only:
+            scenarios = [s for s in scenarios if any(word.lower() in s[0].lower() for word in args.only)]
+
+        results = {}
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name, method, make_url, make_body, headers in scenarios:
+                results[name] = await run_scenario(client, method, make_url, make_body, headers, fixtures, args)
+                r = results[name]
+                print(
+                    f"{name:<28} {r['rps']:>8.1f} req/s  p50 {r['p50_ms']:>7.2f}  p95 {r['p95_ms']:>7.2f}  "
+                    f"p99 {r['p99_ms']:>7.2f} ms  errors {r['errors']}"
+                )
+    finally:
+        if not args.in_memory and not args.keep_db:
+            await server.client.drop_database(args.db_name)
+        server.client.close()
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "database": "mongomock" if args.in_memory else "mongod",
+        "settings": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "posts": args.posts,
+            "pages": args.pages,
+            "sections_per_page": args.sections_per_page,
+        },
+        "routes": results,
+    }
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output = output_dir / f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.json"
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {output}")
+    if args.save_baseline:
+        (output_dir / "baseline.json").write_text(json.dumps(report, indent=2))
+        print(f"Baseline saved to {output_dir / 'baseline.json'}")
+
+    failed = [name for name, r in results.items() if r["errors"]]
+    if failed:
+        print(f"FAIL: requests returned errors: {', '.join(failed)}")
+        return 1
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare_to_baseline(results, baseline, args.max_regression, args.min_delta_ms)
+        if regressions:
+            print("FAIL: latency regressions against baseline")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--in-memory", action="store_true", help="use mongomock-motor instead of a mongod")
+    target.add_argument("--mongo-url", default=os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    parser.add_argument("--db-name", default="cms_bench", help="database to create and drop (never a real one)")
+    parser.add_argument("--keep-db", action="store_true", help="do not drop the benchmark database afterwards")
+    parser.add_argument("--requests", type=int, default=300, help="measured requests per route")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured requests per route")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--sections-per-page", type=int, default=20)
+    parser.add_argument("--only", nargs="*", help="only routes whose name contains one of these words")
+    parser.add_argument("--output-dir", default=str(BACKEND_DIR / "bench_results"))
+    parser.add_argument("--baseline", help="baseline results JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="also store this run as baseline.json")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="allowed p95 slowdown (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="ignore p95 changes smaller than this")
+    sys.exit(asyncio.run(main(parser.parse_args())))
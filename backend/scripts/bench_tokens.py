@@ -0,0 +1,61 @@
+"""Microbenchmark for admin access token signing and verification.
+
+Admin routes verify the bearer token on every request without touching
+MongoDB, so verification has to stay in the microsecond range:
+
+    python scripts/bench_tokens.py --iterations 200000 --max-verify-us 20
+
+Exits with status 1 when uncached verification is slower than the limit.
+"""
+import argparse
+import os
+import sys
+import time
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# Importing server does not connect to MongoDB; these only satisfy its config lookups.
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "bench")
+
+import server  # noqa: E402
+
+
+def per_call_us(func, iterations: int) -> float:
+    return min(timeit.repeat(func, number=iterations, repeat=3)) / iterations * 1_000_000
+
+
+def main(iterations: int, max_verify_us: float) -> int:
+    secret = b"bench-secret-" + b"x" * 51
+    now = int(time.time())
+    claims = {"sub": "admin", "role": "owner", "sid": "bench-session", "iat": now, "exp": now + 900}
+    token = server.sign_access_token(claims, secret)
+
+    def verify_uncached():
+        server._verified_tokens.clear()
+        server.verify_access_token(token, secret)
+
+    results = {
+        "sign": per_call_us(lambda: server.sign_access_token(claims, secret), iterations),
+        "verify (uncached)": per_call_us(verify_uncached, iterations),
+        "verify (cached)": per_call_us(lambda: server.verify_access_token(token, secret), iterations),
+        "verify (bad signature)": per_call_us(
+            lambda: server.verify_access_token(token[:-4] + "AAAA", secret), iterations
+        ),
+    }
+    for name, value in results.items():
+        print(f"{name:<24} {value:8.2f} us")
+
+    if max_verify_us and results["verify (uncached)"] > max_verify_us:
+        print(f"FAIL: uncached verification above {max_verify_us} us")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=100000)
+    parser.add_argument("--max-verify-us", type=float, default=0, help="fail above this many microseconds (0 = off)")
+    args = parser.parse_args()
+    sys.exit(main(args.iterations, args.max_verify_us))
@@ -0,0 +1,111 @@
+"""Measure how long the API takes to import and build, and what it imports.
+
+Cold starts (autoscaled or scale-to-zero workers) pay for ``import server``
+and ``create_app()`` before the first request. This runs both in fresh
+interpreters, reports the time per top-level package (python -X importtime)
+and fails when the startup budget is exceeded or a lazily loaded subsystem
+is imported up front:
+
+    python scripts/import_profile.py
+    python scripts/import_profile.py --runs 5 --budget-ms 900
+
+Exits with status 1 when the median import + create_app time is above
+--budget-ms (0 = no budget) or one of the --forbid modules was imported.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Subsystems server.py only imports on first use (AI, Mailchimp and media
+# import, password hashing, the Mongo driver's async layer)
+DEFAULT_FORBIDDEN = ["aiohttp", "motor", "passlib", "bcrypt", "openai", "emergentintegrations"]
+
+STARTUP_SNIPPET = """
+import json, sys, time
+started = time.perf_counter()
+import server
+imported = time.perf_counter()
+server.create_app()
+built = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "create_app_ms": (built - imported) * 1000,
+    "modules": sorted({name.split(".")[0] for name in sys.modules}),
+}))
+"""
+
+
+def run_startup(importtime: bool) -> tuple:
+    env = dict(os.environ)
+    # Importing server does not connect to MongoDB; these only satisfy its config lookups.
+    env.setdefault("MONGO_URL", "mongodb://localhost:27017")
+    env.setdefault("DB_NAME", "import_profile")
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", STARTUP_SNIPPET]
+    result = subprocess.run(command, cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"import failed:\n{result.stderr[-4000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+
+def parse_importtime(stderr: str) -> list:
+    """(module, self_us, cumulative_us) for every module imported."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def main(args) -> int:
+    timings = [run_startup(importtime=False)[0] for _ in range(args.runs)]
+    totals = sorted(t["import_ms"] + t["create_app_ms"] for t in timings)
+    median_total = statistics.median(totals)
+    report, stderr = run_startup(importtime=True)
+    modules = parse_importtime(stderr)
+
+    by_package: dict = {}
+    for name, self_us, _ in modules:
+        package = name.split(".")[0]
+        by_package[package] = by_package.get(package, 0) + self_us
+    total_us = sum(by_package.values()) or 1
+
+    print(f"import server      median {statistics.median(t['import_ms'] for t in timings):8.1f} ms")
+    print(f"create_app()       median {statistics.median(t['create_app_ms'] for t in timings):8.1f} ms")
+    print(f"total              median {median_total:8.1f} ms  (min {totals[0]:.1f}, max {totals[-1]:.1f}, {args.runs} runs)")
+    print()
+    print(f"Top packages by import time (self time of all their modules, -X importtime run):")
+    for package, self_us in sorted(by_package.items(), key=lambda item: item[1], reverse=True)[: args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  {self_us / total_us * 100:5.1f}%  {package}")
+    print()
+    print("Slowest modules:")
+    for name, self_us, cumulative_us in sorted(modules, key=lambda m: m[1], reverse=True)[: args.top]:
+        print(f"  {self_us / 1000:8.1f} ms self  {cumulative_us / 1000:8.1f} ms cumulative  {name}")
+
+    failed = False
+    loaded = sorted(set(args.forbid) & set(report["modules"]))
+    if loaded:
+        print(f"FAIL: imported at startup but meant to load on first use: {', '.join(loaded)}")
+        failed = True
+    if args.budget_ms and median_total > args.budget_ms:
+        print(f"FAIL: startup took {median_total:.1f} ms, budget is {args.budget_ms:.0f} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="timed startups (the median is checked)")
+    parser.add_argument("--top", type=int, default=15, help="packages and modules listed")
+    parser.add_argument("--budget-ms", type=float, default=0, help="fail above this import + create_app time (0 = off)")
+    parser.add_argument(
+        "--forbid", nargs="*", default=DEFAULT_FORBIDDEN, help="top-level modules that must not load at startup"
+    )
+    sys.exit(main(parser.parse_args()))
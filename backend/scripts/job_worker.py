@@ -0,0 +1,44 @@
+"""Run background job workers without serving HTTP.
+
+Long-running admin jobs (translate-all, media import, seeding) are picked up
+from the ``jobs`` collection by any process that runs a JobRunner. Start the
+API with JOB_WORKERS=0 and run this script next to it to keep that work off
+the event loop that serves live traffic:
+
+    python scripts/job_worker.py --workers 2
+"""
+import argparse
+import asyncio
+import signal
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import server  # noqa: E402
+
+
+async def main(workers: int) -> None:
+    await server.create_indexes()
+    server.job_runner.workers = workers
+    await server.job_runner.start()
+    # Stalls caused by job handlers are logged with the blocking stack
+    await server.loop_monitor.start()
+    server.logger.info("Job worker %s started with %s workers", server.job_runner.worker_id, workers)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await stop.wait()
+
+    await server.job_runner.stop()
+    await server.loop_monitor.stop()
+    server.client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=2, help="concurrent job workers in this process")
+    args = parser.parse_args()
+    asyncio.run(main(args.workers))
@@ -0,0 +1,76 @@
+"""Fill the configured database with a deterministic synthetic dataset.
+
+Generates multilingual blog posts, pages, subscribers, FAQs, testimonials and
+contact messages shaped like the ones the API writes, for load and scale
+testing. The same --seed always produces the same documents:
+
+    CMS_ALLOW_SYNTHETIC_DATA=1 python scripts/synthetic_data.py \\
+        --blog-posts 50000 --subscribers 1000000 --pages 500 --sections-per-page 40
+
+Every generated document has ``synthetic: true``; remove them with --purge.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import server  # noqa: E402
+
+
+async def main(args: argparse.Namespace) -> int:
+    if not server.SYNTHETIC_DATA_ALLOWED:
+        print("Refusing to write synthetic data: set CMS_ALLOW_SYNTHETIC_DATA=1 for this database", file=sys.stderr)
+        return 2
+
+    try:
+        if args.purge:
+            print(json.dumps({"deleted": await server.delete_synthetic_data()}, indent=2))
+            return 0
+
+        spec = server.SyntheticDataRequest(
+            seed=args.seed,
+            blog_posts=args.blog_posts,
+            pages=args.pages,
+            sections_per_page=args.sections_per_page,
+            paragraphs_per_post=args.paragraphs_per_post,
+            subscribers=args.subscribers,
+            faqs=args.faqs,
+            testimonials=args.testimonials,
+            contact_messages=args.contact_messages,
+            batch_size=args.batch_size,
+            replace=args.replace,
+        )
+        last_report = 0.0
+
+        async def progress(done: int, total: int) -> None:
+            nonlocal last_report
+            if time.monotonic() - last_report >= 2 or done == total:
+                last_report = time.monotonic()
+                print(f"{done}/{total} documents", file=sys.stderr)
+
+        result = await server.generate_synthetic_data(spec, progress)
+        print(json.dumps(result, indent=2))
+        return 0
+    finally:
+        server.client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--blog-posts", type=int, default=0)
+    parser.add_argument("--pages", type=int, default=0)
+    parser.add_argument("--sections-per-page", type=int, default=10)
+    parser.add_argument("--paragraphs-per-post", type=int, default=6)
+    parser.add_argument("--subscribers", type=int, default=0)
+    parser.add_argument("--faqs", type=int, default=0)
+    parser.add_argument("--testimonials", type=int, default=0)
+    parser.add_argument("--contact-messages", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=1000, help="documents per insert_many")
+    parser.add_argument("--replace", action="store_true", help="delete earlier synthetic documents first")
+    parser.add_argument("--purge", action="store_true", help="only delete synthetic documents")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,167 @@
+"""Summarize sampled request traces per route and show where the time went.
+
+Reads the OTLP/JSON span log written by the API (TRACE_SAMPLE_RATE > 0) and,
+for every route, prints latency percentiles and the spans on the critical
+path (the chain of work the response actually waited for), ranked by the
+time they contributed:
+
+    python scripts/trace_summary.py
+    python scripts/trace_summary.py traces/spans.jsonl --route /api/pages --slowest 3
+
+Time a span spends not waiting on a child (handler code, event loop lag) is
+attributed to the span itself.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+class Span:
+    def __init__(self, raw: dict):
+        self.trace_id = raw["traceId"]
+        self.span_id = raw["spanId"]
+        self.parent_id = raw.get("parentSpanId") or None
+        self.name = raw["name"]
+        self.kind = raw.get("kind", 1)
+        self.start = int(raw["startTimeUnixNano"]) / 1_000_000
+        self.end = int(raw["endTimeUnixNano"]) / 1_000_000
+        self.error = (raw.get("status") or {}).get("message") if (raw.get("status") or {}).get("code") == 2 else None
+        self.attributes = {}
+        for attribute in raw.get("attributes", []):
+            value = attribute["value"]
+            self.attributes[attribute["key"]] = next(iter(value.values())) if value else None
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    @property
+    def label(self) -> str:
+        collection = self.attributes.get("db.mongodb.collection")
+        return f"{self.name} {collection}" if collection else self.name
+
+
+def load_traces(paths: list) -> dict:
+    traces: dict = {}
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError:
+                    print(f"{path}:{line_number}: skipping invalid JSON", file=sys.stderr)
+                    continue
+                for resource in request.get("resourceSpans", []):
+                    for scope in resource.get("scopeSpans", []):
+                        for raw in scope.get("spans", []):
+                            span = Span(raw)
+                            traces.setdefault(span.trace_id, []).append(span)
+    return traces
+
+
+def find_root(spans: list):
+    ids = {span.span_id for span in spans}
+    roots = [span for span in spans if span.parent_id is None or span.parent_id not in ids]
+    return min(roots, key=lambda span: span.start) if roots else None
+
+
+def critical_path(span, children: dict, start: float, end: float, contributions: dict) -> None:
+    """Add the critical-path time of ``span`` (clipped to ``start``..``end``) and
+    its descendants to ``contributions``, walking back from the span's end."""
+    cursor = end
+    for child in sorted(children.get(span.span_id, []), key=lambda s: s.end, reverse=True):
+        child_end = min(child.end, cursor)
+        child_start = max(child.start, start)
+        if child_end <= child_start:
+            continue
+        contributions[span.label] = contributions.get(span.label, 0.0) + (cursor - child_end)
+        critical_path(child, children, child_start, child_end, contributions)
+        cursor = child_start
+    contributions[span.label] = contributions.get(span.label, 0.0) + max(0.0, cursor - start)
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def print_timeline(root, children: dict) -> None:
+    def walk(span, depth: int) -> None:
+        error = f"  ERROR {span.error}" if span.error else ""
+        print(f"      +{span.start - root.start:8.2f} ms {span.duration:8.2f} ms  {'  ' * depth}{span.label}{error}")
+        for child in sorted(children.get(span.span_id, []), key=lambda s: s.start):
+            walk(child, depth + 1)
+
+    walk(root, 0)
+
+
+def summarize(traces: dict, route_filter: str) -> dict:
+    routes: dict = {}
+    for spans in traces.values():
+        root = find_root(spans)
+        if root is None or (route_filter and route_filter not in root.name):
+            continue
+        children: dict = {}
+        for span in spans:
+            if span is not root:
+                children.setdefault(span.parent_id, []).append(span)
+        contributions: dict = {}
+        critical_path(root, children, root.start, root.end, contributions)
+        entry = routes.setdefault(root.name, {"durations": [], "contributions": {}, "errors": 0, "traces": []})
+        entry["durations"].append(root.duration)
+        entry["errors"] += 1 if root.error else 0
+        entry["traces"].append((root, children))
+        for label, ms in contributions.items():
+            entry["contributions"][label] = entry["contributions"].get(label, 0.0) + ms
+    return routes
+
+
+def main(args) -> int:
+    default = BACKEND_DIR / "traces" / "spans.jsonl"
+    # The rotated file (spans.jsonl.1) holds the older traces
+    rotated = default.with_name(default.name + ".1")
+    paths = args.paths or [str(path) for path in (rotated, default) if path.exists()] or [str(default)]
+    missing = [path for path in paths if not Path(path).exists()]
+    if missing:
+        print(f"No span log at {', '.join(missing)} (is TRACE_SAMPLE_RATE set?)", file=sys.stderr)
+        return 2
+    routes = summarize(load_traces(paths), args.route)
+    if not routes:
+        print("No traces found")
+        return 0
+
+    ranked = sorted(routes.items(), key=lambda item: sum(item[1]["durations"]), reverse=True)
+    for name, entry in ranked:
+        durations = sorted(entry["durations"])
+        count = len(durations)
+        total = sum(durations)
+        print(
+            f"{name}  traces {count}  errors {entry['errors']}  p50 {percentile(durations, 50):.2f} ms  "
+            f"p95 {percentile(durations, 95):.2f} ms  max {durations[-1]:.2f} ms"
+        )
+        contributions = sorted(entry["contributions"].items(), key=lambda item: item[1], reverse=True)
+        for label, ms in contributions[: args.top]:
+            share = ms / total * 100 if total else 0.0
+            print(f"    {ms / count:9.2f} ms/req  {share:5.1f}%  {label}")
+        if args.slowest:
+            for root, children in sorted(entry["traces"], key=lambda t: t[0].duration, reverse=True)[: args.slowest]:
+                print(f"    trace {root.trace_id}  {root.duration:.2f} ms")
+                print_timeline(root, children)
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", help="span logs (default: traces/spans.jsonl and its .1)")
+    parser.add_argument("--route", default="", help="only routes containing this text")
+    parser.add_argument("--top", type=int, default=8, help="critical-path spans shown per route")
+    parser.add_argument("--slowest", type=int, default=0, help="also print the timeline of the N slowest traces")
+    sys.exit(main(parser.parse_args()))
@@ -1,38 +1,789 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Query, Body, UploadFile, File
+from fastapi import FastAPI, APIRouter, HTTPException, Query, Body, UploadFile, File, Depends, Header, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+import fastapi.routing
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from starlette.routing import Match
+from pymongo import DeleteOne, InsertOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, CollectionInvalid, DuplicateKeyError, OperationFailure
 import os
+import asyncio
+import base64
+import contextvars
+import copy
+import cProfile
+import fnmatch
+import functools
+import hashlib
+import hmac
+import importlib.util
+import inspect
+import json
 import logging
+import marshal
+import pstats
+import random
+import re
+import secrets
+import socket
+import sys
+import threading
+import time
+import traceback
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from pydantic import BaseModel, Field, ConfigDict, EmailStr
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, Field, ConfigDict, EmailStr, ValidationError
+from typing import List, Optional, Dict, Any, Awaitable, Callable, Tuple, TypeVar, Union
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from enum import Enum
-from passlib.context import CryptContext
+
+T = TypeVar("T")
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# Media directory for uploaded files
+# Media directory for uploaded files (created by create_app)
 MEDIA_ROOT = ROOT_DIR / "media"
-MEDIA_ROOT.mkdir(exist_ok=True)
 
-# MongoDB connection
+# ==================== METRICS ====================
+
+# Prometheus metrics served at /metrics: per-route latency and in-flight
+# requests, MongoDB command timings and connection pool checkout waits (from
+# pymongo's monitoring hooks, so they must exist before the client is
+# created), and latency/errors of outbound calls. With several worker
+# processes set PROMETHEUS_MULTIPROC_DIR so /metrics aggregates all of them.
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from pymongo import monitoring
+
+HTTP_REQUESTS = Counter("http_requests_total", "HTTP requests", ["method", "route", "status"])
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency, including streamed response bodies",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests being served", ["method", "route"], multiprocess_mode="livesum"
+)
+MONGO_COMMAND_DURATION = Histogram(
+    "mongo_command_duration_seconds",
+    "MongoDB command latency as seen by the driver",
+    ["command", "collection"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+MONGO_COMMAND_FAILURES = Counter("mongo_command_failures_total", "Failed MongoDB commands", ["command", "collection"])
+MONGO_POOL_CHECKOUT_WAIT = Histogram(
+    "mongo_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled MongoDB connection",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5),
+)
+MONGO_POOL_CHECKOUT_FAILURES = Counter(
+    "mongo_pool_checkout_failures_total", "Failed MongoDB connection checkouts", ["reason"]
+)
+MONGO_POOL_CONNECTIONS = Gauge(
+    "mongo_pool_connections", "Open pooled MongoDB connections", ["state"], multiprocess_mode="livesum"
+)
+OUTBOUND_CALL_DURATION = Histogram(
+    "outbound_call_duration_seconds",
+    "Latency of calls to external services",
+    ["service", "operation"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+OUTBOUND_CALL_ERRORS = Counter(
+    "outbound_call_errors_total", "Failed calls to external services", ["service", "operation", "reason"]
+)
+
+# Commands whose first value is not a collection name
+MONGO_ADMIN_COMMANDS = {"ping", "hello", "ismaster", "isMaster", "buildInfo", "endSessions", "saslStart", "saslContinue"}
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    def __init__(self):
+        # (connection, request id) -> collection; commands are only named in the started event
+        self._collections: Dict[Tuple[Any, int], str] = {}
+
+    def started(self, event) -> None:
+        name = event.command_name
+        collection = ""
+        if name == "getMore":
+            collection = event.command.get("collection", "")
+        elif name not in MONGO_ADMIN_COMMANDS:
+            value = event.command.get(name)
+            collection = value if isinstance(value, str) else ""
+        self._collections[(event.connection_id, event.request_id)] = collection
+
+    def succeeded(self, event) -> None:
+        collection = self._collections.pop((event.connection_id, event.request_id), "")
+        MONGO_COMMAND_DURATION.labels(event.command_name, collection).observe(event.duration_micros / 1_000_000)
+
+    def failed(self, event) -> None:
+        collection = self._collections.pop((event.connection_id, event.request_id), "")
+        MONGO_COMMAND_DURATION.labels(event.command_name, collection).observe(event.duration_micros / 1_000_000)
+        MONGO_COMMAND_FAILURES.labels(event.command_name, collection).inc()
+
+
+class MongoPoolMetrics(monitoring.ConnectionPoolListener):
+    """Checkout waits per connection request.
+
+    Motor runs pymongo operations on executor threads and a checkout starts
+    and finishes on the same thread, so the start time is kept thread-local.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def connection_check_out_started(self, event) -> None:
+        self._local.started = time.perf_counter()
+
+    def connection_checked_out(self, event) -> None:
+        started = getattr(self._local, "started", None)
+        if started is not None:
+            MONGO_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+            self._local.started = None
+        MONGO_POOL_CONNECTIONS.labels("in_use").inc()
+
+    def connection_check_out_failed(self, event) -> None:
+        self._local.started = None
+        MONGO_POOL_CHECKOUT_FAILURES.labels(str(event.reason)).inc()
+
+    def connection_checked_in(self, event) -> None:
+        MONGO_POOL_CONNECTIONS.labels("in_use").dec()
+
+    def connection_created(self, event) -> None:
+        MONGO_POOL_CONNECTIONS.labels("open").inc()
+
+    def connection_closed(self, event) -> None:
+        MONGO_POOL_CONNECTIONS.labels("open").dec()
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        pass
+
+
+class track_outbound:
+    """Time a call to an external service; usable around sync and async code::
+
+        with track_outbound("mailchimp", "subscribe") as call:
+            ...
+            if resp.status >= 400:
+                call.failed(f"http_{resp.status}")
+    """
+
+    def __init__(self, service: str, operation: str):
+        self.service = service
+        self.operation = operation
+
+    def failed(self, reason: str) -> None:
+        OUTBOUND_CALL_ERRORS.labels(self.service, self.operation, reason).inc()
+        if self._trace.span is not None:
+            self._trace.span.error = reason
+
+    def __enter__(self) -> "track_outbound":
+        # Also a client span when the calling request is traced
+        self._trace = trace_span(f"{self.service}.{self.operation}", "client", **{"peer.service": self.service})
+        self._trace.__enter__()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        OUTBOUND_CALL_DURATION.labels(self.service, self.operation).observe(time.perf_counter() - self._started)
+        if exc_type is not None and not issubclass(exc_type, asyncio.CancelledError):
+            self.failed(exc_type.__name__)
+        self._trace.__exit__(exc_type, exc, tb)
+
+
+mongo_command_metrics = MongoCommandMetrics()
+mongo_pool_metrics = MongoPoolMetrics()
+
+# ==================== SLOW QUERY LOG ====================
+
+# MongoDB commands slower than SLOW_QUERY_THRESHOLD_MS (0 = off) are written
+# to the capped slow_queries collection with the route that issued them and
+# the shape of their filter. The first time a shape is seen its query plan is
+# captured with explain() so collection scans stand out. Browse them at
+# /api/admin/slow-queries.
+SLOW_QUERY_THRESHOLD_MS = float(os.environ.get("SLOW_QUERY_THRESHOLD_MS", "100"))
+SLOW_QUERY_LOG_MAX_BYTES = int(os.environ.get("SLOW_QUERY_LOG_MAX_BYTES", str(16 * 1024 * 1024)))
+SLOW_QUERY_LOG_MAX_DOCS = int(os.environ.get("SLOW_QUERY_LOG_MAX_DOCS", "10000"))
+
+# Commands worth profiling, and where each keeps its filter
+SLOW_QUERY_FILTER_FIELDS = {
+    "find": "filter",
+    "aggregate": "pipeline",
+    "count": "query",
+    "distinct": "query",
+    "findAndModify": "query",
+    "update": "updates",
+    "delete": "deletes",
+    "getMore": None,
+}
+# Driver bookkeeping that must not be passed back to explain
+SLOW_QUERY_DRIVER_FIELDS = {
+    "$db", "lsid", "$clusterTime", "txnNumber", "$readPreference", "readConcern", "writeConcern",
+    "cursor", "batchSize", "singleBatch", "ordered", "comment",
+}
+
+request_route: contextvars.ContextVar[str] = contextvars.ContextVar("request_route", default="")
+
+
+def query_shape(value: Any) -> Any:
+    """Replace the values in a filter or pipeline with ``?``, keeping field names
+    and operators, so queries that differ only in their arguments group together."""
+    if isinstance(value, dict):
+        return {key: query_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        if value and all(isinstance(item, dict) for item in value):
+            return [query_shape(item) for item in value]
+        return "?"
+    return "?"
+
+
+def find_plan_stages(explain: Any) -> List[dict]:
+    """Every stage of the winning plan(s) in an explain result, including the
+    plans nested inside aggregation and write explains."""
+    stages: List[dict] = []
+
+    def walk(node: Any, in_plan: bool) -> None:
+        if isinstance(node, dict):
+            if in_plan and "stage" in node:
+                stages.append(node)
+            for key, item in node.items():
+                if key == "rejectedPlans":
+                    continue
+                walk(item, in_plan or key in ("winningPlan", "queryPlan"))
+        elif isinstance(node, list):
+            for item in node:
+                walk(item, in_plan)
+
+    walk(explain, False)
+    return stages
+
+
+def summarize_plan(stages: List[dict]) -> str:
+    parts = []
+    for stage in stages:
+        name = stage["stage"]
+        if stage.get("indexName"):
+            name = f"{name} {stage['indexName']}"
+        parts.append(name)
+    return " <- ".join(parts)
+
+
+class SlowQueryLog(monitoring.CommandListener):
+    """Command listener feeding slow commands to a background writer.
+
+    Listener callbacks run on Motor's executor threads, so entries are handed
+    to the event loop through a bounded queue and explain() / inserts happen
+    there. Motor copies the caller's context into the executor, which is how
+    ``request_route`` reaches ``started``.
+    """
+
+    def __init__(self, threshold_ms: float, queue_size: int = 1000, max_known_shapes: int = 5000):
+        self.threshold_ms = threshold_ms
+        self.max_known_shapes = max_known_shapes
+        self.dropped = 0
+        self._pending: Dict[Tuple[Any, int], dict] = {}
+        self._queue: "asyncio.Queue[dict]" = asyncio.Queue(maxsize=queue_size)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        # shape hash -> (collscan, plan summary); shapes are explained once per process
+        self._known_shapes: Dict[str, Tuple[Optional[bool], str]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold_ms > 0 and self._loop is not None
+
+    def started(self, event) -> None:
+        name = event.command_name
+        if not self.enabled or name not in SLOW_QUERY_FILTER_FIELDS:
+            return
+        collection = event.command.get("collection") if name == "getMore" else event.command.get(name)
+        if not isinstance(collection, str) or collection == "slow_queries":
+            return
+        self._pending[(event.connection_id, event.request_id)] = {
+            "command": dict(event.command),
+            "collection": collection,
+            "route": request_route.get() or "unknown",
+        }
+
+    def succeeded(self, event) -> None:
+        self._finish(event, failed=False)
+
+    def failed(self, event) -> None:
+        self._finish(event, failed=True)
+
+    def _finish(self, event, failed: bool) -> None:
+        pending = self._pending.pop((event.connection_id, event.request_id), None)
+        if pending is None:
+            return
+        duration_ms = event.duration_micros / 1000
+        if duration_ms < self.threshold_ms:
+            return
+        pending.update(
+            database=event.database_name,
+            command_name=event.command_name,
+            duration_ms=round(duration_ms, 3),
+            failed=failed,
+            at=datetime.now(timezone.utc),
+        )
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            loop.call_soon_threadsafe(self._enqueue, pending)
+        except RuntimeError:
+            # Event loop already closed (shutdown)
+            pass
+
+    def _enqueue(self, entry: dict) -> None:
+        try:
+            self._queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def start(self) -> None:
+        if self.threshold_ms <= 0 or self._task is not None:
+            return
+        try:
+            await db.create_collection(
+                "slow_queries", capped=True, size=SLOW_QUERY_LOG_MAX_BYTES, max=SLOW_QUERY_LOG_MAX_DOCS
+            )
+        except CollectionInvalid:
+            pass
+        except Exception:
+            logging.exception("Failed to create the slow_queries collection")
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.create_task(self._writer())
+
+    async def stop(self) -> None:
+        self._loop = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _writer(self) -> None:
+        while True:
+            entry = await self._queue.get()
+            try:
+                await self.record(entry)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logging.exception("Failed to record slow query")
+
+    async def record(self, entry: dict) -> None:
+        command = entry["command"]
+        name = entry["command_name"]
+        field = SLOW_QUERY_FILTER_FIELDS[name]
+        target = command.get(field) if field else None
+        if name in ("update", "delete") and target:
+            # Only the first statement of a multi-statement write
+            first = target[0]
+            target = first.get("q")
+        shape = {"filter": query_shape(target) if target is not None else None}
+        if command.get("sort"):
+            shape["sort"] = list(command["sort"].keys())
+        shape_json = json.dumps(shape, sort_keys=True, default=str)
+        shape_hash = hashlib.sha1(
+            f"{entry['collection']}|{name}|{shape_json}".encode("utf-8")
+        ).hexdigest()[:16]
+
+        doc = {
+            "id": str(uuid.uuid4()),
+            "at": entry["at"],
+            "route": entry["route"],
+            "database": entry["database"],
+            "collection": entry["collection"],
+            "command": name,
+            "shape_hash": shape_hash,
+            "shape": shape_json,
+            "duration_ms": entry["duration_ms"],
+            "failed": entry["failed"],
+        }
+        known = self._known_shapes.get(shape_hash)
+        if known is None and name != "getMore":
+            plan = await self.explain(entry["database"], command, name)
+            known = (plan["collscan"], plan["plan_summary"])
+            doc["plan"] = plan["plan"]
+            if len(self._known_shapes) >= self.max_known_shapes:
+                self._known_shapes.pop(next(iter(self._known_shapes)))
+            self._known_shapes[shape_hash] = known
+            if plan["collscan"]:
+                logging.warning(
+                    "Slow query on %s.%s from %s does a collection scan: %s",
+                    entry["database"], entry["collection"], entry["route"], shape_json,
+                )
+        if known is not None:
+            doc["collscan"], doc["plan_summary"] = known
+        await db.slow_queries.insert_one(doc)
+
+    async def explain(self, database: str, command: dict, name: str) -> dict:
+        explained = {key: value for key, value in command.items() if key not in SLOW_QUERY_DRIVER_FIELDS}
+        if name == "aggregate":
+            explained["cursor"] = {}
+        elif name in ("update", "delete"):
+            field = SLOW_QUERY_FILTER_FIELDS[name]
+            explained[field] = explained[field][:1]
+        try:
+            result = await client[database].command({"explain": explained, "verbosity": "queryPlanner"})
+        except Exception as exc:
+            return {"collscan": None, "plan_summary": f"explain failed: {exc}", "plan": None}
+        stages = find_plan_stages(result)
+        return {
+            "collscan": any(stage["stage"] == "COLLSCAN" for stage in stages),
+            "plan_summary": summarize_plan(stages),
+            # Plans contain $-prefixed operator keys, so they are stored as JSON text
+            "plan": json.dumps(result.get("queryPlanner", {}).get("winningPlan", result), default=str),
+        }
+
+
+slow_query_log = SlowQueryLog(SLOW_QUERY_THRESHOLD_MS)
+
+# ==================== TRACING ====================
+
+# A sampled fraction of requests (TRACE_SAMPLE_RATE, 0 = off) gets a span
+# timeline: the route, FastAPI dependency/validation, handler and response
+# serialization, every MongoDB command and every outbound call. Finished
+# traces are appended to TRACE_FILE in the OTLP/JSON file format (one
+# ExportTraceServiceRequest per line). Every response carries a W3C
+# ``traceparent`` and an ``X-Trace-Id`` header; an incoming traceparent's
+# trace id is kept, but the sampling decision is always made here. Once the
+# file reaches TRACE_FILE_MAX_BYTES it is renamed to <TRACE_FILE>.1 (replacing
+# the previous one) and a new file is started.
+# Summarize with ``python scripts/trace_summary.py``.
+TRACE_SAMPLE_RATE = float(os.environ.get("TRACE_SAMPLE_RATE", "0"))
+TRACE_FILE = Path(os.environ.get("TRACE_FILE", str(ROOT_DIR / "traces" / "spans.jsonl")))
+TRACE_FILE_MAX_BYTES = int(os.environ.get("TRACE_FILE_MAX_BYTES", "104857600"))  # 100 MB
+TRACE_SERVICE_NAME = os.environ.get("TRACE_SERVICE_NAME", "syncbeds-cms")
+TRACE_MAX_SPANS = int(os.environ.get("TRACE_MAX_SPANS", "2000"))
+TRACE_FLUSH_SECONDS = float(os.environ.get("TRACE_FLUSH_SECONDS", "2"))
+
+# OTLP span kinds
+SPAN_KINDS = {"internal": 1, "server": 2, "client": 3}
+
+
+class Span:
+    __slots__ = ("trace", "span_id", "parent_id", "name", "kind", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, trace: "Trace", name: str, kind: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def end(self, error: Optional[str] = None, end_ns: Optional[int] = None) -> None:
+        if self.end_ns is not None:
+            return
+        self.end_ns = end_ns or time.time_ns()
+        if error is not None:
+            self.error = error
+        if self is self.trace.root:
+            self.trace.finish()
+
+    def to_otlp(self) -> dict:
+        attributes = []
+        for key, value in self.attributes.items():
+            if isinstance(value, bool):
+                encoded = {"boolValue": value}
+            elif isinstance(value, int):
+                encoded = {"intValue": str(value)}
+            elif isinstance(value, float):
+                encoded = {"doubleValue": value}
+            else:
+                encoded = {"stringValue": str(value)}
+            attributes.append({"key": key, "value": encoded})
+        span = {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": SPAN_KINDS[self.kind],
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or time.time_ns()),
+            "attributes": attributes,
+            "status": {"code": 2, "message": self.error} if self.error is not None else {},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+class Trace:
+    """Spans of one sampled request, exported together when the root span ends."""
+
+    def __init__(self, trace_id: str, name: str, kind: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace_id = trace_id
+        self.dropped = 0
+        self.spans: List[Span] = []
+        self.root = Span(self, name, kind, parent_id, attributes)
+        self.spans.append(self.root)
+
+    def add(self, name: str, kind: str, parent_id: str, attributes: Dict[str, Any]) -> Optional[Span]:
+        if len(self.spans) >= TRACE_MAX_SPANS:
+            self.dropped += 1
+            return None
+        span = Span(self, name, kind, parent_id, attributes)
+        # list.append is atomic, so Mongo listener threads can add spans too
+        self.spans.append(span)
+        return span
+
+    def finish(self) -> None:
+        if self.dropped:
+            self.root.set("trace.dropped_spans", self.dropped)
+        span_exporter.export(self)
+
+
+current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+
+
+def start_span(name: str, kind: str = "internal", parent: Optional[Span] = None, **attributes: Any) -> Optional[Span]:
+    """Start a child of ``parent`` (default: the current span) without making it
+    current; returns None when the request is not sampled. Call ``span.end()``."""
+    parent = parent or current_span.get()
+    if parent is None:
+        return None
+    return parent.trace.add(name, kind, parent.span_id, attributes)
+
+
+class trace_span:
+    """Run a block as a child span of the current one; a no-op when not sampled::
+
+        with trace_span("render", sections=len(sections)) as span:
+            ...
+    """
+
+    def __init__(self, name: str, kind: str = "internal", **attributes: Any):
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes
+        self.span: Optional[Span] = None
+
+    def __enter__(self) -> Optional[Span]:
+        self.span = start_span(self.name, self.kind, **self.attributes)
+        if self.span is not None:
+            self._token = current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self.span is None:
+            return
+        current_span.reset(self._token)
+        error = None
+        if exc_type is not None and not issubclass(exc_type, asyncio.CancelledError):
+            error = f"{exc_type.__name__}: {exc}"[:500]
+        self.span.end(error)
+
+
+class SpanFileExporter:
+    """Buffers finished traces and appends them to a JSONL file off the event loop."""
+
+    def __init__(self, path: Path, max_buffered: int = 10000, max_bytes: int = 0):
+        self.path = path
+        self.max_buffered = max_buffered
+        self.max_bytes = max_bytes  # 0 = never rotate
+        self.dropped = 0
+        self._buffer: List[str] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def export(self, trace: Trace) -> None:
+        if len(self._buffer) >= self.max_buffered:
+            self.dropped += 1
+            return
+        request = {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": TRACE_SERVICE_NAME}}]},
+                "scopeSpans": [{
+                    "scope": {"name": "syncbeds-cms.server"},
+                    "spans": [span.to_otlp() for span in list(trace.spans)],
+                }],
+            }]
+        }
+        self._buffer.append(json.dumps(request, separators=(",", ":"), default=str))
+
+    def _write(self, lines: List[str]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = "\n".join(lines) + "\n"
+        if self.max_bytes > 0:
+            try:
+                size = self.path.stat().st_size
+            except FileNotFoundError:
+                size = 0
+            if size and size + len(data) > self.max_bytes:
+                self.path.replace(self.path.with_name(self.path.name + ".1"))
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(data)
+
+    async def flush(self) -> None:
+        lines, self._buffer = self._buffer, []
+        if lines:
+            try:
+                await asyncio.to_thread(self._write, lines)
+            except OSError:
+                logging.exception("Failed to write %s traces to %s", len(lines), self.path)
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(TRACE_FLUSH_SECONDS)
+            await self.flush()
+
+    async def start(self) -> None:
+        if TRACE_SAMPLE_RATE > 0 and self._task is None:
+            self._task = asyncio.create_task(self._flush_periodically())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+class MongoCommandTracing(monitoring.CommandListener):
+    """Adds a client span per MongoDB command to the trace of the calling request."""
+
+    def __init__(self):
+        self._spans: Dict[Tuple[Any, int], Span] = {}
+
+    def started(self, event) -> None:
+        parent = current_span.get()
+        if parent is None:
+            return
+        name = event.command_name
+        collection = event.command.get(name) if name not in MONGO_ADMIN_COMMANDS else None
+        if name == "getMore":
+            collection = event.command.get("collection")
+        attributes = {"db.system": "mongodb", "db.name": event.database_name, "db.operation": name}
+        if isinstance(collection, str):
+            attributes["db.mongodb.collection"] = collection
+        span = start_span(f"mongo.{name}", "client", parent, **attributes)
+        if span is not None:
+            self._spans[(event.connection_id, event.request_id)] = span
+
+    def succeeded(self, event) -> None:
+        span = self._spans.pop((event.connection_id, event.request_id), None)
+        if span is not None:
+            span.end(end_ns=span.start_ns + event.duration_micros * 1000)
+
+    def failed(self, event) -> None:
+        span = self._spans.pop((event.connection_id, event.request_id), None)
+        if span is not None:
+            span.end(str(event.failure.get("errmsg", "failed"))[:500], end_ns=span.start_ns + event.duration_micros * 1000)
+
+
+# fastapi.routing functions the request handler looks up by name on every
+# request (fastapi 0.110); tests/test_tracing.py pins that they still are
+FASTAPI_TRACED_STEPS = {
+    "solve_dependencies": "fastapi.validate",
+    "run_endpoint_function": "fastapi.handler",
+    "serialize_response": "fastapi.serialize",
+}
+
+
+def instrument_fastapi() -> None:
+    """Wrap FastAPI's per-request steps in spans: dependency resolution and
+    request validation, the endpoint function and response serialization.
+
+    These are private FastAPI functions; when one is missing (a FastAPI
+    upgrade) requests are still traced, just without that step.
+    """
+
+    def traced(name: str, func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if current_span.get() is None:
+                return await func(*args, **kwargs)
+            with trace_span(name):
+                return await func(*args, **kwargs)
+
+        wrapper.__traced__ = True
+        return wrapper
+
+    for attribute, name in FASTAPI_TRACED_STEPS.items():
+        func = getattr(fastapi.routing, attribute, None)
+        if getattr(func, "__traced__", False):
+            continue
+        if not inspect.iscoroutinefunction(func):
+            logging.warning("Not tracing %s: fastapi.routing.%s is missing or not async", name, attribute)
+            continue
+        setattr(fastapi.routing, attribute, traced(name, func))
+
+
+span_exporter = SpanFileExporter(TRACE_FILE, max_bytes=TRACE_FILE_MAX_BYTES)
+mongo_command_tracing = MongoCommandTracing()
+if TRACE_SAMPLE_RATE > 0:
+    instrument_fastapi()
+
+
+class LazyProxy:
+    """Stands in for an object that is only built when first used."""
+
+    def __init__(self, factory: Callable[[], Any]):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_target", None)
+
+    def _resolve(self) -> Any:
+        target = self._target
+        if target is None:
+            target = self._factory()
+            object.__setattr__(self, "_target", target)
+        return target
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._resolve(), name)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._resolve()[key]
+
+
+# MongoDB connection. Motor is imported and the client (with pymongo's
+# monitor threads) created on first use rather than at import time.
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+DB_NAME = os.environ['DB_NAME']
 
-# Create the main app
-app = FastAPI(title="SyncBeds CMS API", version="1.0.0")
 
-# Serve uploaded media files (must still be under /api for ingress rules)
-# We use /api/uploads for static files to avoid clashing with the /api/media/upload API route.
-app.mount("/api/uploads", StaticFiles(directory=MEDIA_ROOT), name="uploads")
+def create_mongo_client():
+    from motor.motor_asyncio import AsyncIOMotorClient
 
-# Create a router with the /api prefix
+    return AsyncIOMotorClient(
+        mongo_url,
+        event_listeners=[mongo_command_metrics, mongo_pool_metrics, slow_query_log, mongo_command_tracing],
+    )
+
+
+client = LazyProxy(create_mongo_client)
+db = LazyProxy(lambda: client[DB_NAME])
+
+# Create a router with the /api prefix; create_app() attaches it to the app
 api_router = APIRouter(prefix="/api")
 
 
@@ -115,6 +866,8 @@ class OpenAISettings(BaseModel):
     api_key: Optional[str] = None
     model: Optional[str] = "gpt-4o"
     enabled: bool = False
+    # Bumped on every save so pooled LLM clients can tell when to rebuild.
+    version: int = 0
 
 
 class OpenAISettingsUpdate(BaseModel):
@@ -149,6 +902,7 @@ async def save_openai_settings(update: OpenAISettingsUpdate) -> OpenAISettings:
                 data["api_key"] = value
         else:
             data[field] = value
+    data["version"] = current.version + 1
 
     await db.settings.update_one(
         {"key": "openai"},
@@ -230,10 +984,269 @@ class SnippetSettings(BaseModel):
     global_body_html: Optional[str] = None
     rules: List[SnippetRule] = []
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context; hashes with a different cost are upgraded on login.
+# passlib/bcrypt are imported on the first login rather than at startup.
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", "12"))
+
+
+def create_pwd_context():
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+
+pwd_context = LazyProxy(create_pwd_context)
+
+
+class PasswordHasher:
+    """Runs bcrypt on a small thread pool instead of the event loop.
+
+    bcrypt releases the GIL while hashing, so threads give real parallelism
+    and the loop only pays for handing the job over. At most ``workers``
+    hashes run at once; when ``queue_limit`` more are already waiting, new
+    calls are rejected with 503 instead of piling up behind a login burst.
+    """
+
+    def __init__(self, workers: int, queue_limit: int):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._pending = 0
+        self.stats = {
+            "calls": 0,
+            "rejected": 0,
+            "rehashed": 0,
+            "max_pending": 0,
+            "wait_ms_total": 0.0,
+            "compute_ms_total": 0.0,
+            "max_wait_ms": 0.0,
+            # Time the event loop itself spends per call (submitting and
+            # collecting the result); this is what other requests wait for.
+            "max_loop_ms": 0.0,
+        }
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        if self._pending >= self.workers + self.queue_limit:
+            self.stats["rejected"] += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Too many concurrent logins, try again shortly",
+                headers={"Retry-After": "1"},
+            )
+        self._pending += 1
+        self.stats["calls"] += 1
+        self.stats["max_pending"] = max(self.stats["max_pending"], self._pending)
+        submitted = time.perf_counter()
+        timings: Dict[str, float] = {}
+
+        def timed() -> T:
+            timings["started"] = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                timings["finished"] = time.perf_counter()
+
+        loop_ms = 0.0
+        try:
+            loop_started = time.perf_counter()
+            future = asyncio.get_running_loop().run_in_executor(self._executor, timed)
+            loop_ms = (time.perf_counter() - loop_started) * 1000
+            return await future
+        finally:
+            self._pending -= 1
+            if "finished" in timings:
+                wait_ms = (timings["started"] - submitted) * 1000
+                self.stats["wait_ms_total"] += wait_ms
+                self.stats["max_wait_ms"] = max(self.stats["max_wait_ms"], wait_ms)
+                self.stats["compute_ms_total"] += (timings["finished"] - timings["started"]) * 1000
+            self.stats["max_loop_ms"] = max(self.stats["max_loop_ms"], loop_ms)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(pwd_context.hash, password)
+
+    async def verify_and_update(self, password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+        """Verify ``password``; also return a new hash when the stored one uses an outdated cost."""
+        verified, new_hash = await self._run(pwd_context.verify_and_update, password, password_hash)
+        if new_hash:
+            self.stats["rehashed"] += 1
+        return verified, new_hash
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(
+    workers=int(os.environ.get("PASSWORD_HASH_WORKERS", "2")),
+    queue_limit=int(os.environ.get("PASSWORD_HASH_QUEUE_LIMIT", "16")),
+)
+
+
+# ==================== AUTH TOKENS ====================
+
+# Short-lived access tokens are HMAC-signed and verified in-process (their
+# session is looked up at most once per SESSION_RECHECK_SECONDS, not per admin
+# request); long-lived refresh tokens are stored hashed in admin_sessions and
+# rotated on every refresh.
+ACCESS_TOKEN_TTL_SECONDS = int(os.environ.get("ACCESS_TOKEN_TTL_SECONDS", "900"))
+REFRESH_TOKEN_TTL_DAYS = int(os.environ.get("REFRESH_TOKEN_TTL_DAYS", "14"))
+# How long a worker trusts that a session still exists before checking
+# admin_sessions again; bounds how long a logout on another worker goes unseen.
+SESSION_RECHECK_SECONDS = float(os.environ.get("SESSION_RECHECK_SECONDS", "30"))
+
+_auth_secret: Optional[bytes] = None
+
+# Session id -> access token expiry (epoch seconds) for logged-out sessions;
+# entries are useless once every access token of the session has expired.
+revoked_sessions: Dict[str, float] = {}
+
+
+def b64url_encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def b64url_decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+async def load_auth_secret() -> bytes:
+    """Signing key from AUTH_SECRET_KEY, or one generated once and shared via
+    the settings collection so every API process accepts the same tokens."""
+    global _auth_secret
+    if _auth_secret is None:
+        configured = os.environ.get("AUTH_SECRET_KEY")
+        if configured:
+            _auth_secret = configured.encode("utf-8")
+        else:
+            await db.settings.update_one(
+                {"key": "auth_secret"},
+                {"$setOnInsert": {"key": "auth_secret", "value": secrets.token_urlsafe(48)}},
+                upsert=True,
+            )
+            stored = await db.settings.find_one({"key": "auth_secret"}, {"_id": 0})
+            _auth_secret = stored["value"].encode("utf-8")
+    return _auth_secret
+
+
+def sign_access_token(claims: Dict[str, Any], secret: bytes) -> str:
+    payload = b64url_encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+    signature = hmac.digest(secret, payload.encode("ascii"), "sha256")
+    return f"{payload}.{b64url_encode(signature)}"
+
+
+# Claims of recently verified tokens, so repeat requests with the same token
+# skip the HMAC and JSON work; expiry and revocation are still checked.
+_verified_tokens: Dict[str, Dict[str, Any]] = {}
+
+
+def verify_access_token(token: str, secret: bytes) -> Optional[Dict[str, Any]]:
+    """Return the claims of a valid, unexpired, unrevoked token, else None."""
+    claims = _verified_tokens.get(token)
+    if claims is None:
+        payload, _, signature = token.partition(".")
+        if not signature:
+            return None
+        expected = hmac.digest(secret, payload.encode("ascii", "ignore"), "sha256")
+        try:
+            if not hmac.compare_digest(b64url_decode(signature), expected):
+                return None
+            claims = json.loads(b64url_decode(payload))
+        except (ValueError, TypeError):
+            return None
+        if len(_verified_tokens) >= 1024:
+            _verified_tokens.clear()
+        _verified_tokens[token] = claims
+    if claims.get("exp", 0) < time.time() or claims.get("sid") in revoked_sessions:
+        return None
+    return claims
+
+
+# Session id -> monotonic time it was last seen in admin_sessions.
+_live_sessions: Dict[str, float] = {}
+
+
+async def session_is_live(session_id: str) -> bool:
+    """Whether the session still exists, re-read at most every SESSION_RECHECK_SECONDS.
+
+    Logout deletes the session, so this is how workers other than the one
+    that handled the logout learn about it.
+    """
+    now = time.monotonic()
+    checked_at = _live_sessions.get(session_id)
+    if checked_at is not None and now - checked_at < SESSION_RECHECK_SECONDS:
+        return True
+    if await db.admin_sessions.find_one({"id": session_id}, {"_id": 0, "id": 1}) is None:
+        _live_sessions.pop(session_id, None)
+        revoke_session(session_id)
+        return False
+    if len(_live_sessions) >= 1024:
+        _live_sessions.clear()
+    _live_sessions[session_id] = now
+    return True
+
+
+def revoke_session(session_id: str) -> None:
+    now = time.time()
+    if len(revoked_sessions) > 1000:
+        for sid in [sid for sid, until in revoked_sessions.items() if until < now]:
+            del revoked_sessions[sid]
+    revoked_sessions[session_id] = now + ACCESS_TOKEN_TTL_SECONDS
+
+
+def hash_refresh_token(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+async def issue_session_tokens(
+    username: str,
+    role: str,
+    session_id: Optional[str] = None,
+    previous_hash: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Create a session, or rotate the one whose refresh token hash is
+    ``previous_hash``, and return a fresh access/refresh token pair."""
+    secret = await load_auth_secret()
+    now = datetime.now(timezone.utc)
+    refresh_token = secrets.token_urlsafe(32)
+    update = {
+        "username": username,
+        "role": role,
+        "token_hash": hash_refresh_token(refresh_token),
+        "last_used_at": now.isoformat(),
+        "expires_at": now + timedelta(days=REFRESH_TOKEN_TTL_DAYS),
+    }
+    if previous_hash is not None:
+        # Matching on the old hash makes concurrent refreshes of one token race-free
+        result = await db.admin_sessions.update_one(
+            {"id": session_id, "token_hash": previous_hash}, {"$set": update}
+        )
+        if result.matched_count == 0:
+            raise HTTPException(status_code=401, detail="Invalid or expired refresh token")
+    else:
+        session_id = str(uuid.uuid4())
+        await db.admin_sessions.insert_one({"id": session_id, "created_at": now.isoformat(), **update})
+    issued_at = int(now.timestamp())
+    access_token = sign_access_token(
+        {"sub": username, "role": role, "sid": session_id, "iat": issued_at, "exp": issued_at + ACCESS_TOKEN_TTL_SECONDS},
+        secret,
+    )
+    return {
+        "success": True,
+        "token_type": "bearer",
+        "access_token": access_token,
+        "expires_in": ACCESS_TOKEN_TTL_SECONDS,
+        "refresh_token": refresh_token,
+    }
 
 
+async def require_admin(authorization: Optional[str] = Header(default=None)) -> Dict[str, Any]:
+    """Dependency for admin routes: a valid ``Authorization: Bearer <access token>``."""
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+    claims = verify_access_token(token, _auth_secret or await load_auth_secret())
+    if claims is None or not await session_is_live(claims["sid"]):
+        raise HTTPException(status_code=401, detail="Invalid or expired token", headers={"WWW-Authenticate": "Bearer"})
+    return claims
 
 
 class CMSContentBase(BaseModel):
@@ -288,6 +1301,14 @@ class FAQCreate(FAQBase):
 
 class FAQ(FAQBase):
     model_config = ConfigDict(extra="ignore")
+    # Required: FAQs stored without them are backfilled at startup
+    # (backfill_faq_ids), so reads never invent an id
+    id: str
+    created_at: datetime
+
+
+def new_faq(data: FAQCreate) -> FAQ:
+    return FAQ(id=str(uuid.uuid4()), created_at=datetime.now(timezone.utc), **data.model_dump())
 
 
 async def get_email_settings() -> EmailSettings:
@@ -334,6 +1355,7 @@ async def save_snippet_settings(settings: SnippetSettings) -> SnippetSettings:
         {"$set": {"key": "snippets", "value": settings.model_dump()}},
         upsert=True,
     )
+    snippet_matcher.compile(settings)
     return settings
 
 
@@ -392,18 +1414,19 @@ async def send_contact_notification_email(message: ContactMessage) -> None:
     use_tls = settings.use_tls
     port = settings.smtp_port or (587 if use_tls else 25)
 
-    if use_tls:
-        server = smtplib.SMTP(settings.smtp_host, port)
-        server.starttls()
-    else:
-        server = smtplib.SMTP(settings.smtp_host, port)
+    with track_outbound("smtp", "contact_notification"):
+        if use_tls:
+            server = smtplib.SMTP(settings.smtp_host, port)
+            server.starttls()
+        else:
+            server = smtplib.SMTP(settings.smtp_host, port)
 
-    try:
-        if settings.username and getattr(settings, "password", None):
-            server.login(settings.username, getattr(settings, "password"))
-        server.send_message(email_msg)
-    finally:
-        server.quit()
+        try:
+            if settings.username and getattr(settings, "password", None):
+                server.login(settings.username, getattr(settings, "password"))
+            server.send_message(email_msg)
+        finally:
+            server.quit()
 
 
 # ==================== PAGE MODELS ====================
@@ -418,7 +1441,7 @@ class PageSection(PageSectionBase):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
-@api_router.get("/admin/settings/openai", response_model=SettingsOpenAIResponse)
+@api_router.get("/admin/settings/openai", response_model=SettingsOpenAIResponse, dependencies=[Depends(require_admin)])
 async def get_openai_settings_route():
     settings = await get_openai_settings()
     return SettingsOpenAIResponse(
@@ -428,7 +1451,7 @@ async def get_openai_settings_route():
     )
 
 
-@api_router.put("/admin/settings/openai", response_model=SettingsOpenAIResponse)
+@api_router.put("/admin/settings/openai", response_model=SettingsOpenAIResponse, dependencies=[Depends(require_admin)])
 async def update_openai_settings_route(payload: OpenAISettingsUpdate):
     settings = await save_openai_settings(payload)
     return SettingsOpenAIResponse(
@@ -514,6 +1537,415 @@ def deserialize_datetime(doc: dict, fields: List[str]) -> dict:
     return doc
 
 
+# ==================== BACKGROUND JOBS ====================
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class JobProgress(BaseModel):
+    done: int = 0
+    total: Optional[int] = None
+    message: Optional[str] = None
+
+
+class Job(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    type: str
+    status: JobStatus = JobStatus.QUEUED
+    params: Dict[str, Any] = {}
+    progress: JobProgress = Field(default_factory=JobProgress)
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    cancel_requested: bool = False
+    attempts: int = 0
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class JobContext:
+    """Handle passed to a job handler for reporting progress."""
+
+    def __init__(self, job: dict):
+        self.id: str = job["id"]
+        self.type: str = job["type"]
+        self.params: Dict[str, Any] = job.get("params") or {}
+        self.cancel_requested = False
+        self._last_progress_write = 0.0
+
+    async def progress(self, done: int, total: Optional[int] = None, message: Optional[str] = None) -> None:
+        # At most one write per second, but always record the final step
+        now = time.monotonic()
+        if now - self._last_progress_write < 1.0 and (total is None or done < total):
+            return
+        self._last_progress_write = now
+        await db.jobs.update_one(
+            {"id": self.id},
+            {"$set": {"progress": {"done": done, "total": total, "message": message}}},
+        )
+
+
+JobHandler = Callable[[JobContext], Awaitable[Dict[str, Any]]]
+
+# job type -> (handler, max concurrently running jobs of that type across all workers)
+JOB_TYPES: Dict[str, Tuple[JobHandler, int]] = {}
+
+
+def job_handler(job_type: str, concurrency: int = 1):
+    """Register a coroutine as the handler of ``job_type``.
+
+    The concurrency limit can be overridden with JOB_CONCURRENCY_<TYPE>.
+    """
+    limit = int(os.environ.get(f"JOB_CONCURRENCY_{job_type.upper()}", concurrency))
+
+    def decorator(func: JobHandler) -> JobHandler:
+        JOB_TYPES[job_type] = (func, limit)
+        return func
+
+    return decorator
+
+
+def job_dedupe_key(params: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+async def enqueue_job(job_type: str, params: Optional[Dict[str, Any]] = None, dedupe: bool = True) -> dict:
+    """Queue a job. With ``dedupe`` an identical queued or running job is returned instead.
+
+    Deduplicated jobs carry ``dedupe_key`` until they finish; a unique partial
+    index on (type, dedupe_key) makes the check atomic across workers.
+    """
+    if job_type not in JOB_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unknown job type: {job_type}")
+    params = params or {}
+    job = Job(type=job_type, params=params)
+    doc = serialize_datetime(job.model_dump())
+    doc["status"] = job.status.value
+    if dedupe:
+        doc["dedupe_key"] = job_dedupe_key(params)
+
+    # A second attempt covers the identical job finishing between the two steps
+    for _ in range(2):
+        try:
+            await db.jobs.insert_one(doc)
+            break
+        except DuplicateKeyError:
+            doc.pop("_id", None)
+            existing = await db.jobs.find_one(
+                {"type": job_type, "dedupe_key": doc["dedupe_key"]}, {"_id": 0, "dedupe_key": 0}
+            )
+            if existing:
+                return existing
+    else:
+        raise HTTPException(status_code=409, detail=f"Could not queue {job_type}, please retry")
+    doc.pop("_id", None)
+    doc.pop("dedupe_key", None)
+    job_runner.wake()
+    return doc
+
+
+class JobSlots:
+    """Per-type concurrency limits shared by all workers (the job_slots collection).
+
+    One document per job type (``_id`` is the type, so there is never a
+    second one) counts the running jobs and lists their leases
+    (``<job id>:<attempt>``). A slot is taken with one atomic $inc that only
+    matches while the count is below the limit, and given back once per
+    lease, whether the job finished here or was requeued after its worker
+    stopped heartbeating.
+    """
+
+    async def acquire(self, job_type: str, lease: str, limit: int) -> bool:
+        for _ in range(2):
+            try:
+                await db.job_slots.update_one(
+                    {"_id": job_type, "running": {"$lt": limit}},
+                    {"$inc": {"running": 1}, "$push": {"leases": lease}},
+                    upsert=True,
+                )
+                return True
+            except DuplicateKeyError:
+                # Either the slots are taken (the upsert tried to add a second
+                # document for the type) or another worker created the document
+                # first; only the latter can succeed on retry.
+                full = await db.job_slots.find_one({"_id": job_type, "running": {"$gte": limit}}, {"_id": 1})
+                if full:
+                    return False
+        return False
+
+    async def release(self, job_type: str, lease: str) -> None:
+        await db.job_slots.update_one(
+            {"_id": job_type, "leases": lease},
+            {"$inc": {"running": -1}, "$pull": {"leases": lease}},
+        )
+
+
+def job_lease(job: dict) -> str:
+    return f"{job['id']}:{job.get('attempts', 0)}"
+
+
+class JobRunner:
+    """Claims queued jobs from MongoDB and runs them as asyncio tasks.
+
+    Workers poll the ``jobs`` collection (and are woken immediately by local
+    enqueues), respect the per-type concurrency limits, heartbeat running jobs
+    and pick up cancellation requests made through any process. Jobs whose
+    worker stopped heartbeating are requeued, up to ``max_attempts``.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        poll_interval: float = 2.0,
+        heartbeat_interval: float = 5.0,
+        stale_after: float = 60.0,
+        max_attempts: int = 3,
+    ):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self.max_attempts = max_attempts
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._tasks: List[asyncio.Task] = []
+        self._running: Dict[str, Tuple[asyncio.Task, JobContext]] = {}
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self.slots = JobSlots()
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    async def start(self) -> None:
+        if self.workers <= 0 or self._tasks:
+            return
+        self._stopping = False
+        await self.requeue_stale()
+        self._tasks = [asyncio.create_task(self._worker_loop()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._heartbeat_loop()))
+
+    async def stop(self) -> None:
+        """Stop workers; jobs still running here go back to the queue."""
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def cancel_local(self, job_id: str) -> bool:
+        running = self._running.get(job_id)
+        if not running:
+            return False
+        task, ctx = running
+        ctx.cancel_requested = True
+        task.cancel()
+        return True
+
+    async def requeue_stale(self) -> None:
+        cutoff = datetime.fromtimestamp(time.time() - self.stale_after, timezone.utc).isoformat()
+        stale = {"status": JobStatus.RUNNING.value, "heartbeat_at": {"$lt": cutoff}}
+        jobs = await db.jobs.find(stale, {"_id": 0, "id": 1, "type": 1, "attempts": 1}).to_list(None)
+        for job in jobs:
+            if job.get("attempts", 0) >= self.max_attempts:
+                update = {
+                    "$set": {
+                        "status": JobStatus.FAILED.value,
+                        "error": "Worker stopped responding",
+                        "finished_at": datetime.now(timezone.utc).isoformat(),
+                    },
+                    "$unset": {"dedupe_key": ""},
+                }
+            else:
+                update = {"$set": {"status": JobStatus.QUEUED.value, "worker_id": None}}
+            # Only the worker whose update matches gives the slot back
+            result = await db.jobs.update_one({**stale, "id": job["id"]}, update)
+            if result.modified_count:
+                await self.slots.release(job["type"], job_lease(job))
+
+    async def _claim(self) -> Optional[dict]:
+        available = list(JOB_TYPES)
+        while available:
+            now = datetime.now(timezone.utc).isoformat()
+            job = await db.jobs.find_one_and_update(
+                {"status": JobStatus.QUEUED.value, "type": {"$in": available}},
+                {
+                    "$set": {
+                        "status": JobStatus.RUNNING.value,
+                        "worker_id": self.worker_id,
+                        "started_at": now,
+                        "heartbeat_at": now,
+                    },
+                    "$inc": {"attempts": 1},
+                },
+                sort=[("created_at", 1)],
+                return_document=ReturnDocument.AFTER,
+            )
+            if job is None:
+                return None
+            job.pop("_id", None)
+            if await self.slots.acquire(job["type"], job_lease(job), JOB_TYPES[job["type"]][1]):
+                return job
+            # Its type is at the limit: put the job back untouched and look
+            # for one of another type
+            await db.jobs.update_one(
+                {"id": job["id"], "worker_id": self.worker_id, "status": JobStatus.RUNNING.value},
+                {
+                    "$set": {"status": JobStatus.QUEUED.value, "worker_id": None, "started_at": None},
+                    "$inc": {"attempts": -1},
+                },
+            )
+            available.remove(job["type"])
+        return None
+
+    async def _worker_loop(self) -> None:
+        while True:
+            try:
+                job = await self._claim()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logging.exception("Failed to claim background job")
+                job = None
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run(job)
+
+    async def _run(self, job: dict) -> None:
+        ctx = JobContext(job)
+        update: Dict[str, Any] = {}
+        handler = JOB_TYPES.get(job["type"], (None, 0))[0]
+        if handler is None:
+            update = {"status": JobStatus.FAILED.value, "error": f"Unknown job type: {job['type']}"}
+        else:
+            # The handler task copies the context, so its LLM calls and slow queries are attributed to the job
+            source_token = llm_call_source.set(f"job:{ctx.type}")
+            route_token = request_route.set(f"job:{ctx.type}")
+            task = asyncio.create_task(handler(ctx))
+            request_route.reset(route_token)
+            llm_call_source.reset(source_token)
+            self._running[ctx.id] = (task, ctx)
+            try:
+                result = await task
+                update = {"status": JobStatus.SUCCEEDED.value, "result": result}
+            except asyncio.CancelledError:
+                if self._stopping and not ctx.cancel_requested:
+                    await db.jobs.update_one(
+                        {"id": ctx.id},
+                        {"$set": {"status": JobStatus.QUEUED.value, "worker_id": None}},
+                    )
+                    await self.slots.release(ctx.type, job_lease(job))
+                    raise
+                update = {"status": JobStatus.CANCELLED.value}
+            except Exception as exc:
+                logging.exception("Background job %s (%s) failed", ctx.id, ctx.type)
+                update = {"status": JobStatus.FAILED.value, "error": str(exc)}
+            finally:
+                self._running.pop(ctx.id, None)
+
+        update["finished_at"] = datetime.now(timezone.utc).isoformat()
+        # Finished jobs are kept for a week (TTL index on expires_at)
+        update["expires_at"] = datetime.now(timezone.utc) + timedelta(days=7)
+        await db.jobs.update_one({"id": ctx.id}, {"$set": update, "$unset": {"dedupe_key": ""}})
+        await self.slots.release(ctx.type, job_lease(job))
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                ids = list(self._running)
+                if ids:
+                    await db.jobs.update_many(
+                        {"id": {"$in": ids}},
+                        {"$set": {"heartbeat_at": datetime.now(timezone.utc).isoformat()}},
+                    )
+                    cancelled = await db.jobs.find(
+                        {"id": {"$in": ids}, "cancel_requested": True}, {"_id": 0, "id": 1}
+                    ).to_list(len(ids))
+                    for job in cancelled:
+                        self.cancel_local(job["id"])
+                await self.requeue_stale()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logging.exception("Background job heartbeat failed")
+
+
+job_runner = JobRunner(
+    workers=int(os.environ.get("JOB_WORKERS", "2")),
+    poll_interval=float(os.environ.get("JOB_POLL_INTERVAL", "2")),
+    stale_after=float(os.environ.get("JOB_STALE_SECONDS", "60")),
+    max_attempts=int(os.environ.get("JOB_MAX_ATTEMPTS", "3")),
+)
+
+
+@api_router.get("/admin/jobs", response_model=List[Job], dependencies=[Depends(require_admin)])
+async def get_jobs(
+    type: Optional[str] = None,
+    status: Optional[JobStatus] = None,
+    limit: int = Query(default=50, le=200),
+):
+    """List background jobs, newest first"""
+    query: Dict[str, Any] = {}
+    if type:
+        query["type"] = type
+    if status:
+        query["status"] = status.value
+    jobs = await db.jobs.find(query, {"_id": 0}).sort("created_at", -1).limit(limit).to_list(limit)
+    for job in jobs:
+        deserialize_datetime(job, ["created_at", "started_at", "finished_at"])
+    return jobs
+
+
+@api_router.get("/admin/jobs/{job_id}", response_model=Job, dependencies=[Depends(require_admin)])
+async def get_job(job_id: str):
+    """Get a background job's status, progress and result"""
+    job = await db.jobs.find_one({"id": job_id}, {"_id": 0})
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    deserialize_datetime(job, ["created_at", "started_at", "finished_at"])
+    return job
+
+
+@api_router.post("/admin/jobs/{job_id}/cancel", response_model=Job, dependencies=[Depends(require_admin)])
+async def cancel_job(job_id: str):
+    """Cancel a queued job, or ask the worker running it to stop"""
+    now = datetime.now(timezone.utc).isoformat()
+    job = await db.jobs.find_one_and_update(
+        {"id": job_id, "status": JobStatus.QUEUED.value},
+        {
+            "$set": {"status": JobStatus.CANCELLED.value, "cancel_requested": True, "finished_at": now},
+            "$unset": {"dedupe_key": ""},
+        },
+        return_document=ReturnDocument.AFTER,
+    )
+    if not job:
+        job = await db.jobs.find_one_and_update(
+            {"id": job_id, "status": JobStatus.RUNNING.value},
+            {"$set": {"cancel_requested": True}},
+            return_document=ReturnDocument.AFTER,
+        )
+        if job:
+            job_runner.cancel_local(job_id)
+    if not job:
+        job = await db.jobs.find_one({"id": job_id})
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    job.pop("_id", None)
+    deserialize_datetime(job, ["created_at", "started_at", "finished_at"])
+    return job
+
+
 # ==================== BLOG API ROUTES ====================
 
 @api_router.get("/blog/posts", response_model=List[BlogPost])
@@ -567,7 +1999,7 @@ class MailchimpSettingsResponse(BaseModel):
     has_api_key: bool = False
 
 
-@api_router.get("/admin/settings/mailchimp", response_model=MailchimpSettingsResponse)
+@api_router.get("/admin/settings/mailchimp", response_model=MailchimpSettingsResponse, dependencies=[Depends(require_admin)])
 async def get_admin_mailchimp_settings():
     settings = await get_mailchimp_settings()
     data = settings.model_dump()
@@ -579,7 +2011,7 @@ async def get_admin_mailchimp_settings():
     )
 
 
-@api_router.put("/admin/settings/mailchimp", response_model=MailchimpSettingsResponse)
+@api_router.put("/admin/settings/mailchimp", response_model=MailchimpSettingsResponse, dependencies=[Depends(require_admin)])
 async def update_admin_mailchimp_settings(payload: MailchimpSettingsUpdate):
     updated = await save_mailchimp_settings(payload)
     data = updated.model_dump()
@@ -599,7 +2031,7 @@ async def get_blog_post_by_slug(slug: str):
     deserialize_datetime(post, ["created_at", "updated_at"])
     return post
 
-@api_router.post("/blog/posts", response_model=BlogPost, status_code=201)
+@api_router.post("/blog/posts", response_model=BlogPost, status_code=201, dependencies=[Depends(require_admin)])
 async def create_blog_post(post_data: BlogPostCreate):
     """Create a new blog post"""
     existing = await db.blog_posts.find_one({"slug": post_data.slug})
@@ -612,6 +2044,118 @@ async def create_blog_post(post_data: BlogPostCreate):
     return post
 
 
+# ==================== SNIPPET MATCHER ====================
+
+# Snippet rules are compiled once per save into a character trie (exact paths
+# and "prefix*" patterns, which is what almost every rule looks like) plus one
+# combined regex for the remaining globs, so matching a path costs the length
+# of the path rather than the number of rules. Other API workers pick up saved
+# changes after SNIPPET_MATCHER_TTL_SECONDS.
+SNIPPET_MATCHER_TTL_SECONDS = float(os.environ.get("SNIPPET_MATCHER_TTL_SECONDS", "30"))
+SNIPPET_CACHE_MAX_AGE = int(os.environ.get("SNIPPET_CACHE_MAX_AGE", "60"))
+
+
+def normalize_snippet_path(path: str) -> str:
+    path = (path or "/").split("?", 1)[0].split("#", 1)[0].strip()
+    if not path.startswith("/") and not path.startswith("*"):
+        path = "/" + path
+    if len(path) > 1 and path.endswith("/"):
+        path = path.rstrip("/") or "/"
+    return path
+
+
+class _TrieNode:
+    __slots__ = ("children", "exact", "prefix")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.exact: List[int] = []
+        self.prefix: List[int] = []
+
+
+class SnippetMatcher:
+    def __init__(self, max_paths: int = 2048):
+        self.max_paths = max_paths
+        self.rules: List[SnippetRule] = []
+        self.global_head_html = ""
+        self.global_body_html = ""
+        self.digest: Optional[str] = None
+        self.loaded_at = 0.0
+        self._root = _TrieNode()
+        self._globs: List[Tuple[int, Any]] = []
+        self._glob_any = None
+        self._resolved: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    def compile(self, settings: SnippetSettings) -> None:
+        rules = [r for r in settings.rules if r.active and (r.head_html or r.body_html)]
+        root = _TrieNode()
+        globs: List[Tuple[int, Any]] = []
+        for index, rule in enumerate(rules):
+            pattern = normalize_snippet_path(rule.path_pattern)
+            wildcard = [i for i, ch in enumerate(pattern) if ch in "*?["]
+            if wildcard and not (wildcard == [len(pattern) - 1] and pattern.endswith("*")):
+                globs.append((index, re.compile(fnmatch.translate(pattern))))
+                continue
+            node = root
+            for ch in pattern.rstrip("*"):
+                node = node.children.setdefault(ch, _TrieNode())
+            (node.prefix if wildcard else node.exact).append(index)
+
+        self.rules = rules
+        self.global_head_html = settings.global_head_html or ""
+        self.global_body_html = settings.global_body_html or ""
+        self._root = root
+        self._globs = globs
+        # One pass over the combined pattern rejects paths no glob rule can match
+        self._glob_any = re.compile("|".join(f"(?:{regex.pattern})" for _, regex in globs)) if globs else None
+        self._resolved = OrderedDict()
+        self.digest = hashlib.sha256(settings.model_dump_json().encode("utf-8")).hexdigest()[:16]
+        self.loaded_at = time.monotonic()
+
+    async def refresh(self) -> None:
+        if self.digest is not None and time.monotonic() - self.loaded_at < SNIPPET_MATCHER_TTL_SECONDS:
+            return
+        async with self._lock:
+            if self.digest is not None and time.monotonic() - self.loaded_at < SNIPPET_MATCHER_TTL_SECONDS:
+                return
+            self.compile(await get_snippet_settings())
+
+    def match(self, path: str) -> List[int]:
+        path = normalize_snippet_path(path)
+        matched: List[int] = list(self._root.prefix)
+        node = self._root
+        for ch in path:
+            node = node.children.get(ch)
+            if node is None:
+                break
+            matched.extend(node.prefix)
+        else:
+            matched.extend(node.exact)
+        if self._glob_any is not None and self._glob_any.match(path):
+            matched.extend(index for index, regex in self._globs if regex.match(path))
+        return sorted(set(matched))
+
+    def resolve(self, path: str) -> Dict[str, str]:
+        path = normalize_snippet_path(path)
+        cached = self._resolved.get(path)
+        if cached is not None:
+            self._resolved.move_to_end(path)
+            return cached
+        matched = [self.rules[i] for i in self.match(path)]
+        head_html = "\n".join(filter(None, [self.global_head_html] + [r.head_html or "" for r in matched]))
+        body_html = "\n".join(filter(None, [self.global_body_html] + [r.body_html or "" for r in matched]))
+        etag = hashlib.sha256(f"{head_html}\0{body_html}".encode("utf-8")).hexdigest()[:16]
+        resolved = {"path": path, "head_html": head_html, "body_html": body_html, "etag": f'"{etag}"'}
+        self._resolved[path] = resolved
+        if len(self._resolved) > self.max_paths:
+            self._resolved.popitem(last=False)
+        return resolved
+
+
+snippet_matcher = SnippetMatcher()
+
+
 # ==================== SETTINGS / SNIPPETS API ROUTES ====================
 
 
@@ -628,12 +2172,12 @@ class SnippetSettingsUpdate(BaseModel):
     global_body_html: Optional[str] = None
 
 
-@api_router.get("/admin/settings/snippets", response_model=SnippetSettings)
+@api_router.get("/admin/settings/snippets", response_model=SnippetSettings, dependencies=[Depends(require_admin)])
 async def get_admin_snippet_settings():
     return await get_snippet_settings()
 
 
-@api_router.put("/admin/settings/snippets", response_model=SnippetSettings)
+@api_router.put("/admin/settings/snippets", response_model=SnippetSettings, dependencies=[Depends(require_admin)])
 async def update_admin_snippet_settings(payload: SnippetSettingsUpdate):
     current = await get_snippet_settings()
     data = current.model_dump()
@@ -644,14 +2188,14 @@ async def update_admin_snippet_settings(payload: SnippetSettingsUpdate):
     return await save_snippet_settings(updated)
 
 
-@api_router.post("/admin/settings/snippets/rules", response_model=SnippetSettings)
+@api_router.post("/admin/settings/snippets/rules", response_model=SnippetSettings, dependencies=[Depends(require_admin)])
 async def add_snippet_rule(rule: SnippetRule):
     settings = await get_snippet_settings()
     settings.rules.append(rule)
     return await save_snippet_settings(settings)
 
 
-@api_router.put("/admin/settings/snippets/rules/{rule_id}", response_model=SnippetSettings)
+@api_router.put("/admin/settings/snippets/rules/{rule_id}", response_model=SnippetSettings, dependencies=[Depends(require_admin)])
 async def update_snippet_rule(rule_id: str, payload: SnippetRuleUpdate):
     settings = await get_snippet_settings()
     updated_rules: List[SnippetRule] = []
@@ -667,7 +2211,7 @@ async def update_snippet_rule(rule_id: str, payload: SnippetRuleUpdate):
     return await save_snippet_settings(settings)
 
 
-@api_router.delete("/admin/settings/snippets/rules/{rule_id}", response_model=SnippetSettings)
+@api_router.delete("/admin/settings/snippets/rules/{rule_id}", response_model=SnippetSettings, dependencies=[Depends(require_admin)])
 async def delete_snippet_rule(rule_id: str):
     settings = await get_snippet_settings()
     settings.rules = [r for r in settings.rules if r.id != rule_id]
@@ -687,8 +2231,28 @@ class PublicSnippetSettings(BaseModel):
     rules: List[PublicSnippetRule] = []
 
 
-@api_router.get("/settings/snippets", response_model=PublicSnippetSettings)
-async def get_public_snippet_settings():
+class PathSnippets(BaseModel):
+    path: str
+    head_html: str = ""
+    body_html: str = ""
+
+
+@api_router.get("/settings/snippets", response_model=Union[PathSnippets, PublicSnippetSettings])
+async def get_public_snippet_settings(
+    path: Optional[str] = Query(None, description="Return only the merged HTML for this page path"),
+    if_none_match: Optional[str] = Header(default=None),
+):
+    if path is not None:
+        await snippet_matcher.refresh()
+        resolved = snippet_matcher.resolve(path)
+        headers = {"Cache-Control": f"public, max-age={SNIPPET_CACHE_MAX_AGE}", "ETag": resolved["etag"]}
+        if if_none_match == resolved["etag"]:
+            return Response(status_code=304, headers=headers)
+        return JSONResponse(
+            PathSnippets(path=resolved["path"], head_html=resolved["head_html"], body_html=resolved["body_html"]).model_dump(),
+            headers=headers,
+        )
+
     settings = await get_snippet_settings()
     public_rules = [
         PublicSnippetRule(
@@ -719,7 +2283,7 @@ class EmailSettingsResponse(BaseModel):
     enabled: bool = False
 
 
-@api_router.get("/admin/settings/email", response_model=EmailSettingsResponse)
+@api_router.get("/admin/settings/email", response_model=EmailSettingsResponse, dependencies=[Depends(require_admin)])
 async def get_admin_email_settings():
     settings = await get_email_settings()
     data = settings.model_dump()
@@ -728,14 +2292,14 @@ async def get_admin_email_settings():
     return EmailSettingsResponse(**data)
 
 
-@api_router.put("/admin/settings/email", response_model=EmailSettingsResponse)
+@api_router.put("/admin/settings/email", response_model=EmailSettingsResponse, dependencies=[Depends(require_admin)])
 async def update_admin_email_settings(payload: EmailSettingsUpdate):
     updated = await save_email_settings(payload)
     data = updated.model_dump()
     data.pop("password", None)
     return EmailSettingsResponse(**data)
 
-@api_router.put("/blog/posts/{post_id}", response_model=BlogPost)
+@api_router.put("/blog/posts/{post_id}", response_model=BlogPost, dependencies=[Depends(require_admin)])
 async def update_blog_post(post_id: str, post_data: BlogPostUpdate):
     """Update a blog post"""
     existing = await db.blog_posts.find_one({"id": post_id}, {"_id": 0})
@@ -751,7 +2315,7 @@ async def update_blog_post(post_id: str, post_data: BlogPostUpdate):
     deserialize_datetime(updated, ["created_at", "updated_at"])
     return updated
 
-@api_router.delete("/blog/posts/{post_id}")
+@api_router.delete("/blog/posts/{post_id}", dependencies=[Depends(require_admin)])
 async def delete_blog_post(post_id: str):
     """Delete a blog post"""
     result = await db.blog_posts.delete_one({"id": post_id})
@@ -760,11 +2324,6 @@ async def delete_blog_post(post_id: str):
     return {"message": "Blog post deleted successfully"}
 
 
-import hashlib
-import base64
-import aiohttp
-
-
 async def subscribe_email_to_mailchimp(email: str):
     settings = await get_mailchimp_settings()
     if not settings.enabled:
@@ -772,6 +2331,8 @@ async def subscribe_email_to_mailchimp(email: str):
     if not settings.api_key or not settings.server_prefix or not settings.audience_id:
         return
 
+    import aiohttp
+
     api_key = settings.api_key
     dc = settings.server_prefix
     audience_id = settings.audience_id
@@ -788,19 +2349,21 @@ async def subscribe_email_to_mailchimp(email: str):
         "status": "subscribed",
     }
 
-    async with aiohttp.ClientSession() as session:
-        async with session.put(
-            url,
-            headers={
-                "Authorization": f"Basic {auth_header}",
-                "Content-Type": "application/json",
-            },
-            json=payload,
-            timeout=10,
-        ) as resp:
-            if resp.status >= 400:
-                text = await resp.text()
-                logging.warning("Mailchimp subscribe failed (%s): %s", resp.status, text)
+    with track_outbound("mailchimp", "subscribe") as call:
+        async with aiohttp.ClientSession() as session:
+            async with session.put(
+                url,
+                headers={
+                    "Authorization": f"Basic {auth_header}",
+                    "Content-Type": "application/json",
+                },
+                json=payload,
+                timeout=10,
+            ) as resp:
+                if resp.status >= 400:
+                    call.failed(f"http_{resp.status}")
+                    text = await resp.text()
+                    logging.warning("Mailchimp subscribe failed (%s): %s", resp.status, text)
 
 @api_router.get("/blog/categories")
 async def get_blog_categories():
@@ -809,16 +2372,177 @@ async def get_blog_categories():
     return {"categories": categories}
 
 
-# ==================== CONTACT API ROUTES ====================
+# ==================== RATE LIMITING ====================
 
-@api_router.post("/contact", response_model=ContactMessage, status_code=201)
-async def submit_contact_form(message_data: ContactMessageCreate):
-    """Submit a contact form message"""
-    message = ContactMessage(**message_data.model_dump())
-    doc = serialize_datetime(message.model_dump())
-    await db.contact_messages.insert_one(doc)
+# Public write endpoints are limited per client IP and per email address with
+# token buckets (burst capacity + steady refill per minute), and each route
+# has a cap on requests in flight. Rejections are answered with 429 before
+# any database or mail work happens.
+RATE_LIMIT_BACKEND = os.environ.get("RATE_LIMIT_BACKEND", "memory").lower()  # memory | mongo
+RATE_LIMIT_IP_BURST = int(os.environ.get("RATE_LIMIT_IP_BURST", "10"))
+RATE_LIMIT_IP_PER_MINUTE = float(os.environ.get("RATE_LIMIT_IP_PER_MINUTE", "10"))
+RATE_LIMIT_EMAIL_BURST = int(os.environ.get("RATE_LIMIT_EMAIL_BURST", "3"))
+RATE_LIMIT_EMAIL_PER_MINUTE = float(os.environ.get("RATE_LIMIT_EMAIL_PER_MINUTE", "1"))
+RATE_LIMIT_ROUTE_CONCURRENCY = int(os.environ.get("RATE_LIMIT_ROUTE_CONCURRENCY", "16"))
+# Number of reverse proxies in front of the API that append to X-Forwarded-For;
+# 0 uses the socket peer address (X-Forwarded-For is client-controlled otherwise).
+RATE_LIMIT_TRUSTED_PROXIES = int(os.environ.get("RATE_LIMIT_TRUSTED_PROXIES", "0"))
 
-    # Try to send notification email, but ignore failures so contact form always works
+
+class MemoryRateLimitStore:
+    """Token buckets in process memory (one API worker).
+
+    At most ``max_keys`` buckets are kept; the least recently used one is
+    dropped for a new key, which at worst lets that client start over with
+    a full bucket.
+    """
+
+    def __init__(self, max_keys: int = 50000):
+        self.max_keys = max_keys
+        # key -> (tokens, monotonic timestamp), least recently used first
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        """Take one token; return 0 when allowed, else the seconds until one is available."""
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (float(capacity), now))
+        tokens = min(float(capacity), tokens + (now - updated) * refill_per_second)
+        allowed = tokens >= 1
+        self._buckets[key] = (tokens - 1 if allowed else tokens, now)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        if allowed:
+            return 0.0
+        return (1 - tokens) / refill_per_second if refill_per_second > 0 else 60.0
+
+
+class MongoRateLimitStore:
+    """Token buckets shared by all API workers through the rate_limits collection.
+
+    Each check is one atomic pipeline update, so concurrent workers never
+    over-spend a bucket; idle buckets expire through a TTL index.
+    """
+
+    async def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        try:
+            return await self._take(key, capacity, refill_per_second)
+        except DuplicateKeyError:
+            # Two first requests for a key both tried to insert its bucket; the
+            # retry finds the inserted one and updates it.
+            return await self._take(key, capacity, refill_per_second)
+
+    async def _take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        now = time.time()
+        idle_seconds = capacity / refill_per_second if refill_per_second > 0 else 3600
+        refilled = {"$min": [
+            capacity,
+            {"$add": [
+                {"$ifNull": ["$tokens", capacity]},
+                {"$multiply": [{"$subtract": [now, {"$ifNull": ["$updated", now]}]}, refill_per_second]},
+            ]},
+        ]}
+        bucket = await db.rate_limits.find_one_and_update(
+            {"key": key},
+            [
+                {"$set": {"tokens": refilled, "updated": now}},
+                {"$set": {
+                    "allowed": {"$gte": ["$tokens", 1]},
+                    "expires_at": datetime.now(timezone.utc) + timedelta(seconds=idle_seconds),
+                }},
+                {"$set": {"tokens": {"$cond": ["$allowed", {"$subtract": ["$tokens", 1]}, "$tokens"]}}},
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        if bucket["allowed"]:
+            return 0.0
+        return (1 - bucket["tokens"]) / refill_per_second if refill_per_second > 0 else 60.0
+
+
+class RateLimiter:
+    def __init__(self, store):
+        self.store = store
+        self._in_flight: Dict[str, int] = {}
+        self.stats = {"allowed": 0, "rejected_ip": 0, "rejected_email": 0, "rejected_concurrency": 0}
+
+    @staticmethod
+    def reject(retry_after: float) -> HTTPException:
+        return HTTPException(
+            status_code=429,
+            detail="Too many requests, please try again later",
+            headers={"Retry-After": str(max(1, int(retry_after + 0.999)))},
+        )
+
+    async def hit(self, key: str, capacity: int, per_minute: float, reason: str) -> None:
+        retry_after = await self.store.take(key, capacity, per_minute / 60)
+        if retry_after > 0:
+            self.stats[f"rejected_{reason}"] += 1
+            raise self.reject(retry_after)
+
+    async def check_email(self, route: str, email: str) -> None:
+        await self.hit(f"email:{route}:{email.strip().lower()}", RATE_LIMIT_EMAIL_BURST, RATE_LIMIT_EMAIL_PER_MINUTE, "email")
+
+
+def client_ip(request: Request) -> str:
+    if RATE_LIMIT_TRUSTED_PROXIES > 0:
+        forwarded = [part.strip() for part in request.headers.get("x-forwarded-for", "").split(",") if part.strip()]
+        if len(forwarded) >= RATE_LIMIT_TRUSTED_PROXIES:
+            return forwarded[-RATE_LIMIT_TRUSTED_PROXIES]
+    return request.client.host if request.client else "unknown"
+
+
+rate_limiter = RateLimiter(MongoRateLimitStore() if RATE_LIMIT_BACKEND == "mongo" else MemoryRateLimitStore())
+
+
+def rate_limited(route: str, concurrency: int = RATE_LIMIT_ROUTE_CONCURRENCY):
+    """Dependency for a public write route: per-IP token bucket plus a cap on
+    concurrent requests (per API process). Per-email limits are checked by
+    the handler once the body is parsed (``rate_limiter.check_email``)."""
+
+    async def dependency(request: Request):
+        in_flight = rate_limiter._in_flight.get(route, 0)
+        if in_flight >= concurrency:
+            rate_limiter.stats["rejected_concurrency"] += 1
+            raise RateLimiter.reject(1)
+        # Counted before the bucket check awaits, so requests arriving
+        # meanwhile see this one; a rejection releases the slot again.
+        rate_limiter._in_flight[route] = in_flight + 1
+        try:
+            await rate_limiter.hit(f"ip:{route}:{client_ip(request)}", RATE_LIMIT_IP_BURST, RATE_LIMIT_IP_PER_MINUTE, "ip")
+            rate_limiter.stats["allowed"] += 1
+            yield
+        finally:
+            rate_limiter._in_flight[route] -= 1
+
+    return dependency
+
+
+@api_router.get("/admin/rate-limits", dependencies=[Depends(require_admin)])
+async def get_rate_limit_stats():
+    """Rate limiter configuration and counters since server start."""
+    return {
+        "backend": RATE_LIMIT_BACKEND,
+        "ip": {"burst": RATE_LIMIT_IP_BURST, "per_minute": RATE_LIMIT_IP_PER_MINUTE},
+        "email": {"burst": RATE_LIMIT_EMAIL_BURST, "per_minute": RATE_LIMIT_EMAIL_PER_MINUTE},
+        "route_concurrency": RATE_LIMIT_ROUTE_CONCURRENCY,
+        "in_flight": dict(rate_limiter._in_flight),
+        **rate_limiter.stats,
+    }
+
+
+# ==================== CONTACT API ROUTES ====================
+
+@api_router.post(
+    "/contact", response_model=ContactMessage, status_code=201, dependencies=[Depends(rate_limited("contact"))]
+)
+async def submit_contact_form(message_data: ContactMessageCreate):
+    """Submit a contact form message"""
+    await rate_limiter.check_email("contact", message_data.email)
+    message = ContactMessage(**message_data.model_dump())
+    doc = serialize_datetime(message.model_dump())
+    await db.contact_messages.insert_one(doc)
+
+    # Try to send notification email, but ignore failures so contact form always works
     try:
         await send_contact_notification_email(message)
     except Exception:
@@ -826,7 +2550,7 @@ async def submit_contact_form(message_data: ContactMessageCreate):
 
     return message
 
-@api_router.get("/contact/messages", response_model=List[ContactMessage])
+@api_router.get("/contact/messages", response_model=List[ContactMessage], dependencies=[Depends(require_admin)])
 async def get_contact_messages(
     read: Optional[bool] = None,
     limit: int = Query(default=50, le=200),
@@ -844,7 +2568,7 @@ async def get_contact_messages(
     
     return messages
 
-@api_router.put("/contact/messages/{message_id}/read")
+@api_router.put("/contact/messages/{message_id}/read", dependencies=[Depends(require_admin)])
 async def mark_message_read(message_id: str, read: bool = True):
     """Mark a contact message as read/unread"""
     result = await db.contact_messages.update_one({"id": message_id}, {"$set": {"read": read}})
@@ -855,9 +2579,10 @@ async def mark_message_read(message_id: str, read: bool = True):
 
 # ==================== NEWSLETTER API ROUTES ====================
 
-@api_router.post("/newsletter/subscribe", status_code=201)
+@api_router.post("/newsletter/subscribe", status_code=201, dependencies=[Depends(rate_limited("newsletter"))])
 async def subscribe_newsletter(email: EmailStr = Body(..., embed=True)):
     """Subscribe to newsletter"""
+    await rate_limiter.check_email("newsletter", email)
     existing = await db.newsletter_subscriptions.find_one({"email": email})
     if existing:
         if existing.get("active"):
@@ -886,9 +2611,10 @@ async def subscribe_newsletter(email: EmailStr = Body(..., embed=True)):
 
     return {"message": "Successfully subscribed"}
 
-@api_router.post("/newsletter/unsubscribe")
+@api_router.post("/newsletter/unsubscribe", dependencies=[Depends(rate_limited("newsletter"))])
 async def unsubscribe_newsletter(email: EmailStr = Body(..., embed=True)):
     """Unsubscribe from newsletter"""
+    await rate_limiter.check_email("newsletter", email)
     result = await db.newsletter_subscriptions.update_one(
         {"email": email}, 
         {"$set": {"active": False}}
@@ -897,7 +2623,7 @@ async def unsubscribe_newsletter(email: EmailStr = Body(..., embed=True)):
         raise HTTPException(status_code=404, detail="Email not found")
     return {"message": "Successfully unsubscribed"}
 
-@api_router.get("/newsletter/subscribers")
+@api_router.get("/newsletter/subscribers", dependencies=[Depends(require_admin)])
 async def get_newsletter_subscribers(active_only: bool = True):
     """Get all newsletter subscribers (admin)"""
     query = {"active": True} if active_only else {}
@@ -942,7 +2668,7 @@ async def get_page(page_id: str):
     return page
 
 
-@api_router.post("/pages", response_model=Page, status_code=201)
+@api_router.post("/pages", response_model=Page, status_code=201, dependencies=[Depends(require_admin)])
 async def create_page(page_data: PageCreate):
     """Create a new page"""
     # Ensure slug is unique
@@ -969,7 +2695,7 @@ async def create_page(page_data: PageCreate):
     return page
 
 
-@api_router.put("/pages/{page_id}", response_model=Page)
+@api_router.put("/pages/{page_id}", response_model=Page, dependencies=[Depends(require_admin)])
 async def update_page(page_id: str, page_data: PageUpdate):
     """Update an existing page"""
     existing = await db.pages.find_one({"id": page_id}, {"_id": 0})
@@ -999,7 +2725,7 @@ async def update_page(page_id: str, page_data: PageUpdate):
     return updated
 
 
-@api_router.delete("/pages/{page_id}")
+@api_router.delete("/pages/{page_id}", dependencies=[Depends(require_admin)])
 async def delete_page(page_id: str):
     """Delete a page (system pages cannot be deleted)"""
     existing = await db.pages.find_one({"id": page_id}, {"_id": 0})
@@ -1018,6 +2744,102 @@ async def delete_page(page_id: str):
 
 # ==================== MENU API ROUTES ====================
 
+# Menus are stored as a validated tree: items given flat with parent_id are
+# moved under their parent and every level is sorted by ``order``. Public
+# pages read a compact per-language rendering (visible items only, label
+# resolved) that is cached in-process per menu version. The version (id and
+# updated_at) is read on every request, so an edit made through any worker
+# is served by all of them at once.
+MENU_MAX_DEPTH = int(os.environ.get("MENU_MAX_DEPTH", "3"))
+# Any other ?lang= is rendered as English, so the cache holds at most one
+# entry per menu and language
+MENU_LANGUAGES = ("en", "hr", "de", "sl")
+
+# (menu name, lang) -> ((menu id, updated_at), rendered menu, etag)
+menu_render_cache: Dict[Tuple[str, str], Tuple[Tuple[Any, Any], Dict[str, Any], str]] = {}
+
+
+def normalize_menu_items(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Validate menu items and return them as a sorted tree."""
+    flat: List[Dict[str, Any]] = []
+
+    def collect(raw_items: List[Any], parent_id: Optional[str], depth: int) -> None:
+        for raw in raw_items or []:
+            if not isinstance(raw, dict):
+                raise HTTPException(status_code=400, detail="Menu items must be objects")
+            if depth > MENU_MAX_DEPTH:
+                raise HTTPException(status_code=400, detail=f"Menus can be at most {MENU_MAX_DEPTH} levels deep")
+            try:
+                item = MenuItem(**{**raw, "children": []}).model_dump()
+            except ValidationError as e:
+                raise HTTPException(status_code=400, detail=f"Invalid menu item: {e.errors()[0]['msg']}")
+            if parent_id is not None:
+                item["parent_id"] = parent_id
+            flat.append(item)
+            collect(raw.get("children") or [], item["id"], depth + 1)
+
+    collect(items, None, 1)
+
+    by_id: Dict[str, Dict[str, Any]] = {}
+    for item in flat:
+        if item["id"] in by_id:
+            raise HTTPException(status_code=400, detail=f"Duplicate menu item id: {item['id']}")
+        by_id[item["id"]] = item
+
+    roots: List[Dict[str, Any]] = []
+    for item in flat:
+        parent = by_id.get(item["parent_id"]) if item["parent_id"] else None
+        if parent is None:
+            item["parent_id"] = None
+            roots.append(item)
+        else:
+            parent["children"].append(item)
+
+    # Items whose parent_id chain never reaches a root (a cycle) are not reachable
+    if sum(1 for _ in iter_menu_items(roots)) != len(flat):
+        raise HTTPException(status_code=400, detail="Menu items form a cycle")
+
+    def finish(level: List[Dict[str, Any]], depth: int) -> None:
+        if level and depth > MENU_MAX_DEPTH:
+            raise HTTPException(status_code=400, detail=f"Menus can be at most {MENU_MAX_DEPTH} levels deep")
+        level.sort(key=lambda i: i["order"])
+        for item in level:
+            finish(item["children"], depth + 1)
+
+    finish(roots, 1)
+    return roots
+
+
+def iter_menu_items(items: List[Dict[str, Any]]):
+    for item in items:
+        yield item
+        yield from iter_menu_items(item.get("children") or [])
+
+
+def render_menu_items(items: List[Dict[str, Any]], lang: str) -> List[Dict[str, Any]]:
+    rendered = []
+    for item in sorted(items, key=lambda i: i.get("order", 0)):
+        if item.get("visible", True) is False:
+            continue
+        labels = item.get("label") or {}
+        label = labels.get(lang) or labels.get("en") or next((v for v in labels.values() if v), "") or item.get("url", "")
+        rendered.append({
+            "id": item.get("id"),
+            "label": label,
+            "url": item.get("url", ""),
+            "target": item.get("target", "_self"),
+            "children": render_menu_items(
+                [c for c in item.get("children") or [] if isinstance(c, dict)], lang
+            ),
+        })
+    return rendered
+
+
+def invalidate_menu_cache(name: str) -> None:
+    for key in [key for key in menu_render_cache if key[0] == name]:
+        menu_render_cache.pop(key, None)
+
+
 @api_router.get("/menus", response_model=List[Menu])
 async def get_menus():
     """Get all menus"""
@@ -1028,8 +2850,40 @@ async def get_menus():
 
 
 @api_router.get("/menus/{name}", response_model=Menu)
-async def get_menu_by_name(name: str):
-    """Get a single menu by name (e.g. 'header', 'mobile', 'footer')"""
+async def get_menu_by_name(
+    name: str,
+    lang: Optional[str] = Query(None, description="Return the compact rendering for this language"),
+    if_none_match: Optional[str] = Header(default=None),
+):
+    """Get a single menu by name (e.g. 'header', 'mobile', 'footer').
+
+    With ``?lang=`` only visible items are returned, sorted, with the label
+    resolved for that language: ``{name, lang, items: [{id, label, url,
+    target, children}]}``.
+    """
+    if lang is not None:
+        if lang not in MENU_LANGUAGES:
+            lang = "en"
+        current = await db.menus.find_one({"name": name}, {"_id": 0, "id": 1, "updated_at": 1})
+        if current is None:
+            invalidate_menu_cache(name)
+            raise HTTPException(status_code=404, detail="Menu not found")
+        version = (current.get("id"), current.get("updated_at"))
+        cached = menu_render_cache.get((name, lang))
+        if cached is None or cached[0] != version:
+            menu = await db.menus.find_one({"name": name}, {"_id": 0, "id": 1, "updated_at": 1, "items": 1})
+            if menu is None:
+                raise HTTPException(status_code=404, detail="Menu not found")
+            rendered = {"name": name, "lang": lang, "items": render_menu_items(menu.get("items") or [], lang)}
+            etag = hashlib.sha256(json.dumps(rendered, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+            cached = ((menu.get("id"), menu.get("updated_at")), rendered, f'"{etag}"')
+            menu_render_cache[(name, lang)] = cached
+        # Browsers revalidate every time so menu edits show up immediately
+        headers = {"Cache-Control": "no-cache", "ETag": cached[2]}
+        if if_none_match == cached[2]:
+            return Response(status_code=304, headers=headers)
+        return JSONResponse(cached[1], headers=headers)
+
     menu = await db.menus.find_one({"name": name}, {"_id": 0})
     if not menu:
         raise HTTPException(status_code=404, detail="Menu not found")
@@ -1037,28 +2891,25 @@ async def get_menu_by_name(name: str):
     return menu
 
 
-@api_router.post("/menus", response_model=Menu, status_code=201)
+@api_router.post("/menus", response_model=Menu, status_code=201, dependencies=[Depends(require_admin)])
 async def create_menu(menu_data: MenuCreate):
     """Create a new menu"""
     existing = await db.menus.find_one({"name": menu_data.name})
     if existing:
         raise HTTPException(status_code=400, detail="Menu with this name already exists")
 
-    items: List[MenuItem] = []
-    for item in menu_data.items or []:
-        items.append(MenuItem(**item))
-
     menu = Menu(
         name=menu_data.name,
-        items=items,
+        items=normalize_menu_items(menu_data.items),
     )
 
     doc = serialize_datetime(menu.model_dump())
     await db.menus.insert_one(doc)
+    invalidate_menu_cache(menu.name)
     return menu
 
 
-@api_router.put("/menus/{name}", response_model=Menu)
+@api_router.put("/menus/{name}", response_model=Menu, dependencies=[Depends(require_admin)])
 async def update_menu(name: str, menu_data: MenuUpdate):
     """Update menu items for a given menu name"""
     existing = await db.menus.find_one({"name": name}, {"_id": 0})
@@ -1068,24 +2919,23 @@ async def update_menu(name: str, menu_data: MenuUpdate):
     update_data: Dict[str, Any] = {}
 
     if menu_data.items is not None:
-        normalized_items: List[Dict[str, Any]] = []
-        for item in menu_data.items:
-            normalized_items.append(MenuItem(**item).model_dump())
-        update_data["items"] = normalized_items
+        update_data["items"] = normalize_menu_items(menu_data.items)
 
     update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
 
     await db.menus.update_one({"name": name}, {"$set": update_data})
+    invalidate_menu_cache(name)
 
     updated = await db.menus.find_one({"name": name}, {"_id": 0})
     deserialize_datetime(updated, ["created_at", "updated_at"])
     return updated
 
 
-@api_router.delete("/menus/{name}")
+@api_router.delete("/menus/{name}", dependencies=[Depends(require_admin)])
 async def delete_menu(name: str):
     """Delete a menu"""
     result = await db.menus.delete_one({"name": name})
+    invalidate_menu_cache(name)
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Menu not found")
     return {"message": "Menu deleted successfully"}
@@ -1113,7 +2963,7 @@ async def get_cms_content(key: str):
     deserialize_datetime(content, ["created_at", "updated_at"])
     return content
 
-@api_router.post("/cms/content", response_model=CMSContent, status_code=201)
+@api_router.post("/cms/content", response_model=CMSContent, status_code=201, dependencies=[Depends(require_admin)])
 async def create_cms_content(content_data: CMSContentCreate):
     """Create new CMS content"""
     existing = await db.cms_content.find_one({"key": content_data.key})
@@ -1125,7 +2975,7 @@ async def create_cms_content(content_data: CMSContentCreate):
     await db.cms_content.insert_one(doc)
     return content
 
-@api_router.put("/cms/content/{key}", response_model=CMSContent)
+@api_router.put("/cms/content/{key}", response_model=CMSContent, dependencies=[Depends(require_admin)])
 async def update_cms_content(key: str, content_data: CMSContentUpdate):
     """Update CMS content"""
     existing = await db.cms_content.find_one({"key": key}, {"_id": 0})
@@ -1141,7 +2991,7 @@ async def update_cms_content(key: str, content_data: CMSContentUpdate):
     deserialize_datetime(updated, ["created_at", "updated_at"])
     return updated
 
-@api_router.delete("/cms/content/{key}")
+@api_router.delete("/cms/content/{key}", dependencies=[Depends(require_admin)])
 async def delete_cms_content(key: str):
     """Delete CMS content"""
     result = await db.cms_content.delete_one({"key": key})
@@ -1150,6 +3000,376 @@ async def delete_cms_content(key: str):
     return {"message": "Content deleted successfully"}
 
 
+# ==================== PARTIAL UPDATE (PATCH) API ROUTES ====================
+
+# PATCH on pages, blog posts and CMS content accepts a JSON Patch (RFC 6902,
+# a list of add/remove/replace/test operations) or a JSON Merge Patch
+# (RFC 7386, an object). Page sections are addressed by id instead of array
+# index, e.g. ``/sections/<section id>/content/headline/en``. Operations are
+# translated into $set/$unset/$push/$pull on the touched paths only, so the
+# payload, the validation and the write all scale with the edit.
+
+PAGE_PATCH_FIELDS = {
+    "title": "translations",
+    "meta_description": "translations",
+    "published": "value",
+    "sections": "sections",
+}
+BLOG_POST_PATCH_FIELDS = {
+    "title": "translations",
+    "excerpt": "translations",
+    "content": "translations",
+    "category": "value",
+    "featured_image": "value",
+    "tags": "list",
+    "status": "value",
+    "author": "value",
+}
+CMS_CONTENT_PATCH_FIELDS = {"content": "object"}
+SECTION_PATCH_FIELDS = {"section_type": "value", "order": "value", "visible": "value", "content": "object"}
+# Top-level fields that may be removed (set to null); all others are required
+PATCH_NULLABLE_FIELDS = {"meta_description", "featured_image"}
+
+
+class JSONPatchOperation(BaseModel):
+    op: str
+    path: str
+    value: Any = None
+
+
+class PageSectionPatch(BaseModel):
+    section_type: Optional[str] = None
+    order: Optional[int] = None
+    visible: Optional[bool] = None
+    content: Optional[Dict[str, Any]] = None
+
+
+def parse_json_pointer(pointer: str) -> List[str]:
+    if not pointer.startswith("/") or pointer == "/":
+        raise HTTPException(status_code=400, detail=f"Invalid JSON Pointer: {pointer!r}")
+    return [part.replace("~1", "/").replace("~0", "~") for part in pointer[1:].split("/")]
+
+
+def format_json_pointer(segments: List[str]) -> str:
+    return "".join("/" + str(s).replace("~", "~0").replace("/", "~1") for s in segments)
+
+
+def mongo_field_path(segments: List[str]) -> str:
+    for segment in segments:
+        if not segment or "." in segment or segment.startswith("$"):
+            raise HTTPException(status_code=400, detail=f"Unsupported field name in patch path: {segment!r}")
+    return ".".join(segments)
+
+
+def validate_patch_field(model, field: str, value: Any) -> Any:
+    try:
+        return model(**{field: value}).model_dump(include={field})[field]
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid value for {field}: {e.errors()[0]['msg']}")
+
+
+def validate_page_section(value: Any, section_id: Optional[str] = None) -> Dict[str, Any]:
+    if not isinstance(value, dict):
+        raise HTTPException(status_code=400, detail="A section must be an object")
+    if section_id is not None:
+        value = {**value, "id": section_id}
+    try:
+        return PageSection(**value).model_dump()
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid section: {e.errors()[0]['msg']}")
+
+
+class PatchPlan:
+    """Mongo update batches for one patch.
+
+    Mongo refuses two operators on overlapping paths in one update (e.g.
+    $pull on ``sections`` next to $set on ``sections.$[s0].order``), so an
+    operation that overlaps an earlier one starts a new batch; batches run in
+    order, which keeps JSON Patch's sequential semantics.
+    """
+
+    def __init__(self):
+        self.batches: List[Dict[str, Any]] = []
+        self._identifiers: Dict[str, str] = {}
+
+    def section_identifier(self, section_id: str) -> str:
+        return self._identifiers.setdefault(section_id, f"s{len(self._identifiers)}")
+
+    def add(self, operator: str, path: str, value: Any, section_id: Optional[str] = None) -> None:
+        def overlaps(other: str) -> bool:
+            return other == path or other.startswith(path + ".") or path.startswith(other + ".")
+
+        if not self.batches or any(overlaps(other) for other in self.batches[-1]["paths"]):
+            self.batches.append({"update": {}, "paths": [], "array_filters": {}})
+        batch = self.batches[-1]
+        batch["update"].setdefault(operator, {})[path] = value
+        batch["paths"].append(path)
+        if section_id is not None:
+            identifier = self._identifiers[section_id]
+            batch["array_filters"][identifier] = {f"{identifier}.id": section_id}
+
+
+def plan_section_operation(plan: PatchPlan, op: JSONPatchOperation, segments: List[str]) -> None:
+    if len(segments) == 1:
+        if op.op == "remove" or not isinstance(op.value, list):
+            raise HTTPException(status_code=400, detail="sections can only be replaced with a list")
+        plan.add("$set", "sections", [validate_page_section(s) for s in op.value])
+        return
+
+    section_id = segments[1]
+    if section_id == "-":
+        if op.op != "add" or len(segments) != 2:
+            raise HTTPException(status_code=400, detail="/sections/- only supports add")
+        plan.add("$push", "sections", validate_page_section(op.value))
+        return
+
+    identifier = plan.section_identifier(section_id)
+    if len(segments) == 2:
+        if op.op == "remove":
+            plan.add("$pull", "sections", {"id": section_id})
+        else:
+            plan.add("$set", f"sections.$[{identifier}]", validate_page_section(op.value, section_id), section_id)
+        return
+
+    field, rest = segments[2], segments[3:]
+    kind = SECTION_PATCH_FIELDS.get(field)
+    if kind is None:
+        raise HTTPException(status_code=400, detail=f"Section field cannot be patched: {field}")
+    relative = mongo_field_path(segments[2:])
+    if op.op == "remove":
+        if not rest:
+            raise HTTPException(status_code=400, detail=f"Section field {field} cannot be removed")
+        plan.add("$unset", f"sections.$[{identifier}].{relative}", "", section_id)
+    else:
+        value = validate_patch_field(PageSectionPatch, field, op.value) if not rest else op.value
+        if not rest and value is None:
+            raise HTTPException(status_code=400, detail=f"Section field {field} cannot be null")
+        plan.add("$set", f"sections.$[{identifier}].{relative}", value, section_id)
+
+
+def plan_patch(operations: List[JSONPatchOperation], fields: Dict[str, str], model) -> PatchPlan:
+    plan = PatchPlan()
+    for op in operations:
+        if op.op not in ("add", "remove", "replace", "test"):
+            raise HTTPException(status_code=400, detail=f"Unsupported patch operation: {op.op}")
+        segments = parse_json_pointer(op.path)
+        root, rest = segments[0], segments[1:]
+        kind = fields.get(root)
+        if kind is None:
+            raise HTTPException(status_code=400, detail=f"Field cannot be patched: {root}")
+        if op.op == "test":
+            # Checked against the stored document by check_patch_operations
+            continue
+        if kind == "sections":
+            plan_section_operation(plan, op, segments)
+            continue
+
+        path = mongo_field_path(segments)
+        if op.op == "remove":
+            if rest:
+                plan.add("$unset", path, "")
+            elif root in PATCH_NULLABLE_FIELDS:
+                plan.add("$set", path, None)
+            else:
+                raise HTTPException(status_code=400, detail=f"Field {root} cannot be removed")
+        elif not rest:
+            value = validate_patch_field(model, root, op.value)
+            if value is None and root not in PATCH_NULLABLE_FIELDS:
+                raise HTTPException(status_code=400, detail=f"Field {root} cannot be null")
+            plan.add("$set", path, value)
+        elif kind == "translations":
+            if len(rest) != 1 or not isinstance(op.value, str):
+                raise HTTPException(status_code=400, detail=f"{op.path} must be a string translation")
+            plan.add("$set", path, op.value)
+        elif kind == "object":
+            plan.add("$set", path, op.value)
+        elif kind == "list" and rest == ["-"] and op.op == "add":
+            plan.add("$push", root, validate_patch_field(model, root, [op.value])[0])
+        else:
+            raise HTTPException(status_code=400, detail=f"Unsupported patch path: {op.path}")
+    return plan
+
+
+def merge_patch_operations(patch: Dict[str, Any], fields: Dict[str, str]) -> List[JSONPatchOperation]:
+    """Turn a JSON Merge Patch into the equivalent JSON Patch operations.
+
+    For pages, ``{"sections": {"<section id>": {...}}}`` merges into that
+    section (``null`` removes it); a list still replaces all sections.
+    """
+    operations: List[JSONPatchOperation] = []
+
+    def mergeable(path: List[str]) -> bool:
+        kind = fields.get(path[0])
+        if kind in ("translations", "object"):
+            return True
+        if kind == "sections":
+            return len(path) <= 2 or (path[2] == "content")
+        return False
+
+    def walk(prefix: List[str], obj: Dict[str, Any]) -> None:
+        for key, value in obj.items():
+            path = prefix + [key]
+            if value is None:
+                operations.append(JSONPatchOperation(op="remove", path=format_json_pointer(path)))
+            elif isinstance(value, dict) and mergeable(path):
+                walk(path, value)
+            else:
+                operations.append(JSONPatchOperation(op="add", path=format_json_pointer(path), value=value))
+
+    walk([], patch)
+    return operations
+
+
+_MISSING = object()
+
+
+def locate_patch_target(
+    doc: Dict[str, Any], segments: List[str], fields: Dict[str, str], create_parents: bool = False
+) -> Tuple[Any, str]:
+    """The container holding the value a patch path points at and its key in it.
+
+    Containers are dicts, or lists whose items are addressed by ``id`` (page
+    sections) or appended to with ``-``. The container is None when a parent
+    on the path does not exist, unless ``create_parents`` adds missing objects
+    the way $set (and a merge patch) does.
+    """
+    node: Any = doc
+    keys = segments[:-1]
+    if fields.get(segments[0]) == "sections" and len(segments) > 2:
+        node = next(
+            (s for s in doc.get("sections") or [] if isinstance(s, dict) and s.get("id") == segments[1]), None
+        )
+        keys = segments[2:-1]
+    for key in keys:
+        if create_parents and isinstance(node, dict) and node.get(key) is None:
+            node[key] = {}
+        node = node.get(key) if isinstance(node, dict) else None
+    if not isinstance(node, (dict, list)):
+        return None, segments[-1]
+    return node, segments[-1]
+
+
+def read_patch_value(container: Any, key: str) -> Any:
+    if isinstance(container, dict):
+        return container.get(key, _MISSING)
+    if isinstance(container, list):
+        return next((item for item in container if isinstance(item, dict) and item.get("id") == key), _MISSING)
+    return _MISSING
+
+
+def check_patch_operations(
+    doc: Dict[str, Any], operations: List[JSONPatchOperation], fields: Dict[str, str], merge: bool = False
+) -> None:
+    """Run the patch against a copy of the stored document, in order.
+
+    ``test`` compares values with ``==`` (never as a query), and ``replace``,
+    ``remove`` and writes below a missing parent fail as RFC 6902 requires.
+    Operations from a merge patch create missing objects and removing a
+    missing member is a no-op (RFC 7386).
+    """
+    doc = copy.deepcopy(doc)
+    for op in operations:
+        segments = parse_json_pointer(op.path)
+        container, key = locate_patch_target(doc, segments, fields, create_parents=merge)
+        current = read_patch_value(container, key)
+        if merge and op.op == "remove" and current is _MISSING:
+            continue
+        if op.op == "test":
+            if current is _MISSING or current != op.value:
+                raise HTTPException(status_code=409, detail=f"Patch test failed: {op.path}")
+            continue
+        if container is None:
+            raise HTTPException(status_code=409, detail=f"Patch path does not exist: {op.path}")
+        top_level_remove = op.op == "remove" and len(segments) == 1
+        if current is _MISSING and (op.op == "replace" or (op.op == "remove" and not top_level_remove)):
+            raise HTTPException(status_code=409, detail=f"Patch path does not exist: {op.path}")
+        if isinstance(container, list):
+            if op.op == "remove":
+                container[:] = [item for item in container if item is not current]
+            elif key == "-":
+                container.append(op.value)
+            elif current is _MISSING:
+                raise HTTPException(status_code=409, detail=f"Patch path does not exist: {op.path}")
+            else:
+                container[container.index(current)] = op.value
+        elif op.op == "remove":
+            container.pop(key, None)
+        else:
+            container[key] = op.value
+
+
+async def apply_patch(
+    collection,
+    id_field: str,
+    doc_id: str,
+    patch: Union[List[JSONPatchOperation], Dict[str, Any]],
+    fields: Dict[str, str],
+    model,
+    not_found: str,
+) -> Dict[str, Any]:
+    operations = patch if isinstance(patch, list) else merge_patch_operations(patch, fields)
+    plan = plan_patch(operations, fields, model)
+
+    roots = {parse_json_pointer(op.path)[0] for op in operations}
+    current = await collection.find_one(
+        {id_field: doc_id}, {"_id": 0, "updated_at": 1, **{root: 1 for root in roots}}
+    )
+    if current is None:
+        raise HTTPException(status_code=404, detail=not_found)
+    check_patch_operations(current, operations, fields, merge=not isinstance(patch, list))
+
+    # Every batch only applies while updated_at still holds the value this
+    # patch read (or last wrote), so a concurrent write is never overwritten
+    # and cannot slip in between the batches of a multi-batch patch.
+    expected = current.get("updated_at")
+    batches = plan.batches or [{"update": {}, "array_filters": {}}]
+    try:
+        for index, batch in enumerate(batches):
+            stamp = datetime.now(timezone.utc).isoformat()
+            batch["update"].setdefault("$set", {})["updated_at"] = stamp
+            result = await collection.update_one(
+                {id_field: doc_id, "updated_at": expected},
+                batch["update"],
+                array_filters=list(batch["array_filters"].values()) or None,
+            )
+            if result.matched_count == 0:
+                if index == 0:
+                    raise HTTPException(status_code=409, detail="The document was modified concurrently; retry the patch")
+                raise HTTPException(
+                    status_code=409,
+                    detail=f"The document was modified concurrently; only {index} of {len(batches)} patch steps were applied",
+                )
+            expected = stamp
+    except OperationFailure as e:
+        raise HTTPException(status_code=400, detail=f"Patch could not be applied: {e.details.get('errmsg') if e.details else e}")
+
+    updated = await collection.find_one({id_field: doc_id}, {"_id": 0})
+    deserialize_datetime(updated, ["created_at", "updated_at"])
+    return updated
+
+
+@api_router.patch("/pages/{page_id}", response_model=Page, dependencies=[Depends(require_admin)])
+async def patch_page(page_id: str, patch: Union[List[JSONPatchOperation], Dict[str, Any]] = Body(...)):
+    """Partially update a page with a JSON Patch or JSON Merge Patch"""
+    return await apply_patch(db.pages, "id", page_id, patch, PAGE_PATCH_FIELDS, PageUpdate, "Page not found")
+
+
+@api_router.patch("/blog/posts/{post_id}", response_model=BlogPost, dependencies=[Depends(require_admin)])
+async def patch_blog_post(post_id: str, patch: Union[List[JSONPatchOperation], Dict[str, Any]] = Body(...)):
+    """Partially update a blog post with a JSON Patch or JSON Merge Patch"""
+    return await apply_patch(
+        db.blog_posts, "id", post_id, patch, BLOG_POST_PATCH_FIELDS, BlogPostUpdate, "Blog post not found"
+    )
+
+
+@api_router.patch("/cms/content/{key}", response_model=CMSContent, dependencies=[Depends(require_admin)])
+async def patch_cms_content(key: str, patch: Union[List[JSONPatchOperation], Dict[str, Any]] = Body(...)):
+    """Partially update CMS content with a JSON Patch or JSON Merge Patch"""
+    return await apply_patch(
+        db.cms_content, "key", key, patch, CMS_CONTENT_PATCH_FIELDS, CMSContentUpdate, "Content not found"
+    )
+
+
 # ==================== TESTIMONIALS API ROUTES ====================
 
 @api_router.get("/testimonials", response_model=List[Testimonial])
@@ -1161,7 +3381,7 @@ async def get_testimonials(active_only: bool = True):
         deserialize_datetime(t, ["created_at"])
     return testimonials
 
-@api_router.post("/testimonials", response_model=Testimonial, status_code=201)
+@api_router.post("/testimonials", response_model=Testimonial, status_code=201, dependencies=[Depends(require_admin)])
 async def create_testimonial(testimonial_data: TestimonialCreate):
     """Create a new testimonial"""
     testimonial = Testimonial(**testimonial_data.model_dump())
@@ -1169,7 +3389,7 @@ async def create_testimonial(testimonial_data: TestimonialCreate):
     await db.testimonials.insert_one(doc)
     return testimonial
 
-@api_router.put("/testimonials/{testimonial_id}", response_model=Testimonial)
+@api_router.put("/testimonials/{testimonial_id}", response_model=Testimonial, dependencies=[Depends(require_admin)])
 async def update_testimonial(testimonial_id: str, testimonial_data: TestimonialCreate):
     """Update a testimonial"""
     existing = await db.testimonials.find_one({"id": testimonial_id}, {"_id": 0})
@@ -1182,13 +3402,13 @@ async def update_testimonial(testimonial_id: str, testimonial_data: TestimonialC
     updated = await db.testimonials.find_one({"id": testimonial_id}, {"_id": 0})
 
 
-@api_router.get("/admin/users", response_model=List[AdminUser])
+@api_router.get("/admin/users", response_model=List[AdminUser], dependencies=[Depends(require_admin)])
 async def get_admin_users():
     users = await db.admin_users.find({}, {"_id": 0}).sort("created_at", 1).to_list(100)
     return users
 
 
-@api_router.post("/admin/users", response_model=AdminUser, status_code=201)
+@api_router.post("/admin/users", response_model=AdminUser, status_code=201, dependencies=[Depends(require_admin)])
 async def create_admin_user(user_data: AdminUserCreate):
     # Check existing username
     existing = await db.admin_users.find_one({"username": user_data.username})
@@ -1198,13 +3418,13 @@ async def create_admin_user(user_data: AdminUserCreate):
     user = AdminUser(**user_data.model_dump(exclude={"password"}))
     doc = user.model_dump()
     # Store password as hash using passlib
-    doc["password_hash"] = pwd_context.hash(user_data.password)
+    doc["password_hash"] = await password_hasher.hash(user_data.password)
     await db.admin_users.insert_one(doc)
     # Never return password hash
     return user
 
 
-@api_router.put("/admin/users/{user_id}", response_model=AdminUser)
+@api_router.put("/admin/users/{user_id}", response_model=AdminUser, dependencies=[Depends(require_admin)])
 async def update_admin_user(user_id: str, user_data: AdminUserUpdate):
     existing = await db.admin_users.find_one({"id": user_id})
     if not existing:
@@ -1214,7 +3434,7 @@ async def update_admin_user(user_id: str, user_data: AdminUserUpdate):
     if user_data.role is not None:
         update_data["role"] = user_data.role
     if user_data.password is not None and user_data.password != "":
-        update_data["password_hash"] = pwd_context.hash(user_data.password)
+        update_data["password_hash"] = await password_hasher.hash(user_data.password)
 
     if not update_data:
         user = await db.admin_users.find_one({"id": user_id}, {"_id": 0})
@@ -1226,7 +3446,7 @@ async def update_admin_user(user_id: str, user_data: AdminUserUpdate):
     return AdminUser(**{k: v for k, v in updated.items() if k not in ("password", "password_hash")})
 
 
-@api_router.delete("/admin/users/{user_id}")
+@api_router.delete("/admin/users/{user_id}", dependencies=[Depends(require_admin)])
 async def delete_admin_user(user_id: str):
     result = await db.admin_users.delete_one({"id": user_id})
     if result.deleted_count == 0:
@@ -1234,7 +3454,7 @@ async def delete_admin_user(user_id: str):
     return {"message": "User deleted successfully"}
 
 
-@api_router.delete("/testimonials/{testimonial_id}")
+@api_router.delete("/testimonials/{testimonial_id}", dependencies=[Depends(require_admin)])
 async def delete_testimonial(testimonial_id: str):
     """Delete a testimonial"""
     result = await db.testimonials.delete_one({"id": testimonial_id})
@@ -1255,19 +3475,110 @@ async def admin_login(credentials: AdminLoginRequest):
     """Admin login using users stored in admin_users collection (fallback to env-based MVP)."""
     # 1) Try DB-based users
     user = await db.admin_users.find_one({"username": credentials.username})
-    if user and user.get("password_hash") and pwd_context.verify(credentials.password, user["password_hash"]):
-        return {"success": True}
+    if user and user.get("password_hash"):
+        verified, new_hash = await password_hasher.verify_and_update(credentials.password, user["password_hash"])
+        if verified:
+            if new_hash:
+                await db.admin_users.update_one({"id": user["id"]}, {"$set": {"password_hash": new_hash}})
+            return await issue_session_tokens(user["username"], user.get("role") or "admin")
 
     # 2) Fallback to env-based single admin (for backward compatibility)
     expected_user = os.environ.get("CMS_ADMIN_USERNAME", "admin")
     expected_pass = os.environ.get("CMS_ADMIN_PASSWORD", "admin123")
 
-    if credentials.username == expected_user and credentials.password == expected_pass:
-        return {"success": True}
+    # Constant-time comparison; evaluate both so timing does not reveal which one matched
+    user_ok = hmac.compare_digest(credentials.username.encode(), expected_user.encode())
+    pass_ok = hmac.compare_digest(credentials.password.encode(), expected_pass.encode())
+    if user_ok and pass_ok:
+        return await issue_session_tokens(expected_user, "owner")
 
     raise HTTPException(status_code=401, detail="Invalid credentials")
 
 
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
+
+
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
+
+
+@api_router.post("/auth/refresh")
+async def refresh_admin_session(payload: RefreshTokenRequest):
+    """Exchange a refresh token for a new access/refresh pair (the old refresh token stops working)."""
+    token_hash = hash_refresh_token(payload.refresh_token)
+    session = await db.admin_sessions.find_one(
+        {"token_hash": token_hash, "expires_at": {"$gt": datetime.now(timezone.utc)}}, {"_id": 0}
+    )
+    if not session:
+        raise HTTPException(status_code=401, detail="Invalid or expired refresh token")
+    return await issue_session_tokens(session["username"], session["role"], session["id"], previous_hash=token_hash)
+
+
+@api_router.post("/auth/logout")
+async def admin_logout(payload: LogoutRequest, authorization: Optional[str] = Header(default=None)):
+    """End the session of the given refresh token and/or bearer access token.
+
+    This worker rejects the session's access tokens at once; other workers do
+    so within SESSION_RECHECK_SECONDS.
+    """
+    session_ids = set()
+    if payload.refresh_token:
+        session = await db.admin_sessions.find_one(
+            {"token_hash": hash_refresh_token(payload.refresh_token)}, {"_id": 0, "id": 1}
+        )
+        if session:
+            session_ids.add(session["id"])
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        claims = verify_access_token(token, await load_auth_secret())
+        if claims:
+            session_ids.add(claims["sid"])
+    for session_id in session_ids:
+        revoke_session(session_id)
+        _live_sessions.pop(session_id, None)
+    if session_ids:
+        await db.admin_sessions.delete_many({"id": {"$in": list(session_ids)}})
+    return {"success": True}
+
+
+class PasswordHashStats(BaseModel):
+    workers: int
+    queue_limit: int
+    bcrypt_rounds: int
+    pending: int
+    calls: int
+    rejected: int
+    rehashed: int
+    max_pending: int
+    avg_wait_ms: float
+    avg_compute_ms: float
+    max_wait_ms: float
+    max_loop_ms: float
+
+
+@api_router.get("/admin/auth/hash-stats", response_model=PasswordHashStats, dependencies=[Depends(require_admin)])
+async def get_password_hash_stats():
+    """Password hashing pool usage since server start; ``max_loop_ms`` is the
+    longest time a single hash kept the event loop busy."""
+    stats = password_hasher.stats
+    calls = stats["calls"] or 1
+    return PasswordHashStats(
+        workers=password_hasher.workers,
+        queue_limit=password_hasher.queue_limit,
+        bcrypt_rounds=BCRYPT_ROUNDS,
+        pending=password_hasher._pending,
+        calls=stats["calls"],
+        rejected=stats["rejected"],
+        rehashed=stats["rehashed"],
+        max_pending=stats["max_pending"],
+        avg_wait_ms=round(stats["wait_ms_total"] / calls, 2),
+        avg_compute_ms=round(stats["compute_ms_total"] / calls, 2),
+        max_wait_ms=round(stats["max_wait_ms"], 2),
+        max_loop_ms=round(stats["max_loop_ms"], 3),
+    )
+
+
 # ==================== FAQ API ROUTES ====================
 
 @api_router.get("/faqs", response_model=List[FAQ])
@@ -1285,15 +3596,15 @@ async def get_faqs(category: Optional[str] = None,
         deserialize_datetime(f, ["created_at"])
     return faqs
 
-@api_router.post("/faqs", response_model=FAQ, status_code=201)
+@api_router.post("/faqs", response_model=FAQ, status_code=201, dependencies=[Depends(require_admin)])
 async def create_faq(faq_data: FAQCreate):
     """Create a new FAQ"""
-    faq = FAQ(**faq_data.model_dump())
+    faq = new_faq(faq_data)
     doc = serialize_datetime(faq.model_dump())
     await db.faqs.insert_one(doc)
     return faq
 
-@api_router.put("/faqs/{faq_id}", response_model=FAQ)
+@api_router.put("/faqs/{faq_id}", response_model=FAQ, dependencies=[Depends(require_admin)])
 async def update_faq(faq_id: str, faq_data: FAQCreate):
     """Update a FAQ"""
     existing = await db.faqs.find_one({"id": faq_id}, {"_id": 0})
@@ -1307,7 +3618,7 @@ async def update_faq(faq_id: str, faq_data: FAQCreate):
     deserialize_datetime(updated, ["created_at"])
     return updated
 
-@api_router.delete("/faqs/{faq_id}")
+@api_router.delete("/faqs/{faq_id}", dependencies=[Depends(require_admin)])
 async def delete_faq(faq_id: str):
     """Delete a FAQ"""
     result = await db.faqs.delete_one({"id": faq_id})
@@ -1316,10 +3627,219 @@ async def delete_faq(faq_id: str):
     return {"message": "FAQ deleted successfully"}
 
 
+# ==================== BULK API ROUTES ====================
+
+# Batch endpoints for the admin lists: creates, updates, deletes and order
+# changes are checked against one lookup of the referenced ids and then sent
+# as a single unordered bulk_write per collection. Every item gets its own
+# result, so one bad item does not fail the rest of the batch.
+BULK_MAX_ITEMS = int(os.environ.get("BULK_MAX_ITEMS", "500"))
+
+
+class BulkOrderItem(BaseModel):
+    id: str
+    order: int
+
+
+class BulkItemResult(BaseModel):
+    op: str  # create | update | reorder | delete
+    id: str
+    status: str  # ok | not_found | conflict | error
+    detail: Optional[str] = None
+
+
+class BulkWriteResponse(BaseModel):
+    results: List[BulkItemResult]
+    inserted: int = 0
+    modified: int = 0
+    deleted: int = 0
+
+
+class FAQBulkUpdate(FAQCreate):
+    id: str
+
+
+class FAQBulkRequest(BaseModel):
+    create: List[FAQCreate] = []
+    update: List[FAQBulkUpdate] = []
+    reorder: List[BulkOrderItem] = []
+    delete: List[str] = []
+
+
+class TestimonialBulkUpdate(TestimonialCreate):
+    id: str
+
+
+class TestimonialBulkRequest(BaseModel):
+    create: List[TestimonialCreate] = []
+    update: List[TestimonialBulkUpdate] = []
+    reorder: List[BulkOrderItem] = []
+    delete: List[str] = []
+
+
+class CMSContentBulkUpdate(BaseModel):
+    key: str
+    content: Dict[str, Any]
+
+
+class CMSContentBulkRequest(BaseModel):
+    create: List[CMSContentCreate] = []
+    update: List[CMSContentBulkUpdate] = []
+    delete: List[str] = []
+
+
+async def run_bulk_write(
+    collection,
+    id_field: str,
+    creates: List[Dict[str, Any]],
+    updates: List[Tuple[str, Dict[str, Any]]],
+    deletes: List[str],
+    reorders: Optional[List[BulkOrderItem]] = None,
+) -> BulkWriteResponse:
+    reorders = reorders or []
+    if len(creates) + len(updates) + len(deletes) + len(reorders) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_MAX_ITEMS} items per batch")
+
+    referenced = [doc[id_field] for doc in creates] + [i for i, _ in updates] + deletes + [r.id for r in reorders]
+    existing = {
+        doc[id_field]
+        for doc in await collection.find({id_field: {"$in": referenced}}, {"_id": 0, id_field: 1}).to_list(None)
+    }
+
+    # An order change for a document that is also created or updated is
+    # folded into that write. Any other second change to the same document
+    # in one batch is a conflict, since an unordered bulk_write would apply
+    # the two in no particular order. That includes a repeated reorder: the
+    # first one is kept.
+    orders: Dict[str, int] = {}
+    repeated_orders = []
+    for r in reorders:
+        if r.id in orders:
+            repeated_orders.append(r.id)
+        else:
+            orders[r.id] = r.order
+    results: List[BulkItemResult] = []
+    requests = []
+    request_results: List[int] = []
+
+    def queue(request, result: BulkItemResult) -> None:
+        request_results.append(len(results))
+        requests.append(request)
+        results.append(result)
+
+    changed = set()
+
+    def conflict(op: str, doc_id: str) -> None:
+        results.append(BulkItemResult(op=op, id=doc_id, status="conflict", detail="Already changed in this batch"))
+
+    for doc in creates:
+        doc_id = doc[id_field]
+        if doc_id in existing or doc_id in changed:
+            results.append(BulkItemResult(op="create", id=doc_id, status="conflict", detail="Already exists"))
+            continue
+        changed.add(doc_id)
+        if doc_id in orders:
+            doc = {**doc, "order": orders.pop(doc_id)}
+        queue(InsertOne(doc), BulkItemResult(op="create", id=doc_id, status="ok"))
+    for doc_id, data in updates:
+        if doc_id in changed:
+            conflict("update", doc_id)
+            continue
+        if doc_id not in existing:
+            results.append(BulkItemResult(op="update", id=doc_id, status="not_found"))
+            continue
+        changed.add(doc_id)
+        if doc_id in orders:
+            data = {**data, "order": orders.pop(doc_id)}
+        queue(UpdateOne({id_field: doc_id}, {"$set": data}), BulkItemResult(op="update", id=doc_id, status="ok"))
+    for doc_id, order in orders.items():
+        if doc_id not in existing:
+            results.append(BulkItemResult(op="reorder", id=doc_id, status="not_found"))
+            continue
+        changed.add(doc_id)
+        queue(UpdateOne({id_field: doc_id}, {"$set": {"order": order}}), BulkItemResult(op="reorder", id=doc_id, status="ok"))
+    for doc_id in repeated_orders:
+        conflict("reorder", doc_id)
+    for doc_id in deletes:
+        if doc_id in changed:
+            conflict("delete", doc_id)
+            continue
+        if doc_id not in existing:
+            results.append(BulkItemResult(op="delete", id=doc_id, status="not_found"))
+            continue
+        changed.add(doc_id)
+        queue(DeleteOne({id_field: doc_id}), BulkItemResult(op="delete", id=doc_id, status="ok"))
+
+    response = BulkWriteResponse(results=results)
+    if not requests:
+        return response
+    try:
+        outcome = (await collection.bulk_write(requests, ordered=False)).bulk_api_result
+    except BulkWriteError as e:
+        outcome = e.details
+        for error in outcome.get("writeErrors", []):
+            result = results[request_results[error["index"]]]
+            result.status = "error"
+            result.detail = error.get("errmsg")
+    response.inserted = outcome.get("nInserted", 0)
+    response.modified = outcome.get("nModified", 0)
+    response.deleted = outcome.get("nRemoved", 0)
+    return response
+
+
+@api_router.post("/faqs/bulk", response_model=BulkWriteResponse, dependencies=[Depends(require_admin)])
+async def bulk_faqs(payload: FAQBulkRequest):
+    """Create, update, reorder and delete FAQs in one request"""
+    return await run_bulk_write(
+        db.faqs,
+        "id",
+        creates=[serialize_datetime(new_faq(item).model_dump()) for item in payload.create],
+        updates=[(item.id, item.model_dump(exclude={"id"})) for item in payload.update],
+        deletes=payload.delete,
+        reorders=payload.reorder,
+    )
+
+
+@api_router.post("/testimonials/bulk", response_model=BulkWriteResponse, dependencies=[Depends(require_admin)])
+async def bulk_testimonials(payload: TestimonialBulkRequest):
+    """Create, update, reorder and delete testimonials in one request"""
+    return await run_bulk_write(
+        db.testimonials,
+        "id",
+        creates=[serialize_datetime(Testimonial(**item.model_dump()).model_dump()) for item in payload.create],
+        updates=[(item.id, item.model_dump(exclude={"id"})) for item in payload.update],
+        deletes=payload.delete,
+        reorders=payload.reorder,
+    )
+
+
+@api_router.post("/cms/content/bulk", response_model=BulkWriteResponse, dependencies=[Depends(require_admin)])
+async def bulk_cms_content(payload: CMSContentBulkRequest):
+    """Create, update and delete CMS content (by key) in one request"""
+    now = datetime.now(timezone.utc).isoformat()
+    return await run_bulk_write(
+        db.cms_content,
+        "key",
+        creates=[serialize_datetime(CMSContent(**item.model_dump()).model_dump()) for item in payload.create],
+        updates=[(item.key, {"content": item.content, "updated_at": now}) for item in payload.update],
+        deletes=payload.delete,
+    )
+
+
 # ==================== SEED DATA ROUTE ====================
 
-@api_router.post("/seed")
+@api_router.post("/seed", response_model=Job, status_code=202, dependencies=[Depends(require_admin)])
 async def seed_initial_data():
+    """Queue seeding of the initial CMS data as a background job"""
+    return await enqueue_job("seed")
+
+
+@job_handler("seed")
+async def seed_job(ctx: JobContext) -> Dict[str, Any]:
+    return await seed_initial_content()
+
+
+async def seed_initial_content() -> Dict[str, Any]:
     """Seed initial data for the CMS"""
     # Check if already seeded
     existing_posts = await db.blog_posts.count_documents({})
@@ -1609,7 +4129,7 @@ class MediaUploadResponse(BaseModel):
     filename: str
 
 
-@api_router.post("/media/upload", response_model=MediaUploadResponse)
+@api_router.post("/media/upload", response_model=MediaUploadResponse, dependencies=[Depends(require_admin)])
 async def upload_media(file: UploadFile = File(...)):
     """Upload a media file (image) and return a URL that can be used in the CMS.
 
@@ -1639,8 +4159,18 @@ async def upload_media(file: UploadFile = File(...)):
     return MediaUploadResponse(url=url, filename=unique_name)
 
 
-@api_router.post("/seed/pages-menus")
+@api_router.post("/seed/pages-menus", response_model=Job, status_code=202, dependencies=[Depends(require_admin)])
 async def seed_pages_and_menus():
+    """Queue seeding of the core pages and menus as a background job"""
+    return await enqueue_job("seed_pages_menus")
+
+
+@job_handler("seed_pages_menus")
+async def seed_pages_menus_job(ctx: JobContext) -> Dict[str, Any]:
+    return await seed_core_pages_and_menus()
+
+
+async def seed_core_pages_and_menus() -> Dict[str, Any]:
     """Seed core pages and menus if they don't exist yet"""
     created = {"pages": 0, "menus": 0}
 
@@ -1991,160 +4521,2088 @@ async def seed_pages_and_menus():
     return {"message": "Pages/menus seed executed", **created}
 
 
-# ==================== HEALTH CHECK ====================
-
-@api_router.get("/health")
-async def health_check():
-    """Health check endpoint"""
-    try:
-        await db.command("ping")
-        return {"status": "healthy", "database": "connected"}
-    except Exception as e:
-        return {"status": "unhealthy", "database": str(e)}
+# ==================== SYNTHETIC DATA ====================
+
+# Deterministic, seeded documents shaped exactly like the ones the API writes,
+# for load and scale testing (pagination, query plans, serialization). Every
+# generated document carries ``synthetic: True`` so it can be removed again.
+# Disabled unless CMS_ALLOW_SYNTHETIC_DATA is set, because it fills the
+# configured database.
+SYNTHETIC_DATA_ALLOWED = os.environ.get("CMS_ALLOW_SYNTHETIC_DATA", "").lower() in ("1", "true", "yes")
+SYNTHETIC_EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+SYNTHETIC_LANGS = ["en", "hr", "de", "sl"]
+SYNTHETIC_COLLECTIONS = ["blog_posts", "pages", "newsletter_subscriptions", "faqs", "testimonials", "contact_messages"]
+
+SYNTHETIC_WORDS = {
+    "en": (
+        "apartment guest booking calendar channel owner season stay rental villa review price "
+        "availability host check-in sync platform room night beach summer family team portal "
+        "invoice tourist report smart lock message reservation update"
+    ).split(),
+    "hr": (
+        "apartman gost rezervacija kalendar kanal vlasnik sezona boravak najam vila recenzija cijena "
+        "dostupnost domaćin prijava sinkronizacija platforma soba noćenje plaža ljeto obitelj tim portal "
+        "račun turist izvještaj pametna brava poruka ažuriranje"
+    ).split(),
+    "de": (
+        "Wohnung Gast Buchung Kalender Kanal Eigentümer Saison Aufenthalt Vermietung Villa Bewertung Preis "
+        "Verfügbarkeit Gastgeber Anmeldung Synchronisierung Plattform Zimmer Nacht Strand Sommer Familie Team "
+        "Portal Rechnung Tourist Bericht Schloss Nachricht Reservierung Aktualisierung"
+    ).split(),
+    "sl": (
+        "apartma gost rezervacija koledar kanal lastnik sezona bivanje najem vila ocena cena "
+        "razpoložljivost gostitelj prijava sinhronizacija platforma soba nočitev plaža poletje družina ekipa "
+        "portal račun turist poročilo ključavnica sporočilo posodobitev"
+    ).split(),
+}
+SYNTHETIC_FIRST_NAMES = "Ana Ivan Marko Petra Luka Maja Tomislav Nina Josip Ivana Klaus Anna Jure Mojca Sara David".split()
+SYNTHETIC_LAST_NAMES = "Horvat Kovačević Babić Marić Novak Jurić Müller Schmidt Kranjc Zupan Knežević Vuković".split()
+SYNTHETIC_PLACES = "Split Zadar Rovinj Dubrovnik Pula Makarska Opatija Bled Piran Hvar Krk Poreč".split()
+SYNTHETIC_SECTION_TYPES = ["hero", "features", "content", "cta", "faq", "testimonials", "pricing"]
+
+
+class SyntheticDataRequest(BaseModel):
+    seed: int = 1
+    blog_posts: int = Field(default=0, ge=0, le=1_000_000)
+    pages: int = Field(default=0, ge=0, le=100_000)
+    sections_per_page: int = Field(default=10, ge=0, le=200)
+    paragraphs_per_post: int = Field(default=6, ge=1, le=200)
+    subscribers: int = Field(default=0, ge=0, le=10_000_000)
+    faqs: int = Field(default=0, ge=0, le=100_000)
+    testimonials: int = Field(default=0, ge=0, le=100_000)
+    contact_messages: int = Field(default=0, ge=0, le=1_000_000)
+    batch_size: int = Field(default=1000, ge=1, le=10_000)
+    # Remove previously generated documents first
+    replace: bool = False
+
+
+def synthetic_uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def synthetic_time(rng: random.Random, max_days: int = 730) -> str:
+    return (SYNTHETIC_EPOCH - timedelta(seconds=rng.randrange(max_days * 86400))).isoformat()
+
+
+def synthetic_sentence(rng: random.Random, lang: str, words: int) -> str:
+    text = " ".join(rng.choice(SYNTHETIC_WORDS[lang]) for _ in range(words))
+    return text[:1].upper() + text[1:] + "."
+
+
+def synthetic_translations(rng: random.Random, words: int) -> Dict[str, str]:
+    return {lang: synthetic_sentence(rng, lang, words).rstrip(".") for lang in SYNTHETIC_LANGS}
+
+
+def synthetic_html(rng: random.Random, lang: str, paragraphs: int) -> str:
+    parts = []
+    for index in range(paragraphs):
+        if index and index % 3 == 0:
+            parts.append(f"<h2>{synthetic_sentence(rng, lang, rng.randint(3, 7)).rstrip('.')}</h2>")
+        sentences = " ".join(synthetic_sentence(rng, lang, rng.randint(8, 18)) for _ in range(rng.randint(2, 5)))
+        parts.append(f"<p>{sentences}</p>")
+    return "".join(parts)
+
+
+def synthetic_blog_post(rng: random.Random, index: int, paragraphs: int) -> Dict[str, Any]:
+    title = synthetic_translations(rng, rng.randint(4, 9))
+    created_at = synthetic_time(rng)
+    slug = "-".join(title["en"].lower().split()[:6]) + f"-{index}"
+    return {
+        "id": synthetic_uuid(rng),
+        "title": title,
+        "slug": slug,
+        "excerpt": {lang: synthetic_sentence(rng, lang, rng.randint(15, 30)) for lang in SYNTHETIC_LANGS},
+        "content": {lang: synthetic_html(rng, lang, paragraphs) for lang in SYNTHETIC_LANGS},
+        "category": rng.choice(["general", "tips", "news", "guides", "product"]),
+        "featured_image": f"https://picsum.photos/seed/{index}/1200/630",
+        "tags": rng.sample(SYNTHETIC_WORDS["en"], rng.randint(1, 5)),
+        "status": BlogStatus.PUBLISHED.value if rng.random() < 0.9 else BlogStatus.DRAFT.value,
+        "author": f"{rng.choice(SYNTHETIC_FIRST_NAMES)} {rng.choice(SYNTHETIC_LAST_NAMES)}",
+        "created_at": created_at,
+        "updated_at": created_at,
+        "synthetic": True,
+    }
 
 
-# ==================== AI CONTENT GENERATION ====================
+def synthetic_section(rng: random.Random, order: int) -> Dict[str, Any]:
+    section_type = rng.choice(SYNTHETIC_SECTION_TYPES)
+    content: Dict[str, Any] = {
+        "headline": synthetic_translations(rng, rng.randint(3, 8)),
+        "description": {lang: synthetic_sentence(rng, lang, rng.randint(12, 30)) for lang in SYNTHETIC_LANGS},
+    }
+    if section_type in ("features", "faq", "testimonials", "pricing"):
+        content["items"] = [
+            {
+                "title": synthetic_translations(rng, rng.randint(2, 5)),
+                "text": {lang: synthetic_sentence(rng, lang, rng.randint(8, 20)) for lang in SYNTHETIC_LANGS},
+            }
+            for _ in range(rng.randint(3, 6))
+        ]
+    elif section_type == "content":
+        content["body"] = {lang: synthetic_html(rng, lang, rng.randint(2, 6)) for lang in SYNTHETIC_LANGS}
+    return {
+        "id": synthetic_uuid(rng),
+        "section_type": section_type,
+        "order": order,
+        "visible": rng.random() < 0.95,
+        "content": content,
+        "created_at": SYNTHETIC_EPOCH,
+    }
 
-class AIGenerateRequest(BaseModel):
-    prompt: str
-    content_type: str = "blog_post"  # blog_post, page_section, translation
-    languages: List[str] = ["en", "hr", "de", "sl"]
-    tone: str = "professional"  # professional, casual, formal
-    length: str = "medium"  # short, medium, long
 
-class AITranslateRequest(BaseModel):
-    text: str
-    source_lang: str = "en"
-    target_langs: List[str] = ["hr", "de", "sl"]
+def synthetic_page(rng: random.Random, index: int, sections: int) -> Dict[str, Any]:
+    created_at = synthetic_time(rng)
+    return {
+        "id": synthetic_uuid(rng),
+        "slug": f"synthetic-page-{index}",
+        "title": synthetic_translations(rng, rng.randint(2, 5)),
+        "meta_description": {lang: synthetic_sentence(rng, lang, rng.randint(12, 24)) for lang in SYNTHETIC_LANGS},
+        "sections": [synthetic_section(rng, order) for order in range(sections)],
+        "published": rng.random() < 0.9,
+        "is_system_page": False,
+        "created_at": created_at,
+        "updated_at": created_at,
+        "synthetic": True,
+    }
 
-@api_router.post("/ai/generate")
-async def generate_ai_content(request: AIGenerateRequest):
-    """Generate content using AI (OpenAI GPT)"""
-    try:
-        from openai import AsyncOpenAI
-        import json
 
-        settings = await get_openai_settings()
-        if not settings.enabled or not settings.api_key:
-            raise HTTPException(status_code=500, detail="OpenAI API key not configured in admin settings")
+def synthetic_subscriber(rng: random.Random, index: int) -> Dict[str, Any]:
+    first = rng.choice(SYNTHETIC_FIRST_NAMES).lower()
+    last = rng.choice(SYNTHETIC_LAST_NAMES).lower().replace("č", "c").replace("ć", "c").replace("ü", "u")
+    return {
+        "id": synthetic_uuid(rng),
+        "email": f"{first}.{last}.{index}@example.com",
+        "subscribed_at": synthetic_time(rng),
+        "active": rng.random() < 0.92,
+        "synthetic": True,
+    }
 
-        client = AsyncOpenAI(api_key=settings.api_key)
-        model_name = settings.model or "gpt-4o"
 
-        # Determine length
-        length_guide = {
-            "short": "Keep it concise, around 100-150 words.",
-            "medium": "Write a moderate length, around 300-400 words.",
-            "long": "Write a comprehensive piece, around 600-800 words."
-        }
-        
-        # System message based on content type
-        if request.content_type == "blog_post":
-            system_msg = f"""You are a professional content writer for SyncBeds, a vacation rental management software company.
-Write engaging, SEO-friendly blog posts about vacation rentals, property management, and hospitality technology.
-Tone: {request.tone}. {length_guide.get(request.length, length_guide['medium'])}
-Always structure content with clear headings and paragraphs.
-Return content as JSON with keys for each language: {request.languages}
-Each language version should have: title, excerpt (short summary), content (full blog post in HTML), tags (array of relevant tags)."""
-        else:
-            system_msg = f"""You are a professional content writer for SyncBeds.
-Tone: {request.tone}. {length_guide.get(request.length, length_guide['medium'])}
-Return content as JSON with keys for each language: {request.languages}"""
+def synthetic_faq(rng: random.Random, index: int) -> Dict[str, Any]:
+    return {
+        "id": synthetic_uuid(rng),
+        "question": {lang: synthetic_sentence(rng, lang, rng.randint(5, 12)).rstrip(".") + "?" for lang in SYNTHETIC_LANGS},
+        "answer": {lang: synthetic_sentence(rng, lang, rng.randint(20, 60)) for lang in SYNTHETIC_LANGS},
+        "category": rng.choice(["general", "pricing", "integrations", "evisitor", "support"]),
+        "order": index,
+        "active": rng.random() < 0.95,
+        "created_at": synthetic_time(rng),
+        "synthetic": True,
+    }
 
-        messages = [
-            {"role": "system", "content": system_msg},
-            {
-                "role": "user",
-                "content": f"Generate content about: {request.prompt}\n\nReturn ONLY valid JSON, no markdown code blocks.",
-            },
-        ]
 
-        completion = await client.chat.completions.create(
-            model=model_name,
-            messages=messages,
-            temperature=0.4,
-        )
+def synthetic_testimonial(rng: random.Random, index: int) -> Dict[str, Any]:
+    return {
+        "id": synthetic_uuid(rng),
+        "name": f"{rng.choice(SYNTHETIC_FIRST_NAMES)} {rng.choice(SYNTHETIC_LAST_NAMES)}",
+        "company": f"{rng.choice(SYNTHETIC_PLACES)} {rng.choice(['Apartments', 'Villas', 'Rooms', 'Holiday Homes'])}",
+        "location": rng.choice(SYNTHETIC_PLACES),
+        "text": {lang: synthetic_sentence(rng, lang, rng.randint(15, 40)) for lang in SYNTHETIC_LANGS},
+        "avatar_url": None,
+        "order": index,
+        "active": rng.random() < 0.9,
+        "created_at": synthetic_time(rng),
+        "synthetic": True,
+    }
 
-        response_text = completion.choices[0].message.content or ""
 
-        try:
-            clean_response = response_text.strip()
-            if clean_response.startswith("```"):
-                clean_response = clean_response.split("```")[1]
-                if clean_response.startswith("json"):
-                    clean_response = clean_response[4:]
-            content = json.loads(clean_response)
-        except json.JSONDecodeError:
-            content = {"raw": response_text}
+def synthetic_contact_message(rng: random.Random, index: int) -> Dict[str, Any]:
+    lang = rng.choice(SYNTHETIC_LANGS)
+    first, last = rng.choice(SYNTHETIC_FIRST_NAMES), rng.choice(SYNTHETIC_LAST_NAMES)
+    return {
+        "id": synthetic_uuid(rng),
+        "full_name": f"{first} {last}",
+        "email": f"contact.{index}@example.com",
+        "phone": f"+385 9{rng.randint(1, 9)} {rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+        "subject": synthetic_sentence(rng, lang, rng.randint(3, 8)).rstrip("."),
+        "message": " ".join(synthetic_sentence(rng, lang, rng.randint(8, 20)) for _ in range(rng.randint(1, 6))),
+        "created_at": synthetic_time(rng),
+        "read": rng.random() < 0.6,
+        "synthetic": True,
+    }
 
-        return {"success": True, "content": content}
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"AI generation error: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"AI generation failed: {str(e)}")
+async def insert_synthetic_documents(
+    collection,
+    make_document: Callable[[random.Random, int], Dict[str, Any]],
+    count: int,
+    rng: random.Random,
+    batch_size: int,
+    on_inserted: Optional[Callable[[int], Awaitable[None]]] = None,
+) -> int:
+    """Insert ``count`` generated documents with insert_many; the next batch is
+    generated while the previous one is being written."""
+    pending: Optional[asyncio.Task] = None
+    inserted = 0
+
+    async def flush(task: asyncio.Task) -> int:
+        written = len((await task).inserted_ids)
+        if on_inserted:
+            await on_inserted(written)
+        return written
+
+    for start in range(0, count, batch_size):
+        batch = [make_document(rng, index) for index in range(start, min(start + batch_size, count))]
+        if pending is not None:
+            inserted += await flush(pending)
+        pending = asyncio.create_task(collection.insert_many(batch, ordered=False))
+    if pending is not None:
+        inserted += await flush(pending)
+    return inserted
+
+
+async def delete_synthetic_data() -> Dict[str, int]:
+    deleted = {}
+    for name in SYNTHETIC_COLLECTIONS:
+        result = await db[name].delete_many({"synthetic": True})
+        deleted[name] = result.deleted_count
+    return deleted
+
+
+async def generate_synthetic_data(
+    spec: SyntheticDataRequest,
+    progress: Optional[Callable[[int, int], Awaitable[None]]] = None,
+) -> Dict[str, Any]:
+    """Generate the documents described by ``spec``.
+
+    Each collection draws from its own generator seeded with ``spec.seed`` and
+    the collection name, so the same seed always produces the same documents
+    and changing one count does not change the other collections.
+    """
+    started = time.perf_counter()
+    result: Dict[str, Any] = {"seed": spec.seed, "inserted": {}}
+    if spec.replace:
+        result["deleted"] = await delete_synthetic_data()
+
+    plan = [
+        ("blog_posts", spec.blog_posts, lambda rng, i: synthetic_blog_post(rng, i, spec.paragraphs_per_post)),
+        ("pages", spec.pages, lambda rng, i: synthetic_page(rng, i, spec.sections_per_page)),
+        ("newsletter_subscriptions", spec.subscribers, synthetic_subscriber),
+        ("faqs", spec.faqs, synthetic_faq),
+        ("testimonials", spec.testimonials, synthetic_testimonial),
+        ("contact_messages", spec.contact_messages, synthetic_contact_message),
+    ]
+    total = sum(count for _, count, _ in plan)
+    done = 0
 
-@api_router.post("/ai/translate")
-async def translate_content(request: AITranslateRequest):
-    """Translate content to multiple languages using AI (OpenAI)"""
-    try:
-        from openai import AsyncOpenAI
-        import json
+    async def on_inserted(written: int) -> None:
+        nonlocal done
+        done += written
+        if progress:
+            await progress(done, total)
 
-        settings = await get_openai_settings()
-        if not settings.enabled or not settings.api_key:
-            raise HTTPException(status_code=500, detail="OpenAI API key not configured in admin settings")
+    for name, count, make_document in plan:
+        if not count:
+            continue
+        rng = random.Random(f"{spec.seed}:{name}")
+        # Pages carry many sections; keep their batches to a similar byte size
+        batch_size = max(1, spec.batch_size // max(1, spec.sections_per_page // 4)) if name == "pages" else spec.batch_size
+        result["inserted"][name] = await insert_synthetic_documents(
+            db[name], make_document, count, rng, batch_size, on_inserted
+        )
 
-        client = AsyncOpenAI(api_key=settings.api_key)
-        model_name = settings.model or "gpt-4o"
+    elapsed = time.perf_counter() - started
+    result["seconds"] = round(elapsed, 2)
+    result["documents_per_second"] = round(total / elapsed) if elapsed > 0 else total
+    return result
+
+
+@job_handler("synthetic_data")
+async def synthetic_data_job(ctx: JobContext) -> Dict[str, Any]:
+    spec = SyntheticDataRequest(**ctx.params)
+    return await generate_synthetic_data(spec, lambda done, total: ctx.progress(done, total, "documents inserted"))
+
+
+def require_synthetic_data_allowed() -> None:
+    if not SYNTHETIC_DATA_ALLOWED:
+        raise HTTPException(status_code=403, detail="Synthetic data is disabled (set CMS_ALLOW_SYNTHETIC_DATA=1)")
+
+
+@api_router.post("/admin/synthetic-data", response_model=Job, status_code=202, dependencies=[Depends(require_admin)])
+async def create_synthetic_data(spec: SyntheticDataRequest):
+    """Queue generation of a synthetic dataset as a background job"""
+    require_synthetic_data_allowed()
+    return await enqueue_job("synthetic_data", spec.model_dump())
+
+
+@api_router.delete("/admin/synthetic-data", dependencies=[Depends(require_admin)])
+async def remove_synthetic_data():
+    """Delete every generated (synthetic) document"""
+    require_synthetic_data_allowed()
+    return {"deleted": await delete_synthetic_data()}
+
+
+# ==================== SLOW QUERY LOG API ROUTES ====================
+
+class SlowQuery(BaseModel):
+    id: str
+    at: datetime
+    route: str
+    database: str
+    collection: str
+    command: str
+    shape_hash: str
+    shape: str
+    duration_ms: float
+    failed: bool = False
+    collscan: Optional[bool] = None
+    plan_summary: Optional[str] = None
+    plan: Optional[str] = None
+
+
+class SlowQueryShape(BaseModel):
+    shape_hash: str
+    collection: str
+    command: str
+    shape: str
+    count: int
+    duration_p50_ms: float
+    duration_p95_ms: float
+    duration_max_ms: float
+    routes: Dict[str, int]
+    collscan: Optional[bool] = None
+    plan_summary: Optional[str] = None
+    last_seen: datetime
+
+
+class SlowQueryShapesResponse(BaseModel):
+    threshold_ms: float
+    hours: int
+    dropped: int
+    shapes: List[SlowQueryShape]
+
+
+@api_router.get("/admin/slow-queries", response_model=List[SlowQuery], dependencies=[Depends(require_admin)])
+async def get_slow_queries(
+    collection: Optional[str] = None,
+    route: Optional[str] = None,
+    shape_hash: Optional[str] = None,
+    collscan: Optional[bool] = None,
+    limit: int = Query(default=100, le=1000),
+):
+    """Recent slow MongoDB commands, newest first"""
+    query: Dict[str, Any] = {}
+    if collection:
+        query["collection"] = collection
+    if route:
+        query["route"] = route
+    if shape_hash:
+        query["shape_hash"] = shape_hash
+    if collscan is not None:
+        query["collscan"] = collscan
+    return await db.slow_queries.find(query, {"_id": 0}).sort("$natural", -1).limit(limit).to_list(limit)
+
+
+@api_router.get("/admin/slow-queries/shapes", response_model=SlowQueryShapesResponse, dependencies=[Depends(require_admin)])
+async def get_slow_query_shapes(hours: int = Query(default=24, ge=1, le=24 * 30)):
+    """Slow commands of the last ``hours`` hours grouped by query shape, worst first"""
+    since = datetime.now(timezone.utc) - timedelta(hours=hours)
+    entries = await db.slow_queries.find(
+        {"at": {"$gte": since}}, {"_id": 0, "plan": 0}
+    ).sort("$natural", -1).to_list(SLOW_QUERY_LOG_MAX_DOCS)
+
+    grouped: Dict[str, List[dict]] = {}
+    for entry in entries:
+        grouped.setdefault(entry["shape_hash"], []).append(entry)
+
+    shapes = []
+    for shape_hash, items in grouped.items():
+        durations = sorted(item["duration_ms"] for item in items)
+        routes: Dict[str, int] = {}
+        for item in items:
+            routes[item["route"]] = routes.get(item["route"], 0) + 1
+        explained = next((item for item in items if item.get("plan_summary") is not None), {})
+        shapes.append(SlowQueryShape(
+            shape_hash=shape_hash,
+            collection=items[0]["collection"],
+            command=items[0]["command"],
+            shape=items[0]["shape"],
+            count=len(items),
+            duration_p50_ms=percentile(durations, 50),
+            duration_p95_ms=percentile(durations, 95),
+            duration_max_ms=durations[-1],
+            routes=routes,
+            collscan=explained.get("collscan"),
+            plan_summary=explained.get("plan_summary"),
+            last_seen=items[0]["at"],
+        ))
+    shapes.sort(key=lambda s: (not s.collscan, -s.count * s.duration_p50_ms))
+    return SlowQueryShapesResponse(
+        threshold_ms=slow_query_log.threshold_ms, hours=hours, dropped=slow_query_log.dropped, shapes=shapes
+    )
+
+
+# ==================== EVENT LOOP MONITOR ====================
+
+# A sampler task measures how late the event loop wakes it up (scheduling
+# lag, exported as event_loop_lag_seconds; LOOP_SAMPLE_INTERVAL_MS=0 turns the
+# monitor off). A watchdog thread notices when the loop has not run the
+# sampler for LOOP_STALL_THRESHOLD_MS (0 = no stall capture) and grabs the
+# loop thread's stack while it is still blocked, so blocking calls show up
+# ranked by total stall time at /api/admin/event-loop.
+LOOP_SAMPLE_INTERVAL_MS = float(os.environ.get("LOOP_SAMPLE_INTERVAL_MS", "100"))
+LOOP_STALL_THRESHOLD_MS = float(os.environ.get("LOOP_STALL_THRESHOLD_MS", "200"))
+LOOP_STALL_MAX_SITES = int(os.environ.get("LOOP_STALL_MAX_SITES", "200"))
+
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Delay between when the loop should have run a timer and when it did",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+EVENT_LOOP_STALLS = Counter("event_loop_stalls_total", "Event loop stalls over the watchdog threshold")
+
+
+class LoopLagMonitor:
+    def __init__(self, interval_ms: float, stall_threshold_ms: float, max_sites: int = 200, history: int = 600):
+        self.interval = interval_ms / 1000
+        self.stall_threshold = stall_threshold_ms / 1000
+        self.max_sites = max_sites
+        self.lags: deque = deque(maxlen=history)
+        self.stalls = 0
+        self.started_at: Optional[datetime] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[Any] = None
+        # stack of the stall in progress, captured by the watchdog
+        self._current_stall: Optional[List[str]] = None
+        # stack signature -> aggregated stalls
+        self._sites: Dict[str, dict] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    async def start(self) -> None:
+        if self.interval <= 0 or self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self.started_at = datetime.now(timezone.utc)
+        self._task = asyncio.create_task(self._sample())
+        # The lag histogram is always sampled; only stack capture needs a threshold
+        if self.stall_threshold > 0:
+            self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+            self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+
+    async def _sample(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            self._heartbeat = now
+            self.lags.append(lag)
+            EVENT_LOOP_LAG.observe(lag)
+            with self._lock:
+                stack, self._current_stall = self._current_stall, None
+            if stack is not None:
+                self._record_stall(stack, lag)
+
+    def _watch(self) -> None:
+        # Poll several times per threshold so stalls are caught close to their start
+        poll = max(0.005, min(self.interval, self.stall_threshold / 4))
+        while not self._stop.wait(poll):
+            overdue = time.monotonic() - self._heartbeat - self.interval
+            if overdue < self.stall_threshold:
+                continue
+            with self._lock:
+                if self._current_stall is not None:
+                    continue
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is None:
+                    continue
+                self._current_stall = [
+                    f"{entry.filename}:{entry.lineno} in {entry.name}"
+                    for entry in traceback.extract_stack(frame)
+                ]
+
+    def _record_stall(self, stack: List[str], lag: float) -> None:
+        self.stalls += 1
+        EVENT_LOOP_STALLS.inc()
+        # Rank by the innermost frames; the outer ones are the same asyncio plumbing every time
+        signature = "\n".join(stack[-6:])
+        with self._lock:
+            site = self._sites.get(signature)
+            if site is None:
+                if len(self._sites) >= self.max_sites:
+                    smallest = min(self._sites, key=lambda key: self._sites[key]["total_ms"])
+                    del self._sites[smallest]
+                site = self._sites[signature] = {
+                    "location": self._app_frame(stack),
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "stack": stack,
+                }
+            site["count"] += 1
+            site["total_ms"] += lag * 1000
+            site["max_ms"] = max(site["max_ms"], lag * 1000)
+            site["last_seen"] = datetime.now(timezone.utc)
+        logging.warning("Event loop blocked for %.0f ms at %s", lag * 1000, site["location"])
+
+    @staticmethod
+    def _app_frame(stack: List[str]) -> str:
+        """Innermost frame from this application, falling back to the innermost frame."""
+        root = str(ROOT_DIR)
+        for entry in reversed(stack):
+            if entry.startswith(root) and "site-packages" not in entry:
+                return entry[len(root) + 1:]
+        return stack[-1] if stack else "unknown"
+
+    def report(self) -> dict:
+        lags = sorted(lag * 1000 for lag in self.lags)
+        with self._lock:
+            sites = sorted(self._sites.values(), key=lambda site: site["total_ms"], reverse=True)
+            sites = [dict(site, total_ms=round(site["total_ms"], 1), max_ms=round(site["max_ms"], 1)) for site in sites]
+        return {
+            "running": self.running,
+            "started_at": self.started_at,
+            "interval_ms": self.interval * 1000,
+            "stall_threshold_ms": self.stall_threshold * 1000,
+            "lag_p50_ms": round(percentile(lags, 50), 3),
+            "lag_p99_ms": round(percentile(lags, 99), 3),
+            "lag_max_ms": round(lags[-1], 3) if lags else 0.0,
+            "stalls": self.stalls,
+            "sites": sites,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._sites.clear()
+        self.lags.clear()
+        self.stalls = 0
+
+
+loop_monitor = LoopLagMonitor(LOOP_SAMPLE_INTERVAL_MS, LOOP_STALL_THRESHOLD_MS, LOOP_STALL_MAX_SITES)
+
+
+class LoopStallSite(BaseModel):
+    location: str
+    count: int
+    total_ms: float
+    max_ms: float
+    last_seen: datetime
+    stack: List[str]
+
+
+class LoopMonitorReport(BaseModel):
+    running: bool
+    started_at: Optional[datetime] = None
+    interval_ms: float
+    stall_threshold_ms: float
+    lag_p50_ms: float
+    lag_p99_ms: float
+    lag_max_ms: float
+    stalls: int
+    sites: List[LoopStallSite]
+
+
+@api_router.get("/admin/event-loop", response_model=LoopMonitorReport, dependencies=[Depends(require_admin)])
+async def get_event_loop_report():
+    """Recent loop lag and the code that blocked the loop, ranked by total stall time"""
+    return loop_monitor.report()
+
+
+@api_router.delete("/admin/event-loop", response_model=LoopMonitorReport, dependencies=[Depends(require_admin)])
+async def reset_event_loop_report():
+    """Forget the recorded stalls and lag samples"""
+    loop_monitor.reset()
+    return loop_monitor.report()
+
+
+# ==================== REQUEST PROFILING ====================
+
+# An admin can profile a single request by sending ``X-Profile: sampling``
+# (folded stacks for flamegraph.pl / speedscope) or ``X-Profile: cprofile``
+# (pstats) along with their bearer token. The artifact is stored in
+# request_profiles and its id returned in the X-Profile-Id response header.
+# Both profilers watch the event loop thread, so work done concurrently for
+# other requests shows up too; profile on a quiet instance for clean results.
+# Requests without a valid admin token are served normally and not profiled.
+PROFILE_SAMPLE_INTERVAL_MS = float(os.environ.get("PROFILE_SAMPLE_INTERVAL_MS", "1"))
+PROFILE_RETENTION_DAYS = int(os.environ.get("PROFILE_RETENTION_DAYS", "7"))
+PROFILE_MAX_ARTIFACT_BYTES = int(os.environ.get("PROFILE_MAX_ARTIFACT_BYTES", str(8 * 1024 * 1024)))
+PROFILE_TOP_FUNCTIONS = 30
+
+
+class ProfileMode(str, Enum):
+    SAMPLING = "sampling"
+    CPROFILE = "cprofile"
+
+
+def profile_frame_label(code) -> str:
+    filename = code.co_filename
+    root = str(ROOT_DIR)
+    if filename.startswith(root):
+        filename = filename[len(root) + 1:]
+    elif "site-packages" in filename:
+        filename = filename.split("site-packages", 1)[1].lstrip("/\\")
+    else:
+        filename = Path(filename).name
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Samples one thread's stack from a helper thread and counts folded stacks."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Dict[str, int] = {}
+        self.total = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        # A CPU-bound loop thread only hands over the GIL every switch interval
+        # (5 ms by default); shorten it while sampling so samples land on time.
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval))
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        sys.setswitchinterval(self._switch_interval)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(profile_frame_label(frame.f_code))
+                frame = frame.f_back
+            labels.reverse()
+            # The loop waiting in select() is idle time, not work
+            stack = "(idle)" if labels[-1].startswith("select (selectors.py") else ";".join(labels)
+            self.samples[stack] = self.samples.get(stack, 0) + 1
+            self.total += 1
+
+    def artifact(self) -> bytes:
+        lines = [f"{stack} {count}" for stack, count in sorted(self.samples.items())]
+        return "\n".join(lines).encode("utf-8")
+
+    def top_functions(self, limit: int) -> List[Dict[str, Any]]:
+        self_samples: Dict[str, int] = {}
+        for stack, count in self.samples.items():
+            leaf = stack.rsplit(";", 1)[-1]
+            self_samples[leaf] = self_samples.get(leaf, 0) + count
+        ranked = sorted(self_samples.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [
+            {"function": function, "samples": count, "share": round(count / self.total, 4) if self.total else 0.0}
+            for function, count in ranked
+        ]
+
+
+def cprofile_top_functions(profile, limit: int) -> List[Dict[str, Any]]:
+    stats = pstats.Stats(profile).stats
+    total = sum(entry[2] for entry in stats.values()) or 1.0
+    ranked = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)[:limit]
+    return [
+        {
+            "function": f"{name} ({Path(filename).name}:{line})",
+            "calls": calls,
+            "self_ms": round(self_time * 1000, 3),
+            "cumulative_ms": round(cumulative * 1000, 3),
+            "share": round(self_time / total, 4),
+        }
+        for (filename, line, name), (_, calls, self_time, cumulative, _) in ranked
+    ]
 
-        language_names = {
-            "en": "English",
-            "hr": "Croatian",
-            "de": "German",
-            "sl": "Slovenian",
+
+class ProfilingMiddleware:
+    """Runs a request under a profiler when an admin asks for it with X-Profile.
+
+    One request per process is profiled at a time; a second one is served
+    unprofiled with ``X-Profile: busy``.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._busy = False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        requested = authorization = None
+        for name, value in scope["headers"]:
+            if name == b"x-profile":
+                requested = value.decode("latin-1").strip().lower()
+            elif name == b"authorization":
+                authorization = value.decode("latin-1")
+        if not requested:
+            await self.app(scope, receive, send)
+            return
+        try:
+            mode = ProfileMode(requested if requested not in ("1", "true") else ProfileMode.SAMPLING.value)
+            claims = await require_admin(authorization)
+        except (ValueError, HTTPException):
+            await self.app(scope, receive, send)
+            return
+        if self._busy:
+            await self.app(scope, receive, self._with_headers(send, [(b"x-profile", b"busy")], {}))
+            return
+        await self._profile(scope, receive, send, mode, claims)
+
+    @staticmethod
+    def _with_headers(send, headers: List[Tuple[bytes, bytes]], response: Dict[str, Any]):
+        async def wrapped(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + headers
+                response["status"] = message["status"]
+            await send(message)
+
+        return wrapped
+
+    async def _profile(self, scope, receive, send, mode: ProfileMode, claims: Dict[str, Any]) -> None:
+        profile_id = str(uuid.uuid4())
+        response: Dict[str, Any] = {"status": 500}
+        headers = [(b"x-profile-id", profile_id.encode("latin-1"))]
+        self._busy = True
+        if mode == ProfileMode.CPROFILE:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        else:
+            profiler = SamplingProfiler(threading.get_ident(), PROFILE_SAMPLE_INTERVAL_MS / 1000)
+            profiler.start()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, self._with_headers(send, headers, response))
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            if mode == ProfileMode.CPROFILE:
+                profiler.disable()
+                profiler.create_stats()
+                # Same format as Profile.dump_stats, loadable with pstats / snakeviz
+                artifact = marshal.dumps(profiler.stats)
+                top = cprofile_top_functions(profiler, PROFILE_TOP_FUNCTIONS)
+                samples = None
+            else:
+                profiler.stop()
+                artifact = profiler.artifact()
+                top = profiler.top_functions(PROFILE_TOP_FUNCTIONS)
+                samples = profiler.total
+            self._busy = False
+
+        now = datetime.now(timezone.utc)
+        doc = {
+            "id": profile_id,
+            "created_at": now,
+            "expires_at": now + timedelta(days=PROFILE_RETENTION_DAYS),
+            "admin": claims.get("sub"),
+            "method": scope["method"],
+            "path": scope["path"],
+            "query": scope.get("query_string", b"").decode("latin-1"),
+            "route": request_route.get() or None,
+            "status": response["status"],
+            "mode": mode.value,
+            "duration_ms": round(duration_ms, 3),
+            "samples": samples,
+            "top": top,
+            "size": len(artifact),
+            "artifact": artifact if len(artifact) <= PROFILE_MAX_ARTIFACT_BYTES else None,
         }
+        try:
+            await db.request_profiles.insert_one(doc)
+        except Exception:
+            logging.exception("Failed to store request profile %s", profile_id)
+
+
+class RequestProfile(BaseModel):
+    id: str
+    created_at: datetime
+    admin: Optional[str] = None
+    method: str
+    path: str
+    query: str = ""
+    route: Optional[str] = None
+    status: int
+    mode: ProfileMode
+    duration_ms: float
+    samples: Optional[int] = None
+    size: int
+    top: List[Dict[str, Any]] = []
+
+
+@api_router.get("/admin/profiles", response_model=List[RequestProfile], dependencies=[Depends(require_admin)])
+async def get_request_profiles(limit: int = Query(default=50, le=200)):
+    """Stored request profiles, newest first (without hotspots or artifacts)"""
+    return await db.request_profiles.find(
+        {}, {"_id": 0, "artifact": 0, "top": 0}
+    ).sort("created_at", -1).limit(limit).to_list(limit)
+
+
+@api_router.get("/admin/profiles/{profile_id}", response_model=RequestProfile, dependencies=[Depends(require_admin)])
+async def get_request_profile(profile_id: str):
+    """A stored profile with its hottest functions"""
+    profile = await db.request_profiles.find_one({"id": profile_id}, {"_id": 0, "artifact": 0})
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile
+
+
+@api_router.get("/admin/profiles/{profile_id}/artifact", dependencies=[Depends(require_admin)])
+async def download_request_profile(profile_id: str):
+    """Download the folded stacks (sampling) or pstats file (cprofile) of a profile"""
+    profile = await db.request_profiles.find_one({"id": profile_id}, {"_id": 0, "mode": 1, "artifact": 1})
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if profile.get("artifact") is None:
+        raise HTTPException(status_code=410, detail="Profile artifact was too large to store")
+    if profile["mode"] == ProfileMode.CPROFILE.value:
+        media_type, filename = "application/octet-stream", f"{profile_id}.prof"
+    else:
+        media_type, filename = "text/plain; charset=utf-8", f"{profile_id}.folded"
+    return Response(
+        content=bytes(profile["artifact"]),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@api_router.delete("/admin/profiles/{profile_id}", dependencies=[Depends(require_admin)])
+async def delete_request_profile(profile_id: str):
+    """Delete a stored profile"""
+    result = await db.request_profiles.delete_one({"id": profile_id})
+    if result.deleted_count == 0:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return {"message": "Profile deleted successfully"}
+
+
+# ==================== HEALTH CHECK ====================
+
+@api_router.get("/health")
+async def health_check():
+    """Health check endpoint"""
+    try:
+        await db.command("ping")
+        return {"status": "healthy", "database": "connected"}
+    except Exception as e:
+        return {"status": "unhealthy", "database": str(e)}
+
+
+# ==================== LLM CLIENT POOL ====================
+
+LLM_REQUEST_TIMEOUT = float(os.environ.get("LLM_REQUEST_TIMEOUT", "60"))
+LLM_CONNECT_TIMEOUT = float(os.environ.get("LLM_CONNECT_TIMEOUT", "10"))
+LLM_MAX_CONNECTIONS = int(os.environ.get("LLM_MAX_CONNECTIONS", "20"))
+LLM_KEEPALIVE_SECONDS = float(os.environ.get("LLM_KEEPALIVE_SECONDS", "120"))
+
+
+class LLMClientRegistry:
+    """Hands out one pooled ``AsyncOpenAI`` client per OpenAI settings version.
 
-        target_names = [language_names.get(l, l) for l in request.target_langs]
+    The client shares a single httpx connection pool (HTTP/2 when ``h2`` is
+    installed) so requests reuse warm TLS connections instead of opening a new
+    pool per call. Saving the OpenAI settings bumps their version; the next
+    caller gets a fresh client and the old one is closed once requests that
+    may still be using it have timed out.
+    """
+
+    def __init__(self):
+        self._client = None
+        self._version: Optional[int] = None
+        self._api_key: Optional[str] = None
+        self._lock = asyncio.Lock()
+        self._retiring: Dict[asyncio.Task, Any] = {}
+
+    def _build(self, api_key: str):
+        import httpx
+        from openai import AsyncOpenAI
 
-        system_msg = (
-            "You are a professional translator. Translate the given text accurately while maintaining the tone and meaning. "
-            f"Return translations as a JSON object with language codes as keys ({request.target_langs}). "
-            "Maintain any HTML formatting in the original text."
+        http_client = httpx.AsyncClient(
+            http2=importlib.util.find_spec("h2") is not None,
+            timeout=httpx.Timeout(LLM_REQUEST_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_MAX_CONNECTIONS,
+                keepalive_expiry=LLM_KEEPALIVE_SECONDS,
+            ),
         )
+        return AsyncOpenAI(api_key=api_key, http_client=http_client, timeout=LLM_REQUEST_TIMEOUT)
+
+    async def get(self, settings: OpenAISettings):
+        if self._client is not None and self._version == settings.version and self._api_key == settings.api_key:
+            return self._client
+        async with self._lock:
+            if self._client is None or self._version != settings.version or self._api_key != settings.api_key:
+                if self._client is not None:
+                    self._retire(self._client)
+                self._client = self._build(settings.api_key)
+                self._version = settings.version
+                self._api_key = settings.api_key
+        return self._client
+
+    def _retire(self, old_client) -> None:
+        async def close_later():
+            await asyncio.sleep(LLM_REQUEST_TIMEOUT)
+            await old_client.close()
+
+        task = asyncio.create_task(close_later())
+        self._retiring[task] = old_client
+        task.add_done_callback(lambda done: self._retiring.pop(done, None))
+
+    async def close(self) -> None:
+        """Close the current and any retiring clients; called on shutdown."""
+        clients = list(self._retiring.values())
+        for task in list(self._retiring):
+            task.cancel()
+        self._retiring.clear()
+        if self._client is not None:
+            clients.append(self._client)
+        self._client = None
+        self._version = None
+        self._api_key = None
+        for old_client in clients:
+            await old_client.close()
+
+
+llm_clients = LLMClientRegistry()
+
+
+# ==================== LLM PROVIDERS ====================
+
+# "openai" (live: admin OpenAI settings, Emergent key for blog generation),
+# "fake" (offline replay/synthesis) or "record" (live, saving every completion
+# to LLM_RECORDINGS_PATH so a fake provider can replay it later).
+LLM_PROVIDER = os.environ.get("LLM_PROVIDER", "openai").lower()
+LLM_RECORDINGS_PATH = os.environ.get("LLM_RECORDINGS_PATH")
+if LLM_PROVIDER == "record" and not LLM_RECORDINGS_PATH:
+    raise RuntimeError("LLM_PROVIDER=record needs LLM_RECORDINGS_PATH to know where to save completions")
+
+
+class LLMRequest(BaseModel):
+    endpoint: str
+    model: str
+    messages: List[Dict[str, str]]
+    temperature: Optional[float] = None
+    # Structured inputs behind the prompt; ignored by live providers, used by
+    # the fake provider to synthesize a plausible response.
+    hints: Dict[str, Any] = Field(default_factory=dict)
+
+    def request_hash(self) -> str:
+        """Replay key: endpoint, messages and temperature (not the model, so
+        recordings survive a model switch in admin settings)."""
+        raw = json.dumps([self.endpoint, self.messages, self.temperature], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMResult(BaseModel):
+    text: str = ""
+    model: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    retries: int = 0
+    estimated_tokens: bool = False
+
+
+class LLMProvider(ABC):
+    """One way of turning an LLMRequest into text.
+
+    ``complete`` returns the whole response; ``stream`` yields text deltas and
+    fills in token usage on ``result`` once the stream is finished.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    async def complete(self, request: LLMRequest) -> LLMResult:
+        """Return the whole completion for ``request``."""
+
+    async def stream(self, request: LLMRequest, result: LLMResult):
+        completed = await self.complete(request)
+        result.model = completed.model
+        result.prompt_tokens = completed.prompt_tokens
+        result.completion_tokens = completed.completion_tokens
+        result.retries = completed.retries
+        result.estimated_tokens = completed.estimated_tokens
+        result.text = completed.text
+        yield completed.text
 
-        user_text = (
-            f"Translate from {language_names.get(request.source_lang, request.source_lang)} "
-            f"to {', '.join(target_names)}:\n\n{request.text}\n\nReturn ONLY valid JSON."
+
+class OpenAIProvider(LLMProvider):
+    """Live OpenAI chat completions through the pooled client."""
+
+    name = "openai"
+
+    def __init__(self, llm):
+        self.llm = llm
+
+    async def complete(self, request: LLMRequest) -> LLMResult:
+        options = {} if request.temperature is None else {"temperature": request.temperature}
+        raw = await self.llm.chat.completions.with_raw_response.create(
+            model=request.model, messages=request.messages, **options
+        )
+        completion = raw.parse()
+        usage = getattr(completion, "usage", None)
+        return LLMResult(
+            text=completion.choices[0].message.content or "",
+            model=getattr(completion, "model", None) or request.model,
+            prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+            completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+            retries=getattr(raw, "retries_taken", 0) or 0,
         )
 
-        messages = [
-            {"role": "system", "content": system_msg},
-            {"role": "user", "content": user_text},
-        ]
+    async def stream(self, request: LLMRequest, result: LLMResult):
+        stream = await self.llm.chat.completions.create(
+            model=request.model,
+            messages=request.messages,
+            temperature=request.temperature,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        parts: List[str] = []
+        try:
+            async for chunk in stream:
+                usage = getattr(chunk, "usage", None)
+                if usage:
+                    result.prompt_tokens = usage.prompt_tokens or 0
+                    result.completion_tokens = usage.completion_tokens or 0
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+                    yield chunk.choices[0].delta.content
+        finally:
+            result.text = "".join(parts)
+            await stream.close()
 
-        completion = await client.chat.completions.create(
-            model=model_name,
-            messages=messages,
-            temperature=0.2,
+
+class EmergentProvider(LLMProvider):
+    """Emergent LlmChat (used by blog generation); it cannot stream and does
+    not report usage, so tokens are estimated from the text."""
+
+    name = "emergent"
+
+    def __init__(self, api_key: str):
+        self.api_key = api_key
+
+    async def complete(self, request: LLMRequest) -> LLMResult:
+        from emergentintegrations.llm.chat import LlmChat, UserMessage
+
+        system_msg = "\n".join(m["content"] for m in request.messages if m["role"] == "system")
+        user_text = "\n".join(m["content"] for m in request.messages if m["role"] == "user")
+        # LlmChat keeps per-session history, so every request gets its own session.
+        chat = LlmChat(
+            api_key=self.api_key,
+            session_id=f"blog-{uuid.uuid4()}",
+            system_message=system_msg
+        ).with_model("openai", request.model)
+        text = await chat.send_message(UserMessage(text=user_text))
+        return LLMResult(
+            text=text,
+            model=request.model,
+            prompt_tokens=estimate_tokens(system_msg + user_text),
+            completion_tokens=estimate_tokens(text),
+            estimated_tokens=True,
+        )
+
+
+class FakeLLMError(Exception):
+    """Injected upstream failure; carries ``status_code`` like openai's APIStatusError."""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"Injected LLM error ({status_code})")
+        self.status_code = status_code
+        self.response = None
+
+
+class FakeLLMProvider(LLMProvider):
+    """Offline stand-in for benchmarks and tests.
+
+    Completions recorded in ``recordings_path`` are replayed by request hash;
+    anything else is synthesized per endpoint from the request hints (or
+    rejected when ``strict``). Latency and error rate are configurable and the
+    random source is seeded, so runs are reproducible.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        recordings_path: Optional[str] = None,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 429,
+        stream_chunk_ms: float = 0.0,
+        seed: int = 0,
+        strict: bool = False,
+    ):
+        self.recordings_path = recordings_path
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.stream_chunk_ms = stream_chunk_ms
+        self.strict = strict
+        self._random = random.Random(seed)
+        self._recordings: Optional[Dict[str, dict]] = None
+        self.stats = {"replayed": 0, "synthesized": 0, "errors": 0}
+
+    def _load_recordings(self) -> Dict[str, dict]:
+        if self._recordings is None:
+            self._recordings = {}
+            if self.recordings_path and Path(self.recordings_path).exists():
+                with open(self.recordings_path, encoding="utf-8") as fh:
+                    for line in fh:
+                        if line.strip():
+                            record = json.loads(line)
+                            self._recordings[record["hash"]] = record
+        return self._recordings
+
+    async def _simulate_call(self) -> None:
+        delay = self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.stats["errors"] += 1
+            raise FakeLLMError(self.error_status)
+
+    async def complete(self, request: LLMRequest) -> LLMResult:
+        await self._simulate_call()
+        record = self._load_recordings().get(request.request_hash())
+        if record is not None:
+            self.stats["replayed"] += 1
+            text = record["text"]
+            return LLMResult(
+                text=text,
+                model=record.get("model") or request.model,
+                prompt_tokens=record.get("prompt_tokens", 0),
+                completion_tokens=record.get("completion_tokens", 0),
+            )
+        if self.strict:
+            raise FakeLLMError(404)
+        self.stats["synthesized"] += 1
+        text = synthesize_llm_response(request)
+        return LLMResult(
+            text=text,
+            model=request.model,
+            prompt_tokens=sum(estimate_tokens(m["content"]) for m in request.messages),
+            completion_tokens=estimate_tokens(text),
+            estimated_tokens=True,
         )
 
-        response_text = completion.choices[0].message.content or ""
+    async def stream(self, request: LLMRequest, result: LLMResult):
+        completed = await self.complete(request)
+        result.model = completed.model
+        result.prompt_tokens = completed.prompt_tokens
+        result.completion_tokens = completed.completion_tokens
+        result.estimated_tokens = completed.estimated_tokens
+        result.text = completed.text
+        # Roughly one token per chunk, like the live stream
+        for start in range(0, len(completed.text), 4):
+            if self.stream_chunk_ms > 0:
+                await asyncio.sleep(self.stream_chunk_ms / 1000)
+            yield completed.text[start:start + 4]
+
+
+class RecordingLLMProvider(LLMProvider):
+    """Wraps a live provider and appends every successful completion to a JSONL
+    file that FakeLLMProvider can replay."""
+
+    name = "record"
+
+    def __init__(self, inner: LLMProvider, path: str):
+        self.inner = inner
+        self.path = path
+        self._write_lock = threading.Lock()
+
+    def _write(self, line: str) -> None:
+        with self._write_lock, open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(line)
+
+    async def _save(self, request: LLMRequest, result: LLMResult) -> None:
+        """Append the record off the event loop (like SpanFileExporter.flush)."""
+        record = {
+            "hash": request.request_hash(),
+            "endpoint": request.endpoint,
+            "model": result.model,
+            "messages": request.messages,
+            "temperature": request.temperature,
+            "text": result.text,
+            "prompt_tokens": result.prompt_tokens,
+            "completion_tokens": result.completion_tokens,
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+        }
+        await asyncio.to_thread(self._write, json.dumps(record, ensure_ascii=False) + "\n")
+
+    async def complete(self, request: LLMRequest) -> LLMResult:
+        result = await self.inner.complete(request)
+        await self._save(request, result)
+        return result
+
+    async def stream(self, request: LLMRequest, result: LLMResult):
+        async for text in self.inner.stream(request, result):
+            yield text
+        await self._save(request, result)
+
+
+def synthesize_llm_response(request: LLMRequest) -> str:
+    """Deterministic, well-formed JSON shaped like each endpoint's real output."""
+    hints = request.hints
+    endpoint = request.endpoint
+    if endpoint == "ai/translate":
+        return json.dumps({lang: f"[{lang}] {hints.get('text', '')}" for lang in hints.get("target_langs", [])})
+    if endpoint == "ai/translate-batch":
+        return json.dumps({
+            item_id: {lang: f"[{lang}] {text}" for lang in hints.get("target_langs", [])}
+            for item_id, text in hints.get("items", [])
+        })
+    if endpoint.startswith("ai/generate-blog"):
+        topic = hints.get("topic", "")
+        langs = ["en", "hr", "de", "sl"]
+        return json.dumps({
+            "title": {lang: f"[{lang}] {topic}" for lang in langs},
+            "excerpt": {lang: f"[{lang}] A short summary of {topic}." for lang in langs},
+            "content": {lang: f"<p>[{lang}] {topic}</p>" * 8 for lang in langs},
+            "tags": ["vacation rentals", "syncbeds"],
+        })
+    if endpoint.startswith("ai/generate"):
+        prompt = hints.get("prompt", "")
+        paragraphs = {"short": 2, "medium": 6, "long": 12}.get(hints.get("length"), 6)
+        return json.dumps({
+            lang: {
+                "title": f"[{lang}] {prompt[:60]}",
+                "excerpt": f"[{lang}] A short summary of {prompt[:60]}.",
+                "content": f"<p>[{lang}] {prompt}</p>" * paragraphs,
+                "tags": ["vacation rentals", "syncbeds"],
+            }
+            for lang in hints.get("languages", ["en"])
+        })
+    return "{}"
+
+
+fake_llm_provider = FakeLLMProvider(
+    recordings_path=LLM_RECORDINGS_PATH,
+    latency_ms=float(os.environ.get("LLM_FAKE_LATENCY_MS", "0")),
+    jitter_ms=float(os.environ.get("LLM_FAKE_JITTER_MS", "0")),
+    error_rate=float(os.environ.get("LLM_FAKE_ERROR_RATE", "0")),
+    error_status=int(os.environ.get("LLM_FAKE_ERROR_STATUS", "429")),
+    stream_chunk_ms=float(os.environ.get("LLM_FAKE_STREAM_CHUNK_MS", "0")),
+    seed=int(os.environ.get("LLM_FAKE_SEED", "0")),
+    strict=os.environ.get("LLM_FAKE_STRICT", "").lower() in ("1", "true", "yes"),
+)
+
+
+def llm_configured(settings: OpenAISettings) -> bool:
+    """Whether AI endpoints can run: OpenAI is enabled in settings, or the fake provider is active."""
+    return LLM_PROVIDER == "fake" or bool(settings.enabled and settings.api_key)
+
+
+def with_recording(provider: LLMProvider) -> LLMProvider:
+    if LLM_PROVIDER == "record":
+        return RecordingLLMProvider(provider, LLM_RECORDINGS_PATH)
+    return provider
+
 
+async def get_llm_provider() -> Tuple[LLMProvider, OpenAISettings]:
+    """Return the provider for OpenAI-backed AI endpoints and the current settings."""
+    settings = await get_openai_settings()
+    if LLM_PROVIDER == "fake":
+        return fake_llm_provider, settings
+    if not settings.enabled or not settings.api_key:
+        raise HTTPException(status_code=500, detail="OpenAI API key not configured in admin settings")
+    return with_recording(OpenAIProvider(await llm_clients.get(settings))), settings
+
+
+def get_blog_llm_provider() -> LLMProvider:
+    """Return the provider for blog generation (Emergent LLM key when live)."""
+    if LLM_PROVIDER == "fake":
+        return fake_llm_provider
+    api_key = os.environ.get('EMERGENT_LLM_KEY')
+    if not api_key:
+        raise HTTPException(status_code=500, detail="AI API key not configured")
+    return with_recording(EmergentProvider(api_key))
+
+
+# ==================== LLM USAGE ACCOUNTING ====================
+
+# USD per 1M (prompt, completion) tokens; model names match by longest prefix
+# so dated variants such as "gpt-4o-2024-08-06" are priced like "gpt-4o".
+DEFAULT_LLM_PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4-turbo": (10.00, 30.00),
+    "gpt-3.5-turbo": (0.50, 1.50),
+}
+
+
+def load_llm_prices() -> Dict[str, Tuple[float, float]]:
+    """Default price table, overridden per model by the LLM_PRICES JSON env var
+    (e.g. ``{"gpt-4o": [2.5, 10]}``)."""
+    prices = dict(DEFAULT_LLM_PRICES)
+    raw = os.environ.get("LLM_PRICES")
+    if raw:
         try:
-            clean_response = response_text.strip()
-            if clean_response.startswith("```"):
-                clean_response = clean_response.split("```")[1]
-                if clean_response.startswith("json"):
-                    clean_response = clean_response[4:]
-            translations = json.loads(clean_response)
+            prices.update({model: (float(p[0]), float(p[1])) for model, p in json.loads(raw).items()})
+        except (ValueError, TypeError, IndexError, AttributeError):
+            logging.warning("Ignoring invalid LLM_PRICES value")
+    return prices
+
+
+def load_endpoint_token_budgets() -> Dict[str, int]:
+    raw = os.environ.get("LLM_ENDPOINT_TOKEN_BUDGETS")
+    if not raw:
+        return {}
+    try:
+        return {endpoint: int(budget) for endpoint, budget in json.loads(raw).items()}
+    except (ValueError, TypeError, AttributeError):
+        logging.warning("Ignoring invalid LLM_ENDPOINT_TOKEN_BUDGETS value")
+        return {}
+
+
+LLM_PRICES = load_llm_prices()
+# Daily token budgets (0 = unlimited); per-endpoint budgets come from a JSON map.
+LLM_DAILY_TOKEN_BUDGET = int(os.environ.get("LLM_DAILY_TOKEN_BUDGET", "0"))
+LLM_ENDPOINT_TOKEN_BUDGETS = load_endpoint_token_budgets()
+LLM_CALLS_RETENTION_DAYS = int(os.environ.get("LLM_CALLS_RETENTION_DAYS", "30"))
+LLM_STATS_MAX_CALLS = int(os.environ.get("LLM_STATS_MAX_CALLS", "50000"))
+
+# Where the current LLM call comes from ("api" or "job:<type>") and which
+# scheduler retry it is; set by the job runner and the translation scheduler.
+llm_call_source: contextvars.ContextVar[str] = contextvars.ContextVar("llm_call_source", default="api")
+llm_retry_attempt: contextvars.ContextVar[int] = contextvars.ContextVar("llm_retry_attempt", default=0)
+
+
+def estimate_llm_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    matches = [name for name in LLM_PRICES if model.startswith(name)]
+    if not matches:
+        return 0.0
+    prompt_price, completion_price = LLM_PRICES[max(matches, key=len)]
+    return round((prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000, 6)
+
+
+async def check_llm_budget(endpoint: str) -> None:
+    """Reject the call with 429 once today's global or per-endpoint token budget is used up."""
+    endpoint_budget = LLM_ENDPOINT_TOKEN_BUDGETS.get(endpoint, 0)
+    if LLM_DAILY_TOKEN_BUDGET <= 0 and endpoint_budget <= 0:
+        return
+    today = datetime.now(timezone.utc).date().isoformat()
+    rollups = await db.llm_usage_daily.find(
+        {"date": today}, {"_id": 0, "endpoint": 1, "total_tokens": 1}
+    ).to_list(1000)
+    used = sum(r.get("total_tokens", 0) for r in rollups)
+    if LLM_DAILY_TOKEN_BUDGET > 0 and used >= LLM_DAILY_TOKEN_BUDGET:
+        raise HTTPException(status_code=429, detail="Daily LLM token budget exhausted")
+    if endpoint_budget > 0:
+        used = sum(r.get("total_tokens", 0) for r in rollups if r.get("endpoint") == endpoint)
+        if used >= endpoint_budget:
+            raise HTTPException(status_code=429, detail=f"Daily LLM token budget for {endpoint} exhausted")
+
+
+async def record_llm_call(
+    endpoint: str,
+    model: str,
+    latency_ms: float,
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0,
+    retries: int = 0,
+    error: Optional[str] = None,
+    first_token_ms: Optional[float] = None,
+    estimated_tokens: bool = False,
+) -> None:
+    """Store one LLM call and add it to the daily rollup; never raises."""
+    OUTBOUND_CALL_DURATION.labels("llm", endpoint).observe(latency_ms / 1000)
+    if error is not None:
+        OUTBOUND_CALL_ERRORS.labels("llm", endpoint, "error").inc()
+    now = datetime.now(timezone.utc)
+    total_tokens = prompt_tokens + completion_tokens
+    cost = estimate_llm_cost(model, prompt_tokens, completion_tokens)
+    call = {
+        "endpoint": endpoint,
+        "source": llm_call_source.get(),
+        "model": model,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": total_tokens,
+        "estimated_tokens": estimated_tokens,
+        "latency_ms": round(latency_ms, 1),
+        "first_token_ms": round(first_token_ms, 1) if first_token_ms is not None else None,
+        "retries": retries,
+        "cost_usd": cost,
+        "success": error is None,
+        "error": error,
+        "created_at": now.isoformat(),
+        "expires_at": now + timedelta(days=LLM_CALLS_RETENTION_DAYS),
+    }
+    try:
+        await asyncio.gather(
+            db.llm_calls.insert_one(call),
+            db.llm_usage_daily.update_one(
+                {"date": now.date().isoformat(), "endpoint": endpoint, "model": model},
+                {"$inc": {
+                    "calls": 1,
+                    "errors": 0 if error is None else 1,
+                    "retries": retries,
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": total_tokens,
+                    "cost_usd": cost,
+                    "latency_ms_total": call["latency_ms"],
+                }},
+                upsert=True,
+            ),
+        )
+    except Exception:
+        logging.exception("Failed to record LLM call")
+
+
+async def chat_completion(
+    provider: LLMProvider,
+    endpoint: str,
+    model_name: str,
+    messages: List[Dict[str, str]],
+    temperature: Optional[float] = None,
+    hints: Optional[Dict[str, Any]] = None,
+) -> LLMResult:
+    """Run one completion through ``provider`` with budget check and usage accounting."""
+    await check_llm_budget(endpoint)
+    request = LLMRequest(
+        endpoint=endpoint, model=model_name, messages=messages, temperature=temperature, hints=hints or {}
+    )
+    started = time.perf_counter()
+    retries = llm_retry_attempt.get()
+    try:
+        with trace_span("llm.complete", "client", **{"llm.endpoint": endpoint, "llm.model": model_name}):
+            result = await provider.complete(request)
+    except Exception as exc:
+        await record_llm_call(
+            endpoint, model_name, (time.perf_counter() - started) * 1000, retries=retries, error=str(exc)[:500]
+        )
+        raise
+    await record_llm_call(
+        endpoint,
+        result.model,
+        (time.perf_counter() - started) * 1000,
+        prompt_tokens=result.prompt_tokens,
+        completion_tokens=result.completion_tokens,
+        retries=retries + result.retries,
+        estimated_tokens=result.estimated_tokens,
+    )
+    return result
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class LLMEndpointStats(BaseModel):
+    endpoint: str
+    calls: int
+    errors: int
+    retries: int
+    prompt_tokens: int
+    completion_tokens: int
+    cost_usd: float
+    latency_p50_ms: float
+    latency_p95_ms: float
+    latency_p99_ms: float
+    sources: Dict[str, int]
+
+
+class LLMBudgetStatus(BaseModel):
+    date: str
+    used_tokens: int
+    daily_budget: int
+    endpoint_budgets: Dict[str, int]
+    endpoint_used: Dict[str, int]
+
+
+class LLMStatsResponse(BaseModel):
+    days: int
+    endpoints: List[LLMEndpointStats]
+    daily: List[Dict[str, Any]]
+    budget: LLMBudgetStatus
+
+
+@api_router.get("/admin/ai/llm-stats", response_model=LLMStatsResponse, dependencies=[Depends(require_admin)])
+async def get_llm_stats(days: int = Query(default=7, ge=1, le=90)):
+    """Per-endpoint LLM latency percentiles, tokens and cost over the last ``days``
+    days, plus the daily rollups and today's budget usage."""
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    calls = await db.llm_calls.find(
+        {"created_at": {"$gte": since.isoformat()}},
+        {"_id": 0, "endpoint": 1, "source": 1, "latency_ms": 1, "success": 1, "retries": 1,
+         "prompt_tokens": 1, "completion_tokens": 1, "cost_usd": 1},
+    ).sort("created_at", -1).to_list(LLM_STATS_MAX_CALLS)
+
+    grouped: Dict[str, List[dict]] = {}
+    for call in calls:
+        grouped.setdefault(call["endpoint"], []).append(call)
+
+    endpoints = []
+    for endpoint, items in sorted(grouped.items()):
+        latencies = sorted(c.get("latency_ms", 0.0) for c in items)
+        sources: Dict[str, int] = {}
+        for c in items:
+            sources[c.get("source", "api")] = sources.get(c.get("source", "api"), 0) + 1
+        endpoints.append(LLMEndpointStats(
+            endpoint=endpoint,
+            calls=len(items),
+            errors=sum(1 for c in items if not c.get("success", True)),
+            retries=sum(c.get("retries", 0) for c in items),
+            prompt_tokens=sum(c.get("prompt_tokens", 0) for c in items),
+            completion_tokens=sum(c.get("completion_tokens", 0) for c in items),
+            cost_usd=round(sum(c.get("cost_usd", 0.0) for c in items), 4),
+            latency_p50_ms=percentile(latencies, 50),
+            latency_p95_ms=percentile(latencies, 95),
+            latency_p99_ms=percentile(latencies, 99),
+            sources=sources,
+        ))
+
+    daily = await db.llm_usage_daily.find(
+        {"date": {"$gte": since.date().isoformat()}}, {"_id": 0}
+    ).sort([("date", -1), ("endpoint", 1)]).to_list(5000)
+
+    today = datetime.now(timezone.utc).date().isoformat()
+    endpoint_used: Dict[str, int] = {}
+    for rollup in daily:
+        if rollup["date"] == today:
+            endpoint_used[rollup["endpoint"]] = endpoint_used.get(rollup["endpoint"], 0) + rollup.get("total_tokens", 0)
+
+    return LLMStatsResponse(
+        days=days,
+        endpoints=endpoints,
+        daily=daily,
+        budget=LLMBudgetStatus(
+            date=today,
+            used_tokens=sum(endpoint_used.values()),
+            daily_budget=LLM_DAILY_TOKEN_BUDGET,
+            endpoint_budgets=LLM_ENDPOINT_TOKEN_BUDGETS,
+            endpoint_used=endpoint_used,
+        ),
+    )
+
+
+# ==================== AI STREAMING ====================
+
+# Completed JSON strings under these keys are pushed to the client as soon as
+# they are parsed, so titles and excerpts show up long before the content.
+STREAMED_FIELD_KEYS = {"title", "excerpt"}
+
+
+class JSONStreamScanner:
+    """Incrementally scans a JSON object arriving in chunks.
+
+    ``feed`` returns ``(path, value)`` for every string value completed by the
+    chunk, where ``path`` is the list of object keys / array indexes leading to
+    it, e.g. ``["hr", "title"]``. Anything before the first ``{`` (such as a
+    markdown code fence) is skipped; numbers and literals are not reported.
+    """
+
+    def __init__(self):
+        self._started = False
+        self._done = False
+        self._stack: List[Dict[str, Any]] = []
+        self._in_string = False
+        self._string_is_key = False
+        self._escape = False
+        self._buffer: List[str] = []
+
+    def _path(self) -> List[Any]:
+        return [frame["key"] if frame["type"] == "object" else frame["index"] for frame in self._stack]
+
+    def _finish_string(self) -> Optional[Tuple[List[Any], str]]:
+        raw = "".join(self._buffer)
+        try:
+            value = json.loads(f'"{raw}"')
         except json.JSONDecodeError:
-            translations = {"error": "Failed to parse translations", "raw": response_text}
+            value = raw
+        self._in_string = False
+        self._buffer = []
+        if self._string_is_key:
+            self._stack[-1]["key"] = value
+            return None
+        return self._path(), value
+
+    def feed(self, chunk: str) -> List[Tuple[List[Any], str]]:
+        completed: List[Tuple[List[Any], str]] = []
+        i, length = 0, len(chunk)
+        while i < length and not self._done:
+            char = chunk[i]
+            if self._in_string:
+                if self._escape:
+                    self._buffer.append(char)
+                    self._escape = False
+                elif char == "\\":
+                    self._buffer.append(char)
+                    self._escape = True
+                elif char == '"':
+                    item = self._finish_string()
+                    if item:
+                        completed.append(item)
+                else:
+                    # Copy the plain run up to the next quote or backslash in one go.
+                    end = i + 1
+                    while end < length and chunk[end] not in '"\\':
+                        end += 1
+                    self._buffer.append(chunk[i:end])
+                    i = end
+                    continue
+            elif not self._started:
+                if char == "{":
+                    self._started = True
+                    self._stack.append({"type": "object", "key": None, "expect_key": True})
+            elif char == '"':
+                top = self._stack[-1]
+                self._in_string = True
+                self._string_is_key = top["type"] == "object" and top["expect_key"]
+            elif char == "{":
+                self._stack.append({"type": "object", "key": None, "expect_key": True})
+            elif char == "[":
+                self._stack.append({"type": "array", "index": 0})
+            elif char in "}]":
+                self._stack.pop()
+                if not self._stack:
+                    self._done = True
+            elif char == ":":
+                self._stack[-1]["expect_key"] = False
+            elif char == ",":
+                top = self._stack[-1]
+                if top["type"] == "object":
+                    top["expect_key"] = True
+                    top["key"] = None
+                else:
+                    top["index"] += 1
+            i += 1
+        return completed
+
+
+def sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+def sse_response(events) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def stream_chat_completion(
+    provider: LLMProvider,
+    endpoint: str,
+    model_name: str,
+    messages: List[Dict[str, str]],
+    temperature: float,
+    hints: Optional[Dict[str, Any]] = None,
+):
+    """Yield content deltas from a streamed completion.
 
-        translations[request.source_lang] = request.text
+    The call is budget-checked and recorded like ``chat_completion``, with the
+    time to the first token kept alongside the total latency.
+    """
+    await check_llm_budget(endpoint)
+    request = LLMRequest(
+        endpoint=endpoint, model=model_name, messages=messages, temperature=temperature, hints=hints or {}
+    )
+    result = LLMResult(model=model_name)
+    started = time.perf_counter()
+    first_token_ms: Optional[float] = None
+    error: Optional[str] = None
+    # Not made current: the generator is resumed from the response's context
+    span = start_span("llm.stream", "client", **{"llm.endpoint": endpoint, "llm.model": model_name})
+    try:
+        async for text in provider.stream(request, result):
+            if first_token_ms is None:
+                first_token_ms = (time.perf_counter() - started) * 1000
+                if span is not None:
+                    span.set("llm.first_token_ms", round(first_token_ms, 1))
+            yield text
+    except BaseException as exc:
+        error = str(exc)[:500] or type(exc).__name__
+        raise
+    finally:
+        if span is not None:
+            span.end(error)
+        await record_llm_call(
+            endpoint,
+            result.model,
+            (time.perf_counter() - started) * 1000,
+            prompt_tokens=result.prompt_tokens,
+            completion_tokens=result.completion_tokens,
+            retries=llm_retry_attempt.get() + result.retries,
+            error=error,
+            first_token_ms=first_token_ms,
+            estimated_tokens=result.estimated_tokens,
+        )
+
+
+# ==================== AI RESULT CACHE ====================
+
+AI_CACHE_TTL_SECONDS = float(os.environ.get("AI_CACHE_TTL_SECONDS", "600"))
+AI_CACHE_MAX_ENTRIES = int(os.environ.get("AI_CACHE_MAX_ENTRIES", "256"))
+
+
+class AIResultCache:
+    """Singleflight plus a small in-process TTL cache for paid LLM calls.
+
+    Concurrent callers with the same key share one in-flight task (a caller
+    that disconnects does not cancel it for the others); successful results
+    are kept for ``ttl`` seconds. ``fresh=True`` skips both the cached result
+    and an identical call that is already running, and its result replaces
+    the cached one. ``still_valid`` is checked before a cached result is
+    returned, for results that point at data which may have changed since.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.stats = {"hits": 0, "coalesced": 0, "misses": 0, "bypassed": 0}
+
+    @staticmethod
+    def make_key(kind: str, **parts: Any) -> str:
+        raw = json.dumps([kind, parts], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _put(self, key: str, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def run(
+        self,
+        key: str,
+        call: Callable[[], Awaitable[T]],
+        fresh: bool = False,
+        cache_if: Optional[Callable[[T], bool]] = None,
+        still_valid: Optional[Callable[[T], Awaitable[bool]]] = None,
+    ) -> T:
+        task = None
+        if fresh:
+            self.stats["bypassed"] += 1
+        else:
+            cached = self._get(key)
+            if cached is not None:
+                if still_valid is None or await still_valid(cached):
+                    self.stats["hits"] += 1
+                    return copy.deepcopy(cached)
+                self._entries.pop(key, None)
+            task = self._inflight.get(key)
+
+        if task is not None:
+            self.stats["coalesced"] += 1
+        else:
+            if not fresh:
+                self.stats["misses"] += 1
+            task = asyncio.ensure_future(call())
+            # A fresh call takes over the key: later callers join it, not an older one
+            self._inflight[key] = task
+
+            def finished(done: asyncio.Task) -> None:
+                if self._inflight.get(key) is not done:
+                    # A fresh call replaced this one; only the newest result is cached
+                    return
+                del self._inflight[key]
+                if done.cancelled() or done.exception() is not None:
+                    return
+                if cache_if is None or cache_if(done.result()):
+                    self._put(key, done.result())
+
+            task.add_done_callback(finished)
+
+        return copy.deepcopy(await asyncio.shield(task))
+
+    def clear(self) -> int:
+        cleared = len(self._entries)
+        self._entries.clear()
+        return cleared
+
+
+ai_result_cache = AIResultCache(AI_CACHE_TTL_SECONDS, AI_CACHE_MAX_ENTRIES)
+
+
+class AIResultCacheStats(BaseModel):
+    entries: int
+    in_flight: int
+    hits: int
+    coalesced: int
+    misses: int
+    bypassed: int
+    ttl_seconds: float
+
+
+@api_router.get("/admin/ai/cache", response_model=AIResultCacheStats, dependencies=[Depends(require_admin)])
+async def get_ai_cache_stats():
+    """AI result cache size and counters (since server start)."""
+    return AIResultCacheStats(
+        entries=len(ai_result_cache._entries),
+        in_flight=len(ai_result_cache._inflight),
+        ttl_seconds=ai_result_cache.ttl,
+        **ai_result_cache.stats,
+    )
+
+
+@api_router.delete("/admin/ai/cache", dependencies=[Depends(require_admin)])
+async def clear_ai_cache():
+    """Forget cached AI responses so the next identical request calls the LLM again."""
+    return {"message": "AI cache cleared", "deleted": ai_result_cache.clear()}
 
-        return {"success": True, "translations": translations}
+
+# ==================== AI CONTENT GENERATION ====================
+
+class AIGenerateRequest(BaseModel):
+    prompt: str
+    content_type: str = "blog_post"  # blog_post, page_section, translation
+    languages: List[str] = ["en", "hr", "de", "sl"]
+    tone: str = "professional"  # professional, casual, formal
+    length: str = "medium"  # short, medium, long
+    fresh: bool = False  # skip the cached result and call the LLM again
+
+class AITranslateRequest(BaseModel):
+    text: str
+    source_lang: str = "en"
+    target_langs: List[str] = ["hr", "de", "sl"]
+    fresh: bool = False
+
+def build_generate_messages(request: AIGenerateRequest) -> List[Dict[str, str]]:
+    # Determine length
+    length_guide = {
+        "short": "Keep it concise, around 100-150 words.",
+        "medium": "Write a moderate length, around 300-400 words.",
+        "long": "Write a comprehensive piece, around 600-800 words."
+    }
+
+    # System message based on content type
+    if request.content_type == "blog_post":
+        system_msg = f"""You are a professional content writer for SyncBeds, a vacation rental management software company.
+Write engaging, SEO-friendly blog posts about vacation rentals, property management, and hospitality technology.
+Tone: {request.tone}. {length_guide.get(request.length, length_guide['medium'])}
+Always structure content with clear headings and paragraphs.
+Return content as JSON with keys for each language: {request.languages}
+Each language version should have: title, excerpt (short summary), content (full blog post in HTML), tags (array of relevant tags)."""
+    else:
+        system_msg = f"""You are a professional content writer for SyncBeds.
+Tone: {request.tone}. {length_guide.get(request.length, length_guide['medium'])}
+Return content as JSON with keys for each language: {request.languages}"""
+
+    return [
+        {"role": "system", "content": system_msg},
+        {
+            "role": "user",
+            "content": f"Generate content about: {request.prompt}\n\nReturn ONLY valid JSON, no markdown code blocks.",
+        },
+    ]
+
+
+def generate_hints(request: AIGenerateRequest) -> Dict[str, Any]:
+    return {"prompt": request.prompt, "languages": request.languages, "length": request.length}
+
+
+def parse_generated_content(response_text: str) -> Dict[str, Any]:
+    try:
+        clean_response = response_text.strip()
+        if clean_response.startswith("```"):
+            clean_response = clean_response.split("```")[1]
+            if clean_response.startswith("json"):
+                clean_response = clean_response[4:]
+        return json.loads(clean_response)
+    except json.JSONDecodeError:
+        return {"raw": response_text}
+
+
+@api_router.post("/ai/generate", dependencies=[Depends(require_admin)])
+async def generate_ai_content(request: AIGenerateRequest):
+    """Generate content using AI (OpenAI GPT)"""
+    try:
+        provider, settings = await get_llm_provider()
+        model_name = settings.model or "gpt-4o"
+
+        async def generate() -> Dict[str, Any]:
+            completion = await chat_completion(
+                provider,
+                "ai/generate",
+                model_name,
+                build_generate_messages(request),
+                temperature=0.4,
+                hints=generate_hints(request),
+            )
+            return {"success": True, "content": parse_generated_content(completion.text)}
+
+        key = AIResultCache.make_key(
+            "generate",
+            prompt=normalize_whitespace(request.prompt),
+            content_type=request.content_type,
+            languages=request.languages,
+            tone=request.tone,
+            length=request.length,
+            model=model_name,
+        )
+        # An unparsable reply comes back as {"raw": ...}; it is returned but not cached
+        return await ai_result_cache.run(
+            key, generate, fresh=request.fresh, cache_if=lambda result: "raw" not in result["content"]
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"AI generation error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"AI generation failed: {str(e)}")
+
+
+@api_router.post("/ai/generate/stream", dependencies=[Depends(require_admin)])
+async def generate_ai_content_stream(request: AIGenerateRequest):
+    """Streaming variant of /ai/generate as server-sent events.
+
+    Emits ``delta`` events with raw model tokens, a ``field`` event for every
+    title/excerpt as soon as its JSON string is complete, and a final ``done``
+    event carrying the same ``content`` /ai/generate would return.
+    """
+    provider, settings = await get_llm_provider()
+    model_name = settings.model or "gpt-4o"
+
+    async def events():
+        scanner = JSONStreamScanner()
+        parts: List[str] = []
+        try:
+            async for text in stream_chat_completion(
+                provider,
+                "ai/generate/stream",
+                model_name,
+                build_generate_messages(request),
+                0.4,
+                hints=generate_hints(request),
+            ):
+                parts.append(text)
+                yield sse_event("delta", {"text": text})
+                for path, value in scanner.feed(text):
+                    if STREAMED_FIELD_KEYS.intersection(path):
+                        yield sse_event("field", {"path": path, "value": value})
+            yield sse_event("done", {"success": True, "content": parse_generated_content("".join(parts))})
+        except Exception as e:
+            logger.error(f"AI generation stream error: {str(e)}")
+            yield sse_event("error", {"detail": f"AI generation failed: {str(e)}"})
+
+    return sse_response(events())
+
+async def request_translations(text: str, source_lang: str, target_langs: List[str]) -> Dict[str, Any]:
+    """Send a single translation request to OpenAI and return the parsed JSON object.
+
+    Client errors (rate limits, timeouts) are propagated unchanged so callers
+    such as the translation scheduler can decide whether to retry.
+    """
+    provider, settings = await get_llm_provider()
+    model_name = settings.model or "gpt-4o"
+
+    language_names = {
+        "en": "English",
+        "hr": "Croatian",
+        "de": "German",
+        "sl": "Slovenian",
+    }
+
+    target_names = [language_names.get(l, l) for l in target_langs]
+
+    system_msg = (
+        "You are a professional translator. Translate the given text accurately while maintaining the tone and meaning. "
+        f"Return translations as a JSON object with language codes as keys ({target_langs}). "
+        "Maintain any HTML formatting in the original text."
+    )
+
+    user_text = (
+        f"Translate from {language_names.get(source_lang, source_lang)} "
+        f"to {', '.join(target_names)}:\n\n{text}\n\nReturn ONLY valid JSON."
+    )
+
+    messages = [
+        {"role": "system", "content": system_msg},
+        {"role": "user", "content": user_text},
+    ]
+
+    completion = await chat_completion(
+        provider,
+        "ai/translate",
+        model_name,
+        messages,
+        temperature=0.2,
+        hints={"text": text, "target_langs": target_langs},
+    )
+
+    record_translation_usage("single", completion, fields=1)
+    response_text = completion.text
+
+    try:
+        clean_response = response_text.strip()
+        if clean_response.startswith("```"):
+            clean_response = clean_response.split("```")[1]
+            if clean_response.startswith("json"):
+                clean_response = clean_response[4:]
+        translations = json.loads(clean_response)
+    except json.JSONDecodeError:
+        translations = {"error": "Failed to parse translations", "raw": response_text}
+
+    return translations
+
+
+@api_router.post("/ai/translate", dependencies=[Depends(require_admin)])
+async def translate_content(request: AITranslateRequest):
+    """Translate content to multiple languages using AI (OpenAI)"""
+    try:
+        settings = await get_openai_settings()
+        model_name = settings.model or "gpt-4o"
+
+        async def translate() -> Dict[str, Any]:
+            if request.fresh:
+                translations = await translate_and_remember(
+                    request.text, request.source_lang, request.target_langs, model_name
+                )
+            else:
+                translations = await translate_text(request.text, request.source_lang, request.target_langs)
+            translations[request.source_lang] = request.text
+            return {"success": True, "translations": translations}
+
+        # Whitespace is significant for translations, so the text is keyed verbatim.
+        key = AIResultCache.make_key(
+            "translate",
+            text=request.text,
+            source_lang=request.source_lang,
+            target_langs=request.target_langs,
+            model=model_name,
+        )
+        return await ai_result_cache.run(
+            key, translate, fresh=request.fresh, cache_if=lambda result: "error" not in result["translations"]
+        )
 
     except HTTPException:
         raise
@@ -2153,23 +6611,553 @@ async def translate_content(request: AITranslateRequest):
         raise HTTPException(status_code=500, detail=f"Translation failed: {str(e)}")
 
 
-async def ensure_translations_async(field: dict, label: str) -> dict:
-    """Ensure field dict has hr/de/sl using AI translate endpoint. Expects source in 'en'."""
+# ==================== AI TRANSLATION MEMORY ====================
+
+# Since-startup lookup counters; one lookup is one (text, target language) pair
+translation_memory_stats: Dict[str, int] = {"exact_hits": 0, "normalized_hits": 0, "misses": 0}
+
+
+def normalize_whitespace(text: str) -> str:
+    return " ".join(text.split())
+
+
+def translation_memory_key(text: str, source_lang: str, target_lang: str, model: str) -> str:
+    return hashlib.sha256("\x1f".join([source_lang, target_lang, model, text]).encode()).hexdigest()
+
+
+async def lookup_translation_memory(
+    text: str, source_lang: str, target_langs: List[str], model: str
+) -> Dict[str, str]:
+    """Return stored translations of ``text`` for the given target languages.
+
+    Exact matches win over matches on whitespace-normalized source text.
+    """
+    if not target_langs:
+        return {}
+    normalized = normalize_whitespace(text)
+    exact_keys = {translation_memory_key(text, source_lang, lang, model): lang for lang in target_langs}
+    norm_keys = {translation_memory_key(normalized, source_lang, lang, model): lang for lang in target_langs}
+
+    docs = await db.translation_memory.find(
+        {"$or": [{"key": {"$in": list(exact_keys)}}, {"norm_key": {"$in": list(norm_keys)}}]},
+        {"_id": 0, "key": 1, "norm_key": 1, "translation": 1},
+    ).to_list(len(target_langs) * 4)
+
+    found: Dict[str, str] = {}
+    hit_keys: List[str] = []
+    for doc in docs:
+        lang = exact_keys.get(doc["key"])
+        if lang:
+            found[lang] = doc["translation"]
+            hit_keys.append(doc["key"])
+    exact_hits = len(found)
+    for doc in docs:
+        lang = norm_keys.get(doc.get("norm_key"))
+        if lang and lang not in found:
+            found[lang] = doc["translation"]
+            hit_keys.append(doc["key"])
+
+    translation_memory_stats["exact_hits"] += exact_hits
+    translation_memory_stats["normalized_hits"] += len(found) - exact_hits
+    translation_memory_stats["misses"] += len(target_langs) - len(found)
+
+    if hit_keys:
+        await db.translation_memory.update_many(
+            {"key": {"$in": hit_keys}},
+            {"$inc": {"hits": 1}, "$set": {"last_used_at": datetime.now(timezone.utc).isoformat()}},
+        )
+    return found
+
+
+async def store_translation_memory(
+    text: str, source_lang: str, translations: Dict[str, Any], model: str
+) -> None:
+    now = datetime.now(timezone.utc).isoformat()
+    normalized = normalize_whitespace(text)
+    ops = []
+    for lang, value in translations.items():
+        if not isinstance(value, str) or not value.strip():
+            continue
+        ops.append(UpdateOne(
+            {"key": translation_memory_key(text, source_lang, lang, model)},
+            {
+                "$set": {
+                    "norm_key": translation_memory_key(normalized, source_lang, lang, model),
+                    "source_text": text,
+                    "source_lang": source_lang,
+                    "target_lang": lang,
+                    "model": model,
+                    "translation": value,
+                    "last_used_at": now,
+                },
+                "$setOnInsert": {"created_at": now, "hits": 0},
+            },
+            upsert=True,
+        ))
+    if ops:
+        await db.translation_memory.bulk_write(ops, ordered=False)
+
+
+async def translate_text(
+    text: str,
+    source_lang: str,
+    target_langs: List[str],
+    scheduler: Optional["TranslationScheduler"] = None,
+) -> Dict[str, Any]:
+    """Translate ``text`` into ``target_langs``, asking the LLM only for languages
+    that are not already in translation memory."""
+    settings = await get_openai_settings()
+    model = settings.model or "gpt-4o"
+
+    translations: Dict[str, Any] = await lookup_translation_memory(text, source_lang, target_langs, model)
+    missing = [lang for lang in target_langs if lang not in translations]
+    if not missing:
+        return translations
+
+    fresh = await translate_and_remember(text, source_lang, missing, model, scheduler)
+    return {**fresh, **translations}
+
+
+async def translate_and_remember(
+    text: str,
+    source_lang: str,
+    target_langs: List[str],
+    model: str,
+    scheduler: Optional["TranslationScheduler"] = None,
+) -> Dict[str, Any]:
+    """Ask the LLM for ``target_langs`` (bypassing the memory lookup) and store the result."""
+    if scheduler is not None:
+        fresh = await scheduler.translate(text, source_lang, target_langs)
+    else:
+        fresh = await request_translations(text, source_lang, target_langs)
+    await store_translation_memory(text, source_lang, {lang: fresh.get(lang) for lang in target_langs}, model)
+    return fresh
+
+
+class TranslationMemoryStats(BaseModel):
+    entries: int
+    total_hits: int
+    exact_hits: int
+    normalized_hits: int
+    misses: int
+    hit_rate: float
+
+
+@api_router.get("/admin/ai/translation-memory", response_model=TranslationMemoryStats, dependencies=[Depends(require_admin)])
+async def get_translation_memory_stats():
+    """Translation memory size and hit rates (lookup counters are since server start)."""
+    entries = await db.translation_memory.count_documents({})
+    totals = await db.translation_memory.aggregate(
+        [{"$group": {"_id": None, "hits": {"$sum": "$hits"}}}]
+    ).to_list(1)
+    hits = translation_memory_stats["exact_hits"] + translation_memory_stats["normalized_hits"]
+    lookups = hits + translation_memory_stats["misses"]
+    return TranslationMemoryStats(
+        entries=entries,
+        total_hits=totals[0]["hits"] if totals else 0,
+        hit_rate=round(hits / lookups, 4) if lookups else 0.0,
+        **translation_memory_stats,
+    )
+
+
+@api_router.delete("/admin/ai/translation-memory", dependencies=[Depends(require_admin)])
+async def clear_translation_memory():
+    """Drop all stored translations so the next run asks the LLM again."""
+    result = await db.translation_memory.delete_many({})
+    return {"message": "Translation memory cleared", "deleted": result.deleted_count}
+
+
+# ==================== AI TRANSLATION SCHEDULER ====================
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token) used for rate budgeting."""
+    return max(1, len(text) // 4)
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """True for upstream 429 responses (our own HTTPExceptions are never retried)."""
+    if isinstance(exc, HTTPException):
+        return False
+    return getattr(exc, "status_code", None) == 429
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class TranslationScheduler:
+    """Runs AI translation calls concurrently within a concurrency limit and a
+    tokens-per-minute budget.
+
+    On a 429 the effective concurrency is halved and every caller pauses for the
+    ``Retry-After`` delay (or an exponential backoff); successful calls grow the
+    limit back by one slot at a time, up to ``max_concurrency``.
+    """
+
+    def __init__(self, max_concurrency: int = 4, tokens_per_minute: int = 30000, max_retries: int = 5):
+        self.max_concurrency = max(1, max_concurrency)
+        self.tokens_per_minute = tokens_per_minute
+        self.max_retries = max_retries
+        self._limit = self.max_concurrency
+        self._in_flight = 0
+        self._successes = 0
+        self._resume_at = 0.0
+        self._slots = asyncio.Condition()
+        self._budget_lock = asyncio.Lock()
+        self._window: deque = deque()  # (monotonic timestamp, tokens)
+        self._window_tokens = 0
+
+    @property
+    def concurrency_limit(self) -> int:
+        return self._limit
+
+    async def _reserve_tokens(self, tokens: int) -> None:
+        if self.tokens_per_minute <= 0:
+            return
+        tokens = min(tokens, self.tokens_per_minute)
+        async with self._budget_lock:
+            while True:
+                now = time.monotonic()
+                while self._window and now - self._window[0][0] >= 60:
+                    self._window_tokens -= self._window.popleft()[1]
+                if self._window_tokens + tokens <= self.tokens_per_minute:
+                    self._window.append((now, tokens))
+                    self._window_tokens += tokens
+                    return
+                await asyncio.sleep(60 - (now - self._window[0][0]))
+
+    async def _acquire_slot(self) -> None:
+        async with self._slots:
+            await self._slots.wait_for(lambda: self._in_flight < self._limit)
+            self._in_flight += 1
+
+    async def _release_slot(self, rate_limited: bool) -> None:
+        async with self._slots:
+            self._in_flight -= 1
+            if rate_limited:
+                self._limit = max(1, self._limit // 2)
+                self._successes = 0
+            else:
+                self._successes += 1
+                if self._limit < self.max_concurrency and self._successes >= self._limit:
+                    self._limit += 1
+                    self._successes = 0
+            self._slots.notify_all()
+
+    async def _wait_until_resumed(self) -> None:
+        delay = self._resume_at - time.monotonic()
+        while delay > 0:
+            await asyncio.sleep(delay)
+            delay = self._resume_at - time.monotonic()
+
+    async def submit(self, call: Callable[[], Awaitable[T]], tokens: int) -> T:
+        """Run ``call`` once a concurrency slot and ``tokens`` of budget are available."""
+        attempt = 0
+        while True:
+            await self._wait_until_resumed()
+            await self._reserve_tokens(tokens)
+            await self._acquire_slot()
+            rate_limited = False
+            retry_token = llm_retry_attempt.set(attempt)
+            try:
+                return await call()
+            except Exception as exc:
+                if not is_rate_limit_error(exc) or attempt >= self.max_retries:
+                    raise
+                rate_limited = True
+                delay = retry_after_seconds(exc) or min(60.0, 2.0 ** attempt) + random.uniform(0, 1)
+                self._resume_at = max(self._resume_at, time.monotonic() + delay)
+                logger.warning("AI rate limited, retrying in %.1fs (attempt %s)", delay, attempt + 1)
+            finally:
+                llm_retry_attempt.reset(retry_token)
+                await self._release_slot(rate_limited)
+            attempt += 1
+
+    async def translate(self, text: str, source_lang: str, target_langs: List[str]) -> Dict[str, Any]:
+        # Prompt + source text, plus roughly one output copy per target language
+        tokens = 200 + estimate_tokens(text) * (1 + len(target_langs))
+        return await self.submit(lambda: request_translations(text, source_lang, target_langs), tokens)
+
+
+translation_scheduler = TranslationScheduler(
+    max_concurrency=int(os.environ.get("AI_TRANSLATE_CONCURRENCY", "4")),
+    tokens_per_minute=int(os.environ.get("AI_TRANSLATE_TOKENS_PER_MINUTE", "30000")),
+    max_retries=int(os.environ.get("AI_TRANSLATE_MAX_RETRIES", "5")),
+)
+
+
+# ==================== AI BATCH TRANSLATION ====================
+
+# Requests and token usage of single vs. packed translation calls (since server start)
+translation_request_stats: Dict[str, int] = {
+    "single_requests": 0,
+    "single_fields": 0,
+    "single_prompt_tokens": 0,
+    "single_completion_tokens": 0,
+    "batch_requests": 0,
+    "batch_fields": 0,
+    "batch_prompt_tokens": 0,
+    "batch_completion_tokens": 0,
+    "batch_fallback_fields": 0,
+}
+
+TRANSLATION_BATCH_TOKENS = int(os.environ.get("AI_TRANSLATE_BATCH_TOKENS", "2000"))
+TRANSLATION_BATCH_MAX_ITEMS = int(os.environ.get("AI_TRANSLATE_BATCH_MAX_ITEMS", "40"))
+
+
+def record_translation_usage(kind: str, completion: LLMResult, fields: int) -> None:
+    translation_request_stats[f"{kind}_requests"] += 1
+    translation_request_stats[f"{kind}_fields"] += fields
+    translation_request_stats[f"{kind}_prompt_tokens"] += completion.prompt_tokens
+    translation_request_stats[f"{kind}_completion_tokens"] += completion.completion_tokens
+
+
+def pack_translation_batches(
+    items: List[Tuple[str, str]], max_tokens: int, max_items: int
+) -> List[List[Tuple[str, str]]]:
+    """Greedily group (id, text) pairs into batches of at most ``max_tokens`` source tokens.
+
+    A text larger than the budget still gets a batch of its own.
+    """
+    batches: List[List[Tuple[str, str]]] = []
+    current: List[Tuple[str, str]] = []
+    current_tokens = 0
+    for item_id, text in items:
+        tokens = estimate_tokens(text)
+        if current and (current_tokens + tokens > max_tokens or len(current) >= max_items):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append((item_id, text))
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+async def request_batch_translations(
+    items: List[Tuple[str, str]], source_lang: str, target_langs: List[str]
+) -> Dict[str, Any]:
+    """Translate several texts in one OpenAI request.
+
+    Returns the parsed ``{item id: {lang: text}}`` object as sent by the model,
+    or ``{}`` when the response is not valid JSON; callers validate each item.
+    """
+    provider, settings = await get_llm_provider()
+    model_name = settings.model or "gpt-4o"
+
+    system_msg = (
+        "You are a professional translator. You receive a JSON object with an \"items\" array; "
+        "every item has an \"id\" and a \"text\". "
+        f"Translate every text from {source_lang} to each of {target_langs} accurately while maintaining "
+        "the tone and meaning. Maintain any HTML formatting in the original text. "
+        "Return ONLY a JSON object that maps every item id to an object with language codes as keys."
+    )
+    payload = json.dumps({"items": [{"id": item_id, "text": text} for item_id, text in items]}, ensure_ascii=False)
+
+    completion = await chat_completion(
+        provider,
+        "ai/translate-batch",
+        model_name,
+        [
+            {"role": "system", "content": system_msg},
+            {"role": "user", "content": payload},
+        ],
+        temperature=0.2,
+        hints={"items": items, "target_langs": target_langs},
+    )
+    record_translation_usage("batch", completion, fields=len(items))
+    response_text = completion.text
+
+    try:
+        clean_response = response_text.strip()
+        if clean_response.startswith("```"):
+            clean_response = clean_response.split("```")[1]
+            if clean_response.startswith("json"):
+                clean_response = clean_response[4:]
+        data = json.loads(clean_response)
+    except json.JSONDecodeError:
+        logger.warning("Batch translation response was not valid JSON (%s items)", len(items))
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def is_complete_translation(value: Any, target_langs: List[str]) -> bool:
+    return isinstance(value, dict) and all(
+        isinstance(value.get(lang), str) and value[lang].strip() for lang in target_langs
+    )
+
+
+async def translate_batch(
+    items: Dict[str, Tuple[str, List[str]]],
+    source_lang: str = "en",
+    scheduler: Optional[TranslationScheduler] = None,
+) -> Dict[str, Any]:
+    """Translate many texts with as few LLM requests as the batch token budget allows.
+
+    ``items`` maps a stable id to (source text, target languages). Translation
+    memory is consulted first; the remaining texts are grouped by target
+    languages and packed into batched requests. Items missing from a batched
+    response, or malformed in it, are retried one by one; a batch that is
+    still rate limited after the scheduler's retries fails as a whole. Returns
+    id -> translations dict, or id -> exception for items that could not be
+    translated.
+    """
+    settings = await get_openai_settings()
+    model = settings.model or "gpt-4o"
+
+    remembered = await asyncio.gather(
+        *(lookup_translation_memory(text, source_lang, langs, model) for text, langs in items.values())
+    )
+    results: Dict[str, Any] = {}
+    groups: Dict[Tuple[str, ...], List[Tuple[str, str]]] = {}
+    for (item_id, (text, langs)), found in zip(items.items(), remembered):
+        results[item_id] = found
+        missing = tuple(lang for lang in langs if lang not in found)
+        if missing:
+            groups.setdefault(missing, []).append((item_id, text))
+
+    async def translate_one(item_id: str, text: str, langs: List[str]) -> None:
+        try:
+            fresh = await translate_and_remember(text, source_lang, langs, model, scheduler)
+        except HTTPException:
+            raise
+        except Exception as exc:
+            results[item_id] = exc
+            return
+        # An unparsable reply comes back as {"error", "raw"}, not as an exception
+        if not is_complete_translation(fresh, langs):
+            error = fresh.get("error") if isinstance(fresh, dict) else None
+            results[item_id] = ValueError(error or f"Incomplete translation for {', '.join(langs)}")
+            return
+        results[item_id].update({lang: fresh[lang] for lang in langs})
+
+    async def translate_packed(batch: List[Tuple[str, str]], langs: List[str]) -> None:
+        if len(batch) == 1:
+            await translate_one(batch[0][0], batch[0][1], langs)
+            return
+
+        async def call() -> Dict[str, Any]:
+            return await request_batch_translations(batch, source_lang, langs)
+
+        try:
+            if scheduler is not None:
+                tokens = 300 + sum(estimate_tokens(text) for _, text in batch) * (1 + len(langs))
+                response = await scheduler.submit(call, tokens)
+            else:
+                response = await call()
+        except HTTPException:
+            raise
+        except Exception as exc:
+            if is_rate_limit_error(exc):
+                # Still rate limited after the scheduler's retries: one request
+                # per item would only make it worse, so the batch fails as a whole
+                logger.error("Batch translation still rate limited, failing %s items", len(batch))
+                for item_id, _ in batch:
+                    results[item_id] = exc
+                return
+            logger.exception("Batch translation request failed, retrying %s items individually", len(batch))
+            response = {}
+
+        retry: List[Tuple[str, str]] = []
+        stores = []
+        for item_id, text in batch:
+            value = response.get(item_id)
+            if is_complete_translation(value, langs):
+                fresh = {lang: value[lang] for lang in langs}
+                results[item_id].update(fresh)
+                stores.append(store_translation_memory(text, source_lang, fresh, model))
+            else:
+                retry.append((item_id, text))
+        translation_request_stats["batch_fallback_fields"] += len(retry)
+        await asyncio.gather(*stores, *(translate_one(item_id, text, langs) for item_id, text in retry))
+
+    await asyncio.gather(*(
+        translate_packed(batch, list(langs))
+        for langs, group in groups.items()
+        for batch in pack_translation_batches(group, TRANSLATION_BATCH_TOKENS, TRANSLATION_BATCH_MAX_ITEMS)
+    ))
+    return results
+
+
+@api_router.get("/admin/ai/translation-batching", dependencies=[Depends(require_admin)])
+async def get_translation_batching_stats():
+    """Measured request and token usage of packed vs. single translation calls since server start."""
+    stats = dict(translation_request_stats)
+
+    def per_field(kind: str) -> Optional[float]:
+        fields = stats[f"{kind}_fields"]
+        if not fields:
+            return None
+        return round((stats[f"{kind}_prompt_tokens"] + stats[f"{kind}_completion_tokens"]) / fields, 1)
+
+    stats["requests_saved"] = stats["batch_fields"] - stats["batch_requests"]
+    stats["single_tokens_per_field"] = per_field("single")
+    stats["batch_tokens_per_field"] = per_field("batch")
+    return stats
+
+
+TRANSLATION_TARGET_LANGS = ["hr", "de", "sl"]
+
+
+def source_fingerprint(text: str) -> str:
+    """Fingerprint of the source text a translation was produced from."""
+    return hashlib.sha256(normalize_whitespace(text).encode()).hexdigest()[:16]
+
+
+def pending_languages(field: Any, recorded: Dict[str, str]) -> Tuple[List[str], List[str]]:
+    """Split target languages of a translatable field into (missing, stale).
+
+    A translation is stale when the fingerprint recorded at translation time no
+    longer matches the current English source. Translations without a recorded
+    fingerprint (hand-written or pre-dating fingerprints) are never stale.
+    """
+    if not isinstance(field, dict):
+        return [], []
+    base = (field.get("en") or "").strip()
+    if not base:
+        return [], []
+    fingerprint = source_fingerprint(base)
+    missing = [lang for lang in TRANSLATION_TARGET_LANGS if not field.get(lang)]
+    stale = [
+        lang for lang in TRANSLATION_TARGET_LANGS
+        if field.get(lang) and recorded.get(lang) not in (None, fingerprint)
+    ]
+    return missing, stale
+
+
+async def ensure_translations_async(
+    field: dict,
+    label: str,
+    scheduler: Optional[TranslationScheduler] = None,
+    refresh: Optional[List[str]] = None,
+) -> dict:
+    """Ensure field dict has hr/de/sl using translation memory and the scheduler. Expects source in 'en'.
+
+    Languages listed in ``refresh`` are retranslated even if they already have text.
+    """
     if not isinstance(field, dict):
         return field
 
-    base = field.get("en", "").strip()
+    base = (field.get("en") or "").strip()
     if not base:
         return field
 
-    missing = [lang for lang in ["hr", "de", "sl"] if not field.get(lang)]
+    missing = [lang for lang in TRANSLATION_TARGET_LANGS if not field.get(lang) or lang in (refresh or [])]
     if not missing:
         return field
 
-    # Use existing translate_content logic
-    req = AITranslateRequest(text=base, source_lang="en", target_langs=missing)
-    resp = await translate_content(req)
-    translations = resp.get("translations", {})
+    results = await translate_batch({label: (base, missing)}, "en", scheduler or translation_scheduler)
+    translations = results[label]
+    if isinstance(translations, BaseException):
+        raise translations
     updated = dict(field)
     for lang in missing:
         value = translations.get(lang)
@@ -2178,87 +7166,252 @@ async def ensure_translations_async(field: dict, label: str) -> dict:
     return updated
 
 
-@api_router.post("/admin/ai/translate-all")
-async def admin_translate_all_content():
-    """Translate all pages and blog posts from EN to HR/DE/SL using AI.
-    Skips fields that already have translations."""
+def page_translatable_fields(page: dict) -> List[Tuple[str, dict, str]]:
+    """(field path, container, key) for every translatable field of a page."""
+    fields = [("title", page, "title"), ("meta_description", page, "meta_description")]
+    for index, section in enumerate(page.get("sections", [])):
+        content = section.get("content", {})
+        section_id = section.get("id") or str(index)
+        for key, value in list(content.items()):
+            if isinstance(value, dict) and "en" in value:
+                fields.append((f"sections:{section_id}:{key}", content, key))
+    return fields
+
+
+def blog_translatable_fields(post: dict) -> List[Tuple[str, dict, str]]:
+    return [(field, post, field) for field in ("title", "excerpt", "content")]
+
+
+async def translate_document_fields(
+    doc: dict,
+    fields: List[Tuple[str, dict, str]],
+    label: str,
+    scheduler: TranslationScheduler,
+    include_stale: bool = False,
+) -> Tuple[bool, int]:
+    """Translate the missing (and optionally stale) languages of ``fields`` in packed requests.
+
+    Containers are updated in place and ``doc["translation_sources"]`` records the
+    source fingerprint of every translation produced. Existing translations
+    without a fingerprint are adopted as up to date. Returns (changed,
+    failed_fields); a failing field is logged and left as it was so the rest of
+    the document still lands.
+    """
+    recorded_sources = doc.get("translation_sources") or {}
+    sources: Dict[str, Dict[str, str]] = {}
+    jobs = []
+    for path, container, key in fields:
+        field = container.get(key)
+        recorded = dict(recorded_sources.get(path) or {})
+        missing, stale = pending_languages(field, recorded)
+        if isinstance(field, dict) and (field.get("en") or "").strip():
+            fingerprint = source_fingerprint(field["en"].strip())
+            for lang in TRANSLATION_TARGET_LANGS:
+                if field.get(lang) and lang not in recorded:
+                    recorded[lang] = fingerprint
+        if recorded:
+            sources[path] = recorded
+        refresh = stale if include_stale else []
+        if missing or refresh:
+            jobs.append((path, container, key, missing + refresh))
+
+    results = await translate_batch(
+        {path: (container[key]["en"].strip(), langs) for path, container, key, langs in jobs}, "en", scheduler
+    )
+    content_changed = False
+    failed = 0
+    for path, container, key, langs in jobs:
+        translations = results[path]
+        if isinstance(translations, BaseException):
+            logger.error(f"Translation failed for {label} {path}: {translations}")
+            failed += 1
+            continue
+        previous = container[key]
+        updated = dict(previous)
+        fingerprint = source_fingerprint(previous["en"].strip())
+        for lang in langs:
+            value = translations.get(lang)
+            if isinstance(value, str) and value.strip():
+                updated[lang] = value
+                sources.setdefault(path, {})[lang] = fingerprint
+        if updated != previous:
+            container[key] = updated
+            content_changed = True
+    doc["translation_sources"] = sources
+    return content_changed or sources != recorded_sources, failed
+
+
+TRANSLATION_SAVE_ATTEMPTS = 3
+
+
+async def translate_and_save_document(
+    collection,
+    doc: dict,
+    fields_of: Callable[[dict], List[Tuple[str, dict, str]]],
+    saved_fields: Tuple[str, ...],
+    label: str,
+    scheduler: TranslationScheduler,
+    include_stale: bool = False,
+) -> Tuple[bool, int]:
+    """Translate one document and write it back as soon as it is done.
+
+    The write only applies while ``updated_at`` still holds the value that was
+    read, like ``apply_patch``, so an admin edit made while the job runs is
+    never overwritten: the document is re-read and translated again instead
+    (unchanged fields come out of the translation memory).
+    """
+    for _ in range(TRANSLATION_SAVE_ATTEMPTS):
+        changed, failed = await translate_document_fields(doc, fields_of(doc), label, scheduler, include_stale)
+        if not changed:
+            return changed, failed
+        update = {field: doc.get(field) for field in saved_fields if field in doc}
+        update["translation_sources"] = doc["translation_sources"]
+        update["updated_at"] = datetime.now(timezone.utc).isoformat()
+        result = await collection.update_one({"id": doc["id"], "updated_at": doc.get("updated_at")}, {"$set": update})
+        if result.matched_count:
+            return changed, failed
+        doc = await collection.find_one({"id": doc["id"]}, {"_id": 0})
+        if doc is None:
+            return False, failed
+    logger.warning(f"Gave up saving translations for {label}: it kept changing while being translated")
+    return False, failed
+
+
+async def translate_page_document(
+    page: dict, scheduler: TranslationScheduler, include_stale: bool = False
+) -> Tuple[bool, int]:
+    return await translate_and_save_document(
+        db.pages, page, page_translatable_fields, ("title", "meta_description", "sections"),
+        f"page:{page.get('slug')}", scheduler, include_stale,
+    )
+
+
+async def translate_blog_document(
+    post: dict, scheduler: TranslationScheduler, include_stale: bool = False
+) -> Tuple[bool, int]:
+    return await translate_and_save_document(
+        db.blog_posts, post, blog_translatable_fields, ("title", "excerpt", "content"),
+        f"blog:{post.get('slug')}", scheduler, include_stale,
+    )
+
+
+async def translate_site_content(include_stale: bool, ctx: Optional[JobContext] = None) -> Dict[str, Any]:
+    """Translate every page and blog post in parallel; see translate-all / translate-dirty."""
+    settings = await get_openai_settings()
+    if not llm_configured(settings):
+        raise HTTPException(status_code=500, detail="OpenAI API key not configured in admin settings")
+
     pages = await db.pages.find({}, {"_id": 0}).to_list(1000)
     blog_posts = await db.blog_posts.find({}, {"_id": 0}).to_list(1000)
 
-    pages_updated = 0
-    posts_updated = 0
+    total = len(pages) + len(blog_posts)
+    done = 0
+
+    async def tracked(document: Awaitable[Tuple[bool, int]]) -> Tuple[bool, int]:
+        nonlocal done
+        outcome = await document
+        done += 1
+        if ctx:
+            await ctx.progress(done, total, "documents translated")
+        return outcome
+
+    page_results, post_results = await asyncio.gather(
+        asyncio.gather(*(
+            tracked(translate_page_document(page, translation_scheduler, include_stale)) for page in pages
+        )),
+        asyncio.gather(*(
+            tracked(translate_blog_document(post, translation_scheduler, include_stale)) for post in blog_posts
+        )),
+    )
 
-    # Translate pages
-    for page in pages:
-        changed = False
-
-        title = page.get("title", {})
-        new_title = await ensure_translations_async(title, f"page:{page.get('slug')} title")
-        if new_title != title:
-            page["title"] = new_title
-            changed = True
-
-        meta = page.get("meta_description", {})
-        new_meta = await ensure_translations_async(meta, f"page:{page.get('slug')} meta_description")
-        if new_meta != meta:
-            page["meta_description"] = new_meta
-            changed = True
-
-        sections = page.get("sections", [])
-        for section in sections:
-            content = section.get("content", {})
-            for key, value in list(content.items()):
-                if isinstance(value, dict) and "en" in value:
-                    new_val = await ensure_translations_async(value, f"page:{page.get('slug')} section:{section.get('section_type')}:{key}")
-                    if new_val != value:
-                        content[key] = new_val
-                        changed = True
-
-        if changed:
-            await db.pages.update_one(
-                {"id": page["id"]},
-                {"$set": {
-                    "title": page.get("title", {}),
-                    "meta_description": page.get("meta_description", {}),
-                    "sections": page.get("sections", []),
-                }}
-            )
-            pages_updated += 1
-
-    # Translate blog posts
-    for post in blog_posts:
-        changed = False
-
-        title = post.get("title", {})
-        new_title = await ensure_translations_async(title, f"blog:{post.get('slug')} title")
-        if new_title != title:
-            post["title"] = new_title
-            changed = True
-
-        excerpt = post.get("excerpt", {})
-        new_excerpt = await ensure_translations_async(excerpt, f"blog:{post.get('slug')} excerpt")
-        if new_excerpt != excerpt:
-            post["excerpt"] = new_excerpt
-            changed = True
-
-        content = post.get("content", {})
-        new_content = await ensure_translations_async(content, f"blog:{post.get('slug')} content")
-        if new_content != content:
-            post["content"] = new_content
-            changed = True
-
-        if changed:
-            await db.blog_posts.update_one(
-                {"id": post["id"]},
-                {"$set": {
-                    "title": post.get("title", {}),
-                    "excerpt": post.get("excerpt", {}),
-                    "content": post.get("content", {}),
-                }}
-            )
-            posts_updated += 1
+    return {
+        "success": True,
+        "pages_updated": sum(1 for changed, _ in page_results if changed),
+        "posts_updated": sum(1 for changed, _ in post_results if changed),
+        "fields_failed": sum(failed for _, failed in page_results + post_results),
+    }
+
+
+@job_handler("translate_all")
+async def translate_all_job(ctx: JobContext) -> Dict[str, Any]:
+    return await translate_site_content(include_stale=False, ctx=ctx)
+
+
+@job_handler("translate_dirty")
+async def translate_dirty_job(ctx: JobContext) -> Dict[str, Any]:
+    return await translate_site_content(include_stale=True, ctx=ctx)
+
+
+@api_router.post("/admin/ai/translate-all", response_model=Job, status_code=202, dependencies=[Depends(require_admin)])
+async def admin_translate_all_content():
+    """Queue translation of all pages and blog posts from EN to HR/DE/SL using AI.
+    Skips fields that already have translations.
 
-    return {"success": True, "pages_updated": pages_updated, "posts_updated": posts_updated}
+    Documents are processed in parallel and each one is saved as soon as its
+    fields are done; the scheduler bounds concurrency and token throughput.
+    """
+    settings = await get_openai_settings()
+    if not llm_configured(settings):
+        raise HTTPException(status_code=500, detail="OpenAI API key not configured in admin settings")
+    return await enqueue_job("translate_all")
+
+
+def dirty_translation_report(kind: str, doc: dict, fields: List[Tuple[str, dict, str]]) -> Optional[Dict[str, Any]]:
+    recorded_sources = doc.get("translation_sources") or {}
+    pending = []
+    for path, container, key in fields:
+        field = container.get(key)
+        missing, stale = pending_languages(field, recorded_sources.get(path) or {})
+        if missing or stale:
+            pending.append({
+                "field": path,
+                "missing": missing,
+                "stale": stale,
+                "estimated_tokens": 200 + estimate_tokens(field["en"]) * (1 + len(missing) + len(stale)),
+            })
+    if not pending:
+        return None
+    return {"type": kind, "id": doc.get("id"), "slug": doc.get("slug"), "fields": pending}
+
+
+@api_router.post("/admin/ai/translate-dirty", dependencies=[Depends(require_admin)])
+async def admin_translate_dirty_content(dry_run: bool = False):
+    """Retranslate only fields whose English source changed since they were
+    translated (plus fields with missing languages), as a background job.
+
+    With ``dry_run=true`` nothing is translated; the response lists the pending
+    fields per document with an upper-bound token estimate (translation memory
+    hits are not counted).
+    """
+    if not dry_run:
+        settings = await get_openai_settings()
+        if not llm_configured(settings):
+            raise HTTPException(status_code=500, detail="OpenAI API key not configured in admin settings")
+        job = await enqueue_job("translate_dirty")
+        deserialize_datetime(job, ["created_at", "started_at", "finished_at"])
+        return JSONResponse(status_code=202, content=jsonable_encoder(Job(**job)))
+
+    pages = await db.pages.find({}, {"_id": 0}).to_list(1000)
+    blog_posts = await db.blog_posts.find({}, {"_id": 0}).to_list(1000)
+
+    documents = [
+        report for report in (
+            [dirty_translation_report("page", page, page_translatable_fields(page)) for page in pages]
+            + [dirty_translation_report("blog_post", post, blog_translatable_fields(post)) for post in blog_posts]
+        )
+        if report
+    ]
+    fields = [field for report in documents for field in report["fields"]]
+    return {
+        "success": True,
+        "dry_run": True,
+        "documents": len(documents),
+        "fields": len(fields),
+        "missing_translations": sum(len(f["missing"]) for f in fields),
+        "stale_translations": sum(len(f["stale"]) for f in fields),
+        "estimated_tokens": sum(f["estimated_tokens"] for f in fields),
+        "details": documents,
+    }
 
 
 class MediaImportResult(BaseModel):
@@ -2267,8 +7420,19 @@ class MediaImportResult(BaseModel):
     failed: int
 
 
-@api_router.post("/admin/media/import-all", response_model=MediaImportResult)
+@api_router.post("/admin/media/import-all", response_model=Job, status_code=202, dependencies=[Depends(require_admin)])
 async def admin_import_all_media():
+    """Queue an import of all images referenced in pages and blog posts (see import_all_media)"""
+    return await enqueue_job("media_import")
+
+
+@job_handler("media_import")
+async def media_import_job(ctx: JobContext) -> Dict[str, Any]:
+    result = await import_all_media(ctx)
+    return result.model_dump()
+
+
+async def import_all_media(ctx: Optional[JobContext] = None) -> MediaImportResult:
     """Import all images referenced in pages and blog posts from the remote marketing CMS.
 
     - Looks for fields named 'image_url' in page sections
@@ -2278,6 +7442,7 @@ async def admin_import_all_media():
     import aiohttp
 
     SOURCE_BASE = "https://hotelier-hub-3.preview.emergentagent.com"
+    MEDIA_ROOT.mkdir(exist_ok=True)
 
     async def download_image_if_needed(session: aiohttp.ClientSession, url: str) -> bool:
         if not url or not isinstance(url, str):
@@ -2292,16 +7457,18 @@ async def admin_import_all_media():
 
         full_url = f"{SOURCE_BASE}{url}"
         try:
-            async with session.get(full_url) as resp:
-                if resp.status != 200:
-                    logging.warning("Failed to download %s (status %s)", full_url, resp.status)
-                    return False
-                with dest_path.open("wb") as f:
-                    while True:
-                        chunk = await resp.content.read(8192)
-                        if not chunk:
-                            break
-                        f.write(chunk)
+            with track_outbound("media_import", "download") as call:
+                async with session.get(full_url) as resp:
+                    if resp.status != 200:
+                        call.failed(f"http_{resp.status}")
+                        logging.warning("Failed to download %s (status %s)", full_url, resp.status)
+                        return False
+                    with dest_path.open("wb") as f:
+                        while True:
+                            chunk = await resp.content.read(8192)
+                            if not chunk:
+                                break
+                            f.write(chunk)
             return True
         except Exception as exc:
             logging.exception("Error downloading %s", full_url)
@@ -2325,10 +7492,11 @@ async def admin_import_all_media():
 
     imported = 0
     failed = 0
+    total = len(pages) + len(posts)
 
     async with aiohttp.ClientSession() as session:
         # Page images
-        for page in pages:
+        for index, page in enumerate(pages):
             sections = page.get("sections", [])
             for img_url in set(collect_image_urls(sections)):
                 before = imported
@@ -2337,18 +7505,21 @@ async def admin_import_all_media():
                     imported += 1
                 elif before == imported and img_url.startswith("/api/uploads/"):
                     failed += 1
+            if ctx:
+                await ctx.progress(index + 1, total, "documents scanned")
 
         # Blog featured images
-        for post in posts:
+        for index, post in enumerate(posts):
             featured = post.get("featured_image") or ""
-            if not featured:  # Skip empty or None featured images
-                continue
-            before = imported
-            ok = await download_image_if_needed(session, featured)
-            if ok:
-                imported += 1
-            elif before == imported and featured.startswith("/api/uploads/"):
-                failed += 1
+            if featured:  # Skip empty or None featured images
+                before = imported
+                ok = await download_image_if_needed(session, featured)
+                if ok:
+                    imported += 1
+                elif before == imported and featured.startswith("/api/uploads/"):
+                    failed += 1
+            if ctx:
+                await ctx.progress(len(pages) + index + 1, total, "documents scanned")
 
     return MediaImportResult(success=True, imported=imported, failed=failed)
 
@@ -2359,17 +7530,18 @@ class BlogTranslateRequest(BaseModel):
     target_langs: List[str] = ["hr", "de", "sl"]
 
 
-@api_router.post("/ai/translate-blog-post")
+@api_router.post("/ai/translate-blog-post", dependencies=[Depends(require_admin)])
 async def translate_blog_post(request: BlogTranslateRequest):
     """Translate a single blog post's title/excerpt/content to target languages and save it."""
     # Find blog post
-    post = await db.blog_posts.find_one({"id": request.post_id}, {"_id": 0})
+    post = await db.blog_posts.find_one({"id": request.post_id}, {"_id": 0, "translation_sources": 0})
     if not post:
         raise HTTPException(status_code=404, detail="Blog post not found")
 
-    # For each translatable field, call existing translate endpoint if needed
+    # Collect every field with missing languages and translate them in one packed request
     translatable_fields = ["title", "excerpt", "content"]
     updated_fields = {}
+    items: Dict[str, Tuple[str, List[str]]] = {}
 
     for field in translatable_fields:
         field_value = post.get(field)
@@ -2384,20 +7556,27 @@ async def translate_blog_post(request: BlogTranslateRequest):
         if not missing:
             continue
 
+        items[field] = (base_text, missing)
+
+    if items:
         try:
-            # Reuse AI translate logic via internal call
-            response = await translate_content(AITranslateRequest(
-                text=base_text,
-                source_lang=request.source_lang,
-                target_langs=missing,
-            ))
-            translations = response.get("translations", {})
+            results = await translate_batch(items, request.source_lang)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Translation failed: {str(e)}")
+
+        for field, (base_text, missing) in items.items():
+            translations = results[field]
+            if isinstance(translations, BaseException):
+                raise HTTPException(status_code=500, detail=f"Translation failed for field {field}: {str(translations)}")
+            field_value = post[field]
             for lang in missing:
                 if translations.get(lang):
                     field_value[lang] = translations[lang]
+                    if request.source_lang == "en":
+                        updated_fields[f"translation_sources.{field}.{lang}"] = source_fingerprint(base_text.strip())
             updated_fields[field] = field_value
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Translation failed for field {field}: {str(e)}")
 
     if not updated_fields:
         return {"success": True, "blog_post": post, "message": "No missing translations"}
@@ -2405,93 +7584,289 @@ async def translate_blog_post(request: BlogTranslateRequest):
     updated_fields["updated_at"] = datetime.now(timezone.utc).isoformat()
 
     await db.blog_posts.update_one({"id": request.post_id}, {"$set": updated_fields})
-    updated_post = await db.blog_posts.find_one({"id": request.post_id}, {"_id": 0})
+    updated_post = await db.blog_posts.find_one({"id": request.post_id}, {"_id": 0, "translation_sources": 0})
     return {"success": True, "blog_post": updated_post}
 
-@api_router.post("/ai/generate-blog")
-async def generate_blog_post(topic: str = Body(..., embed=True)):
-    """Generate a complete blog post with AI"""
-    try:
-        from emergentintegrations.llm.chat import LlmChat, UserMessage
-        
-        api_key = os.environ.get('EMERGENT_LLM_KEY')
-        if not api_key:
-            raise HTTPException(status_code=500, detail="AI API key not configured")
-        
-        system_msg = """You are a blog writer for SyncBeds vacation rental software.
+BLOG_GENERATION_SYSTEM_MSG = """You are a blog writer for SyncBeds vacation rental software.
 Write a short blog post (200 words max per language).
 Return ONLY valid JSON:
 {"title":{"en":"...","hr":"...","de":"...","sl":"..."},"excerpt":{"en":"...","hr":"...","de":"...","sl":"..."},"content":{"en":"<p>...</p>","hr":"<p>...</p>","de":"<p>...</p>","sl":"<p>...</p>"},"tags":["tag1","tag2"]}"""
-        
-        chat = LlmChat(
-            api_key=api_key,
-            session_id=f"blog-{uuid.uuid4()}",
-            system_message=system_msg
-        ).with_model("openai", "gpt-4o-mini")
-        
-        user_message = UserMessage(text=f"Topic: {topic}")
-        
-        response = await chat.send_message(user_message)
-        
-        import json
+
+
+def parse_blog_response(response: str) -> Dict[str, Any]:
+    """Extract the blog JSON from a model response; raises JSONDecodeError."""
+    clean_response = response.strip()
+    if "```" in clean_response:
+        parts = clean_response.split("```")
+        for part in parts:
+            part = part.strip()
+            if part.startswith("json"):
+                part = part[4:].strip()
+            if part.startswith("{"):
+                clean_response = part
+                break
+    return json.loads(clean_response)
+
+
+async def save_generated_blog_post(topic: str, blog_data: Dict[str, Any]) -> Dict[str, Any]:
+    blog_post = {
+        "id": str(uuid.uuid4()),
+        "title": blog_data.get("title", {"en": topic}),
+        "slug": topic.lower().replace(" ", "-")[:50],
+        "excerpt": blog_data.get("excerpt", {}),
+        "content": blog_data.get("content", {}),
+        "featured_image": "",
+        "author": "SyncBeds Team",
+        "tags": blog_data.get("tags", []),
+        "status": "draft",
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "updated_at": datetime.now(timezone.utc).isoformat()
+    }
+
+    await db.blog_posts.insert_one(blog_post)
+    blog_post.pop('_id', None)
+    return blog_post
+
+
+async def request_blog_generation(topic: str) -> str:
+    completion = await chat_completion(
+        get_blog_llm_provider(),
+        "ai/generate-blog",
+        "gpt-4o-mini",
+        [
+            {"role": "system", "content": BLOG_GENERATION_SYSTEM_MSG},
+            {"role": "user", "content": f"Topic: {topic}"},
+        ],
+        hints={"topic": topic},
+    )
+    return completion.text
+
+
+@api_router.post("/ai/generate-blog", dependencies=[Depends(require_admin)])
+async def generate_blog_post(topic: str = Body(..., embed=True), fresh: bool = Body(False, embed=True)):
+    """Generate a complete blog post with AI.
+
+    Repeating a topic within the AI cache TTL returns the draft that was
+    already created (unless it has been deleted since) instead of paying for
+    (and saving) another one; pass ``fresh=true`` to generate a new draft
+    anyway.
+    """
+
+    async def draft_exists(result: Dict[str, Any]) -> bool:
+        return await db.blog_posts.count_documents({"id": result["blog_post"]["id"]}, limit=1) > 0
+
+    async def generate() -> Dict[str, Any]:
+        response = await request_blog_generation(topic)
+
         try:
-            clean_response = response.strip()
-            if "```" in clean_response:
-                parts = clean_response.split("```")
-                for part in parts:
-                    part = part.strip()
-                    if part.startswith("json"):
-                        part = part[4:].strip()
-                    if part.startswith("{"):
-                        clean_response = part
-                        break
-            
-            blog_data = json.loads(clean_response)
-            
-            blog_post = {
-                "id": str(uuid.uuid4()),
-                "title": blog_data.get("title", {"en": topic}),
-                "slug": topic.lower().replace(" ", "-")[:50],
-                "excerpt": blog_data.get("excerpt", {}),
-                "content": blog_data.get("content", {}),
-                "featured_image": "",
-                "author": "SyncBeds Team",
-                "tags": blog_data.get("tags", []),
-                "status": "draft",
-                "created_at": datetime.now(timezone.utc).isoformat(),
-                "updated_at": datetime.now(timezone.utc).isoformat()
-            }
-            
-            result = await db.blog_posts.insert_one(blog_post)
-            blog_post.pop('_id', None)
-            
+            blog_post = await save_generated_blog_post(topic, parse_blog_response(response))
             return {"success": True, "blog_post": blog_post}
-            
+
         except json.JSONDecodeError as e:
             logger.error(f"JSON error: {e}")
             return {"success": False, "error": str(e), "raw": response[:500]}
-        
+
+    try:
+        key = AIResultCache.make_key("generate-blog", topic=normalize_whitespace(topic), model="gpt-4o-mini")
+        return await ai_result_cache.run(
+            key, generate, fresh=fresh, cache_if=lambda result: result["success"], still_valid=draft_exists
+        )
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Blog generation error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@api_router.post("/ai/generate-blog-post")
-async def generate_blog_post_alias(topic: str = Body(..., embed=True)):
+@api_router.post("/ai/generate-blog/stream", dependencies=[Depends(require_admin)])
+async def generate_blog_post_stream(topic: str = Body(..., embed=True)):
+    """Streaming variant of /ai/generate-blog as server-sent events.
+
+    Streams through the pooled OpenAI client when it is configured in admin
+    settings; otherwise the Emergent LLM response (which cannot be streamed)
+    is sent as a single delta. Every title/excerpt language is emitted as a
+    ``field`` event once complete; the draft is saved when the stream ends and
+    returned in the ``done`` event.
+    """
+    settings = await get_openai_settings()
+    if llm_configured(settings):
+        provider, settings = await get_llm_provider()
+        model_name = settings.model or "gpt-4o-mini"
+    else:
+        provider = get_blog_llm_provider()
+        model_name = "gpt-4o-mini"
+    messages = [
+        {"role": "system", "content": BLOG_GENERATION_SYSTEM_MSG},
+        {"role": "user", "content": f"Topic: {topic}"},
+    ]
+    chunks = stream_chat_completion(
+        provider, "ai/generate-blog/stream", model_name, messages, 0.7, hints={"topic": topic}
+    )
+
+    async def events():
+        scanner = JSONStreamScanner()
+        parts: List[str] = []
+        try:
+            async for text in chunks:
+                parts.append(text)
+                yield sse_event("delta", {"text": text})
+                for path, value in scanner.feed(text):
+                    if STREAMED_FIELD_KEYS.intersection(path):
+                        yield sse_event("field", {"path": path, "value": value})
+            response = "".join(parts)
+            try:
+                blog_post = await save_generated_blog_post(topic, parse_blog_response(response))
+            except json.JSONDecodeError as e:
+                logger.error(f"JSON error: {e}")
+                yield sse_event("done", {"success": False, "error": str(e), "raw": response[:500]})
+                return
+            yield sse_event("done", {"success": True, "blog_post": blog_post})
+        except Exception as e:
+            logger.error(f"Blog generation stream error: {str(e)}")
+            yield sse_event("error", {"detail": str(e)})
+
+    return sse_response(events())
+
+
+@api_router.post("/ai/generate-blog-post", dependencies=[Depends(require_admin)])
+async def generate_blog_post_alias(topic: str = Body(..., embed=True), fresh: bool = Body(False, embed=True)):
     """Alias for generate_blog_post to keep backward compatibility"""
-    return await generate_blog_post(topic=topic)
+    return await generate_blog_post(topic=topic, fresh=fresh)
 
 
 # Include the router in the main app
-app.include_router(api_router)
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_credentials=True,
-    allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+class MetricsMiddleware:
+    """Count, time and track in-flight HTTP requests per route template.
+
+    Labels use the route path (``/api/pages/{page_id}``), never the raw URL,
+    so label cardinality stays bounded; unknown paths share "unmatched".
+    """
+
+    def __init__(self, app, routes: List[Any], max_cached_paths: int = 4096):
+        self.app = app
+        self.routes = routes
+        self.max_cached_paths = max_cached_paths
+        self._routes: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+
+    def route_template(self, scope) -> str:
+        key = (scope["method"], scope["path"])
+        template = self._routes.get(key)
+        if template is not None:
+            self._routes.move_to_end(key)
+            return template
+        template = "unmatched"
+        for route in self.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                template = getattr(route, "path", "unmatched")
+                break
+            if match == Match.PARTIAL and template == "unmatched":
+                # Path matches but the method does not (405)
+                template = getattr(route, "path", "unmatched")
+        self._routes[key] = template
+        if len(self._routes) > self.max_cached_paths:
+            self._routes.popitem(last=False)
+        return template
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        route = self.route_template(scope)
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight = HTTP_IN_FLIGHT.labels(method, route)
+        in_flight.inc()
+        route_token = request_route.set(f"{method} {route}")
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            request_route.reset(route_token)
+            in_flight.dec()
+            HTTP_REQUEST_DURATION.labels(method, route).observe(time.perf_counter() - started)
+            HTTP_REQUESTS.labels(method, route, str(status)).inc()
+
+
+class TracingMiddleware:
+    """Root span per sampled request plus ``traceparent`` / ``X-Trace-Id``
+    response headers. Runs inside MetricsMiddleware, which resolves the route."""
+
+    def __init__(self, app):
+        self.app = app
+
+    @staticmethod
+    def parse_traceparent(scope) -> Tuple[Optional[str], Optional[str]]:
+        for name, value in scope["headers"]:
+            if name == b"traceparent":
+                parts = value.decode("latin-1").strip().split("-")
+                if len(parts) == 4 and len(parts[1]) == 32 and len(parts[2]) == 16 and parts[1] != "0" * 32:
+                    return parts[1].lower(), parts[2].lower()
+                break
+        return None, None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        trace_id, parent_id = self.parse_traceparent(scope)
+        trace_id = trace_id or secrets.token_hex(16)
+        span: Optional[Span] = None
+        if TRACE_SAMPLE_RATE > 0 and random.random() < TRACE_SAMPLE_RATE:
+            method = scope["method"]
+            route = request_route.get() or f"{method} unmatched"
+            span = Trace(trace_id, route, "server", parent_id, {
+                "http.method": method,
+                "http.route": route.split(" ", 1)[-1],
+                "http.target": scope["path"],
+            }).root
+        span_id = span.span_id if span is not None else secrets.token_hex(8)
+        headers = [
+            (b"traceparent", f"00-{trace_id}-{span_id}-{'01' if span is not None else '00'}".encode("latin-1")),
+            (b"x-trace-id", trace_id.encode("latin-1")),
+        ]
+
+        async def send_with_trace_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + headers
+                if span is not None:
+                    span.set("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.error = f"HTTP {message['status']}"
+            await send(message)
+
+        if span is None:
+            await self.app(scope, receive, send_with_trace_headers)
+            return
+        token = current_span.set(span)
+        error = None
+        try:
+            await self.app(scope, receive, send_with_trace_headers)
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"[:500]
+            raise
+        finally:
+            current_span.reset(token)
+            span.end(error)
+
+
+def metrics():
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
 
 # Configure logging
 logging.basicConfig(
@@ -2500,6 +7875,154 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-@app.on_event("shutdown")
+async def create_indexes():
+    try:
+        await db.translation_memory.create_index("key", unique=True)
+        await db.translation_memory.create_index("norm_key")
+        await db.jobs.create_index("id", unique=True)
+        await db.jobs.create_index([("status", 1), ("type", 1), ("created_at", 1)])
+        await db.jobs.create_index("expires_at", expireAfterSeconds=0)
+        await db.jobs.create_index(
+            [("type", 1), ("dedupe_key", 1)], unique=True, partialFilterExpression={"dedupe_key": {"$exists": True}}
+        )
+        await db.rate_limits.create_index("key", unique=True)
+        await db.rate_limits.create_index("expires_at", expireAfterSeconds=0)
+        await db.menus.create_index("name")
+        await db.admin_sessions.create_index("id", unique=True)
+        await db.admin_sessions.create_index("token_hash", unique=True)
+        await db.admin_sessions.create_index("expires_at", expireAfterSeconds=0)
+        await db.llm_calls.create_index("created_at")
+        await db.llm_calls.create_index("expires_at", expireAfterSeconds=0)
+        await db.llm_usage_daily.create_index([("date", 1), ("endpoint", 1), ("model", 1)], unique=True)
+        await db.request_profiles.create_index("id", unique=True)
+        await db.request_profiles.create_index("created_at")
+        await db.request_profiles.create_index("expires_at", expireAfterSeconds=0)
+    except Exception:
+        logging.exception("Failed to create MongoDB indexes")
+
+
+async def backfill_faq_ids():
+    """Give FAQs stored without an id or created_at (older documents) both, once.
+
+    The filter on the missing fields keeps two workers starting at the same
+    time from assigning different ids to one FAQ.
+    """
+    try:
+        missing = {"$or": [{"id": None}, {"created_at": None}]}
+        async for doc in db.faqs.find(missing, {"_id": 1, "id": 1, "created_at": 1}):
+            fields = {}
+            if not doc.get("id"):
+                fields["id"] = str(uuid.uuid4())
+            if not doc.get("created_at"):
+                fields["created_at"] = datetime.now(timezone.utc).isoformat()
+            await db.faqs.update_one(
+                {"_id": doc["_id"], **{name: None for name in fields}}, {"$set": fields}
+            )
+    except Exception:
+        logging.exception("Failed to backfill FAQ ids")
+
+
+async def start_job_workers():
+    await job_runner.start()
+
+
+async def start_slow_query_log():
+    await slow_query_log.start()
+
+
+async def start_loop_monitor():
+    await loop_monitor.start()
+
+
+async def start_span_exporter():
+    await span_exporter.start()
+
+
+async def prewarm_llm_client():
+    """Build the pooled LLM client up front so the first AI request does not pay for it."""
+    try:
+        settings = await get_openai_settings()
+        if settings.enabled and settings.api_key:
+            await llm_clients.get(settings)
+    except Exception:
+        logging.exception("Failed to prewarm LLM client")
+
+
 async def shutdown_db_client():
+    await job_runner.stop()
+    await slow_query_log.stop()
+    await loop_monitor.stop()
+    await span_exporter.stop()
+    await llm_clients.close()
+    password_hasher.shutdown()
     client.close()
+
+
+# ==================== APP FACTORY ====================
+
+# FAST_STARTUP=1 lets a fresh worker take traffic sooner: indexes are created
+# in the background instead of before the first request, and the LLM client
+# is built on the first AI call instead of at startup.
+FAST_STARTUP = os.environ.get("FAST_STARTUP", "0") == "1"
+
+_background_startup_tasks: set = set()
+
+
+async def create_indexes_in_background():
+    task = asyncio.create_task(create_indexes())
+    _background_startup_tasks.add(task)
+    task.add_done_callback(_background_startup_tasks.discard)
+
+
+def create_app(fast_startup: Optional[bool] = None) -> FastAPI:
+    """Build the ASGI application.
+
+    ``uvicorn server:app`` builds it on first access of ``server.app``;
+    ``uvicorn --factory server:create_app`` calls this directly. Importing
+    server (scripts, job workers) does not build an app at all.
+    """
+    if fast_startup is None:
+        fast_startup = FAST_STARTUP
+    on_startup: List[Callable[[], Awaitable[None]]] = [
+        create_indexes_in_background if fast_startup else create_indexes,
+        backfill_faq_ids,
+        start_job_workers,
+        start_slow_query_log,
+        start_loop_monitor,
+        start_span_exporter,
+    ]
+    if not fast_startup:
+        on_startup.append(prewarm_llm_client)
+    application = FastAPI(
+        title="SyncBeds CMS API", version="1.0.0", on_startup=on_startup, on_shutdown=[shutdown_db_client]
+    )
+
+    # Serve uploaded media files (must still be under /api for ingress rules)
+    # We use /api/uploads for static files to avoid clashing with the /api/media/upload API route.
+    MEDIA_ROOT.mkdir(exist_ok=True)
+    application.mount("/api/uploads", StaticFiles(directory=MEDIA_ROOT), name="uploads")
+
+    # The router's routes already carry the /api prefix
+    application.include_router(api_router)
+    application.add_api_route("/metrics", metrics, include_in_schema=False)
+
+    application.add_middleware(
+        CORSMiddleware,
+        allow_credentials=True,
+        allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    application.add_middleware(ProfilingMiddleware)
+    application.add_middleware(TracingMiddleware)
+    application.add_middleware(MetricsMiddleware, routes=application.router.routes)
+    return application
+
+
+def __getattr__(name: str) -> Any:
+    # ``server.app`` (uvicorn server:app) is built on first access
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,7 +4,7 @@ import { Button } from './ui/button';
 import { Input } from './ui/input';
 import { Textarea } from './ui/textarea';
 import { Label } from './ui/label';
-import { cmsApi } from '../services/api';
+import { authFetch, cmsApi } from '../services/api';
 import { toast } from 'sonner';
 import { RichTextEditor } from './RichTextEditor';
 import { useTranslation } from 'react-i18next';
@@ -141,7 +141,7 @@ const ImageField = ({ label, value, onChange }) => {
       const formData = new FormData();
       formData.append('file', file);
 
-      const response = await fetch(`${process.env.REACT_APP_BACKEND_URL}/api/media/upload`, {
+      const response = await authFetch(`${process.env.REACT_APP_BACKEND_URL}/api/media/upload`, {
         method: 'POST',
         body: formData,
       });
@@ -329,7 +329,7 @@ const ItemsEditor = ({ items = [], onChange, itemFields = ['title', 'description
                       try {
                         const formData = new FormData();
                         formData.append('file', file);
-                        const response = await fetch(`${process.env.REACT_APP_BACKEND_URL}/api/media/upload`, {
+                        const response = await authFetch(`${process.env.REACT_APP_BACKEND_URL}/api/media/upload`, {
                           method: 'POST',
                           body: formData,
                         });
@@ -1413,6 +1413,59 @@ const PricingPlansEditor = ({ plans = [], onChange }) => {
   );
 };
 
+const escapePointer = (key) => String(key).replace(/~/g, '~0').replace(/\//g, '~1');
+const sameJson = (a, b) => JSON.stringify(a ?? null) === JSON.stringify(b ?? null);
+
+// JSON Patch (RFC 6902) from the stored page to the edited one. Sections are
+// addressed by id and content is diffed per top-level key, so editing one
+// headline sends one operation instead of the whole page.
+const buildPagePatch = (original, edited) => {
+  const ops = [];
+  for (const field of ['title', 'meta_description']) {
+    const before = original[field] || {};
+    const after = edited[field] || {};
+    for (const lang of new Set([...Object.keys(before), ...Object.keys(after)])) {
+      if (after[lang] === undefined) {
+        ops.push({ op: 'remove', path: `/${field}/${escapePointer(lang)}` });
+      } else if (before[lang] !== after[lang]) {
+        // replace fails on a missing member (RFC 6902), add creates or overwrites it
+        ops.push({ op: before[lang] === undefined ? 'add' : 'replace', path: `/${field}/${escapePointer(lang)}`, value: after[lang] });
+      }
+    }
+  }
+
+  const originalSections = new Map((original.sections || []).map(s => [s.id, s]));
+  const editedIds = new Set(edited.sections.map(s => s.id));
+  for (const section of original.sections || []) {
+    if (!editedIds.has(section.id)) {
+      ops.push({ op: 'remove', path: `/sections/${escapePointer(section.id)}` });
+    }
+  }
+  for (const section of edited.sections) {
+    const before = originalSections.get(section.id);
+    const base = `/sections/${escapePointer(section.id)}`;
+    if (!before) {
+      ops.push({ op: 'add', path: '/sections/-', value: section });
+      continue;
+    }
+    for (const field of ['section_type', 'order', 'visible']) {
+      if (!sameJson(before[field], section[field])) {
+        ops.push({ op: before[field] === undefined ? 'add' : 'replace', path: `${base}/${field}`, value: section[field] });
+      }
+    }
+    const beforeContent = before.content || {};
+    for (const key of new Set([...Object.keys(beforeContent), ...Object.keys(section.content)])) {
+      if (section.content[key] === undefined) {
+        ops.push({ op: 'remove', path: `${base}/content/${escapePointer(key)}` });
+      } else if (!sameJson(beforeContent[key], section.content[key])) {
+        const op = beforeContent[key] === undefined ? 'add' : 'replace';
+        ops.push({ op, path: `${base}/content/${escapePointer(key)}`, value: section.content[key] });
+      }
+    }
+  }
+  return ops;
+};
+
 export const AdvancedPageEditor = ({ page, onClose, onSaved, activeSectionId }) => {
   const { i18n } = useTranslation();
   const [editedPage, setEditedPage] = useState(null);
@@ -1476,14 +1529,19 @@ export const AdvancedPageEditor = ({ page, onClose, onSaved, activeSectionId })
         visible: section.visible !== false,
         content: section.content || {}
       }));
-      
-      console.log('Saving sections:', sectionsToSave);
-      
-      const updated = await cmsApi.updatePage(editedPage.id, {
-        title: editedPage.title,
-        meta_description: editedPage.meta_description,
-        sections: sectionsToSave
-      });
+
+      // Send only what changed; pages whose stored sections have no ids
+      // cannot be addressed by a patch and are saved in full.
+      const patch = (page.sections || []).every(s => s.id)
+        ? buildPagePatch(page, { ...editedPage, sections: sectionsToSave })
+        : null;
+      const updated = patch
+        ? await cmsApi.patchPage(editedPage.id, patch)
+        : await cmsApi.updatePage(editedPage.id, {
+            title: editedPage.title,
+            meta_description: editedPage.meta_description,
+            sections: sectionsToSave
+          });
       toast.success('Page saved successfully!');
       onSaved?.(updated);
     } catch (error) {
@@ -11,6 +11,7 @@ import {
 } from 'lucide-react';
 import { Button } from './ui/button';
 import { useState } from 'react';
+import { authFetch } from '../services/api';
 
 const MenuBar = ({ editor }) => {
   const [imageUrl, setImageUrl] = useState('');
@@ -203,7 +204,7 @@ const MenuBar = ({ editor }) => {
                   try {
                     const formData = new FormData();
                     formData.append('file', file);
-                    const res = await fetch(`${process.env.REACT_APP_BACKEND_URL}/api/media/upload`, {
+                    const res = await authFetch(`${process.env.REACT_APP_BACKEND_URL}/api/media/upload`, {
                       method: 'POST',
                       body: formData,
                     });
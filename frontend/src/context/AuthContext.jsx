@@ -1,4 +1,5 @@
 import React, { createContext, useContext, useEffect, useState } from 'react';
+import { authApi, getAuthSession } from '../services/api';
 
 const AuthContext = createContext({
   isCmsAdmin: false,
@@ -6,23 +7,25 @@ const AuthContext = createContext({
 });
 
 export const AuthProvider = ({ children }) => {
+  // Logged in while a token session is stored (see authApi.login)
   const [isCmsAdmin, setIsCmsAdmin] = useState(() => {
     if (typeof window === 'undefined') return false;
-    try {
-      return window.localStorage.getItem('cmsAdmin') === '1';
-    } catch {
-      return false;
-    }
+    return Boolean(getAuthSession());
   });
 
   useEffect(() => {
-    try {
-      window.localStorage.setItem('cmsAdmin', isCmsAdmin ? '1' : '0');
-    } catch {
-      // ignore
+    if (!isCmsAdmin && getAuthSession()) {
+      authApi.logout();
     }
   }, [isCmsAdmin]);
 
+  useEffect(() => {
+    // Fired by the API client when the refresh token is no longer accepted
+    const onExpired = () => setIsCmsAdmin(false);
+    window.addEventListener('cms-auth-expired', onExpired);
+    return () => window.removeEventListener('cms-auth-expired', onExpired);
+  }, []);
+
   return (
     <AuthContext.Provider value={{ isCmsAdmin, setIsCmsAdmin }}>
       {children}
@@ -25,18 +25,18 @@ const Footer = () => {
   useEffect(() => {
     const loadFooterMenu = async () => {
       try {
-        const menu = await cmsApi.getMenuByName('footer');
+        const menu = await cmsApi.getMenuByName('footer', i18n.language);
         setFooterMenu(menu);
       } catch (e) {
         setFooterMenu(null);
       }
     };
     loadFooterMenu();
-  }, []);
+  }, [i18n.language]);
 
-  const footerLinks = footerMenu?.items?.filter(item => item.visible !== false).map(item => ({
+  const footerLinks = footerMenu?.items?.map(item => ({
     path: item.url,
-    label: item.label?.[i18n.language] || item.label?.en || item.url,
+    label: item.label,
   })) || [
     { path: '/terms', label: t('footer.termsAndConditions') },
     { path: '/privacy', label: t('footer.privacyPolicy') },
@@ -282,7 +282,7 @@ const Footer = () => {
             type="footer" 
             onClose={() => {
               setShowFooterEditor(false);
-              cmsApi.getMenuByName('footer').then(setFooterMenu).catch(() => {});
+              cmsApi.getMenuByName('footer', i18n.language).then(setFooterMenu).catch(() => {});
             }} 
           />
         )}
@@ -96,10 +96,13 @@ const Header = () => {
     }
   }, [location.pathname, i18n]);
 
+  const currentLangCode = SUPPORTED_LANGS.includes(i18n.language) ? i18n.language : 'hr';
+
   useEffect(() => {
     const loadHeaderMenu = async () => {
       try {
-        const menu = await cmsApi.getMenuByName('header');
+        // Rendered for the current language: visible, sorted, labels resolved
+        const menu = await cmsApi.getMenuByName('header', currentLangCode);
         setHeaderMenu(menu);
       } catch (e) {
         // ako API padne, koristimo fallback hardkodirani meni
@@ -107,14 +110,12 @@ const Header = () => {
       }
     };
     loadHeaderMenu();
-  }, []);
+  }, [currentLangCode]);
 
   // Feature links from CMS or fallback
-  const currentLangCode = SUPPORTED_LANGS.includes(i18n.language) ? i18n.language : 'hr';
-
-  const featureLinksFromMenu = headerMenu?.items?.filter(item => item.visible !== false && item.url?.startsWith('/features')).map(item => ({
+  const featureLinksFromMenu = headerMenu?.items?.filter(item => item.url?.startsWith('/features')).map(item => ({
     path: buildLocalizedPath(item.url, currentLangCode),
-    label: item.label?.[i18n.language] || item.label?.en || item.url,
+    label: item.label,
   })) || [];
   
   const featureLinks = featureLinksFromMenu.length > 0 ? featureLinksFromMenu : [
@@ -125,22 +126,16 @@ const Header = () => {
   ];
 
   // Process menu items - separate dropdowns (with children) from regular links
-  const processedMenuItems = (headerMenu?.items || [])
-    .filter(item => item.visible !== false)
-    .sort((a, b) => (a.order ?? 0) - (b.order ?? 0))
-    .map(item => ({
-      id: item.id,
-      label: item.label?.[i18n.language] || item.label?.en || '',
-      url: item.url,
-      hasDropdown: item.children && item.children.length > 0,
-      children: (item.children || [])
-        .filter(c => c.visible !== false)
-        .sort((a, b) => (a.order ?? 0) - (b.order ?? 0))
-        .map(child => ({
-          path: buildLocalizedPath(child.url, currentLangCode),
-          label: child.label?.[i18n.language] || child.label?.en || child.url,
-        }))
-    }));
+  const processedMenuItems = (headerMenu?.items || []).map(item => ({
+    id: item.id,
+    label: item.label,
+    url: item.url,
+    hasDropdown: item.children.length > 0,
+    children: item.children.map(child => ({
+      path: buildLocalizedPath(child.url, currentLangCode),
+      label: child.label,
+    }))
+  }));
 
   // Enhance CMS header menu: if there is a "Features" item without children,
   // attach featureLinks as its dropdown items so feature pages are always visible.
@@ -459,7 +454,7 @@ const Header = () => {
           onClose={() => {
             setShowHeaderEditor(false);
             // Reload menu after closing
-            cmsApi.getMenuByName('header').then(setHeaderMenu).catch(() => {});
+            cmsApi.getMenuByName('header', currentLangCode).then(setHeaderMenu).catch(() => {});
           }} 
         />
       )}
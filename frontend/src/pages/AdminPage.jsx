@@ -6,7 +6,7 @@ import { Textarea } from '../components/ui/textarea';
 import { Label } from '../components/ui/label';
 import { Tabs, TabsContent, TabsList, TabsTrigger } from '../components/ui/tabs';
 import { toast } from 'sonner';
-import api, { blogApi, contactApi, newsletterApi, testimonialsApi, cmsApi, apiCall, authApi } from '../services/api';
+import api, { blogApi, contactApi, newsletterApi, testimonialsApi, cmsApi, apiCall, authApi, authFetch, streamApiCall } from '../services/api';
 import { SECTION_TYPES } from '../components/AdvancedPageEditor';
 import RichTextEditor from '../components/RichTextEditor';
 
@@ -1638,9 +1638,14 @@ const PostForm = ({ post, onClose, onAiCreated }) => {
       const preferredLanguageLabel = aiLanguage.toUpperCase();
       const topicPrompt = `Topic: ${aiTopic}\nPreferred tone: ${aiTone}\nDesired length: ${aiLength}\nPrimary language: ${preferredLanguageLabel} (but generate all EN, HR, DE, SL variations).`;
 
-      const response = await apiCall('/ai/generate-blog-post', {
-        method: 'POST',
-        body: JSON.stringify({ topic: topicPrompt }),
+      // Show each language's title and excerpt as soon as the stream completes it
+      const response = await streamApiCall('/ai/generate-blog/stream', { topic: topicPrompt }, (event, data) => {
+        if (event !== 'field' || data.path.length !== 2) return;
+        const [field, lang] = data.path;
+        setFormData((prev) => ({
+          ...prev,
+          [field]: { ...(prev[field] || {}), [lang]: data.value },
+        }));
       });
 
       if (!response?.success || !response.blog_post) {
@@ -2047,7 +2052,7 @@ const PostForm = ({ post, onClose, onAiCreated }) => {
               try {
                 const formDataUpload = new FormData();
                 formDataUpload.append('file', file);
-                const res = await fetch(`${process.env.REACT_APP_BACKEND_URL}/api/media/upload`, {
+                const res = await authFetch(`${process.env.REACT_APP_BACKEND_URL}/api/media/upload`, {
                   method: 'POST',
                   body: formDataUpload,
                 });
@@ -1,9 +1,84 @@
 const API_URL = process.env.REACT_APP_BACKEND_URL;
+const AUTH_STORAGE_KEY = 'cmsAuth';
+
+// ==================== AUTH SESSION ====================
+
+// Admin session tokens ({ access_token, refresh_token }) persisted across reloads
+export function getAuthSession() {
+  try {
+    const raw = window.localStorage.getItem(AUTH_STORAGE_KEY);
+    return raw ? JSON.parse(raw) : null;
+  } catch {
+    return null;
+  }
+}
+
+export function setAuthSession(session) {
+  try {
+    if (session?.access_token) {
+      window.localStorage.setItem(
+        AUTH_STORAGE_KEY,
+        JSON.stringify({ access_token: session.access_token, refresh_token: session.refresh_token })
+      );
+    } else {
+      window.localStorage.removeItem(AUTH_STORAGE_KEY);
+    }
+  } catch {
+    // ignore
+  }
+}
+
+function authHeaders() {
+  const session = getAuthSession();
+  return session?.access_token ? { Authorization: `Bearer ${session.access_token}` } : {};
+}
+
+// Concurrent 401s share one refresh request (refresh tokens are single-use)
+let refreshPromise = null;
+
+async function refreshSession() {
+  const session = getAuthSession();
+  if (!session?.refresh_token) return false;
+  if (!refreshPromise) {
+    refreshPromise = fetch(`${API_URL}/api/auth/refresh`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ refresh_token: session.refresh_token }),
+    })
+      .then(async (response) => {
+        if (!response.ok) {
+          setAuthSession(null);
+          window.dispatchEvent(new Event('cms-auth-expired'));
+          return false;
+        }
+        setAuthSession(await response.json());
+        return true;
+      })
+      .catch(() => false)
+      .finally(() => {
+        refreshPromise = null;
+      });
+  }
+  return refreshPromise;
+}
+
+// fetch() with the admin access token; refreshes the session once on 401
+export async function authFetch(url, options = {}) {
+  const send = () => fetch(url, { ...options, headers: { ...authHeaders(), ...options.headers } });
+  let response = await send();
+  if (response.status === 401 && (await refreshSession())) {
+    response = await send();
+  }
+  return response;
+}
+
+const patchContentType = (patch) =>
+  Array.isArray(patch) ? 'application/json-patch+json' : 'application/merge-patch+json';
 
 // Helper function for API calls
 export async function apiCall(endpoint, options = {}) {
   const url = `${API_URL}/api${endpoint}`;
-  const response = await fetch(url, {
+  const response = await authFetch(url, {
     ...options,
     headers: {
       'Content-Type': 'application/json',
@@ -19,6 +94,54 @@ export async function apiCall(endpoint, options = {}) {
   return response.json();
 }
 
+// Helper for streaming endpoints: POSTs JSON and calls onEvent(event, data)
+// for every server-sent event. Resolves with the data of the final "done" event.
+export async function streamApiCall(endpoint, body, onEvent = () => {}) {
+  const url = `${API_URL}/api${endpoint}`;
+  const response = await authFetch(url, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify(body),
+  });
+
+  if (!response.ok) {
+    const error = await response.json().catch(() => ({ detail: 'Unknown error' }));
+    throw new Error(error.detail || `HTTP error! status: ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let result = null;
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    let boundary = buffer.indexOf('\n\n');
+    while (boundary !== -1) {
+      const raw = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      boundary = buffer.indexOf('\n\n');
+
+      let event = 'message';
+      let data = '';
+      raw.split('\n').forEach((line) => {
+        if (line.startsWith('event:')) event = line.slice(6).trim();
+        else if (line.startsWith('data:')) data += line.slice(5).trim();
+      });
+      const payload = data ? JSON.parse(data) : null;
+      if (event === 'error') {
+        throw new Error(payload?.detail || 'Stream failed');
+      }
+      if (event === 'done') {
+        result = payload;
+      }
+      onEvent(event, payload);
+    }
+  }
+  return result;
+}
+
 // ==================== BLOG API ====================
 
 export const blogApi = {
@@ -63,6 +186,15 @@ export const blogApi = {
     });
   },
   
+  // patch: JSON Patch operations (array) or a JSON Merge Patch (object)
+  patchPost: async (id, patch) => {
+    return apiCall(`/blog/posts/${id}`, {
+      method: 'PATCH',
+      headers: { 'Content-Type': patchContentType(patch) },
+      body: JSON.stringify(patch),
+    });
+  },
+  
   deletePost: async (id) => {
     return apiCall(`/blog/posts/${id}`, {
       method: 'DELETE',
@@ -105,10 +237,25 @@ export const contactApi = {
 
 export const authApi = {
   login: async (username, password) => {
-    return apiCall('/auth/login', {
+    const session = await apiCall('/auth/login', {
       method: 'POST',
       body: JSON.stringify({ username, password }),
     });
+    setAuthSession(session);
+    return session;
+  },
+  logout: async () => {
+    const session = getAuthSession();
+    setAuthSession(null);
+    if (!session) return;
+    await fetch(`${API_URL}/api/auth/logout`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        Authorization: `Bearer ${session.access_token}`,
+      },
+      body: JSON.stringify({ refresh_token: session.refresh_token }),
+    }).catch(() => {});
   },
   getUsers: async () => apiCall('/admin/users'),
   createUser: async (user) =>
@@ -176,6 +323,22 @@ export const cmsApi = {
     });
   },
   
+  patchContent: async (key, patch) => {
+    return apiCall(`/cms/content/${key}`, {
+      method: 'PATCH',
+      headers: { 'Content-Type': patchContentType(patch) },
+      body: JSON.stringify(patch),
+    });
+  },
+  
+  // { create: [...], update: [{ key, content }], delete: [key] }
+  bulkContent: async (batch) => {
+    return apiCall('/cms/content/bulk', {
+      method: 'POST',
+      body: JSON.stringify(batch),
+    });
+  },
+  
   deleteContent: async (key) => {
     return apiCall(`/cms/content/${key}`, {
       method: 'DELETE',
@@ -209,6 +372,15 @@ export const cmsApi = {
     });
   },
 
+  // Sections are addressed by id: /sections/<id>/content/headline/en
+  patchPage: async (id, patch) => {
+    return apiCall(`/pages/${id}`, {
+      method: 'PATCH',
+      headers: { 'Content-Type': patchContentType(patch) },
+      body: JSON.stringify(patch),
+    });
+  },
+
   deletePage: async (id) => {
     return apiCall(`/pages/${id}`, {
       method: 'DELETE',
@@ -220,8 +392,10 @@ export const cmsApi = {
     return apiCall('/menus');
   },
 
-  getMenuByName: async (name) => {
-    return apiCall(`/menus/${name}`);
+  // With a language the API returns the compact rendering: visible items
+  // only, sorted, with `label` already resolved to a string.
+  getMenuByName: async (name, lang) => {
+    return apiCall(lang ? `/menus/${name}?lang=${lang}` : `/menus/${name}`);
   },
 
   createMenu: async (menuData) => {
@@ -271,6 +445,14 @@ export const testimonialsApi = {
       method: 'DELETE',
     });
   },
+  
+  // { create: [...], update: [{ id, ... }], reorder: [{ id, order }], delete: [id] }
+  bulk: async (batch) => {
+    return apiCall('/testimonials/bulk', {
+      method: 'POST',
+      body: JSON.stringify(batch),
+    });
+  },
 };
 
 // ==================== FAQ API ====================
@@ -303,6 +485,14 @@ export const faqApi = {
       method: 'DELETE',
     });
   },
+  
+  // { create: [...], update: [{ id, ... }], reorder: [{ id, order }], delete: [id] }
+  bulk: async (batch) => {
+    return apiCall('/faqs/bulk', {
+      method: 'POST',
+      body: JSON.stringify(batch),
+    });
+  },
 };
 
 // ==================== HEALTH CHECK ====================
@@ -313,6 +503,34 @@ export const healthApi = {
   },
 };
 
+// ==================== JOBS API ====================
+
+// Long-running admin operations are queued as background jobs; poll until done
+// and resolve with the job result so callers see the same payload as before.
+export async function waitForJob(job, { interval = 2000 } = {}) {
+  let current = job;
+  while (current.status === 'queued' || current.status === 'running') {
+    await new Promise((resolve) => setTimeout(resolve, interval));
+    current = await apiCall(`/admin/jobs/${current.id}`);
+  }
+  if (current.status !== 'succeeded') {
+    throw new Error(current.error || `Job ${current.status}`);
+  }
+  return current.result || {};
+}
+
+export const jobsApi = {
+  getJobs: async (status = null) => {
+    const query = status ? `?status=${status}` : '';
+    return apiCall(`/admin/jobs${query}`);
+  },
+  getJob: async (id) => apiCall(`/admin/jobs/${id}`),
+  cancelJob: async (id) =>
+    apiCall(`/admin/jobs/${id}/cancel`, {
+      method: 'POST',
+    }),
+};
+
 export default {
   auth: authApi,
   blog: blogApi,
@@ -322,12 +540,19 @@ export default {
   testimonials: testimonialsApi,
   faq: faqApi,
   health: healthApi,
+  jobs: jobsApi,
   admin: {
     async translateAllContent() {
-      return apiCall('/admin/ai/translate-all', { method: 'POST' });
+      const job = await apiCall('/admin/ai/translate-all', { method: 'POST' });
+      return waitForJob(job);
+    },
+    async translateDirtyContent(dryRun = false) {
+      const res = await apiCall(`/admin/ai/translate-dirty?dry_run=${dryRun}`, { method: 'POST' });
+      return dryRun ? res : waitForJob(res);
     },
     async importAllImages() {
-      return apiCall('/admin/media/import-all', { method: 'POST' });
+      const job = await apiCall('/admin/media/import-all', { method: 'POST' });
+      return waitForJob(job);
     },
     async getEmailSettings() {
       return apiCall('/admin/settings/email');
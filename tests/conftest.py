@@ -0,0 +1,54 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+# server reads its config at import time; nothing here connects to MongoDB
+# or calls an LLM.
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "test_database")
+os.environ.setdefault("JOB_WORKERS", "0")
+os.environ.setdefault("LLM_PROVIDER", "fake")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "bench: drives the benchmark scenarios (scripts/bench_endpoints.py)")
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def server():
+    import server as server_module
+
+    return server_module
+
+
+@pytest.fixture
+def mongo(server, monkeypatch):
+    """An in-memory database (mongomock) in place of the server's MongoDB."""
+    from mongomock_motor import AsyncMongoMockClient
+
+    client = AsyncMongoMockClient()
+    monkeypatch.setattr(server, "client", client)
+    monkeypatch.setattr(server, "db", client[os.environ["DB_NAME"]])
+    return server.db
+
+
+@pytest.fixture
+async def api(server, mongo):
+    """An HTTP client for the app, signed in as an admin."""
+    import httpx
+
+    tokens = await server.issue_session_tokens("admin", "owner")
+    transport = httpx.ASGITransport(app=server.create_app(fast_startup=True))
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", headers=headers) as client:
+        yield client
@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+
+@pytest.mark.anyio
+async def test_fresh_does_not_join_a_running_call(server):
+    cache = server.AIResultCache(ttl=60, max_entries=10)
+    release = asyncio.Event()
+    calls = []
+
+    async def call():
+        calls.append(len(calls))
+        number = len(calls)
+        if number == 1:
+            await release.wait()
+        return number
+
+    first = asyncio.ensure_future(cache.run("key", call))
+    await asyncio.sleep(0)
+    assert await cache.run("key", call, fresh=True) == 2
+    release.set()
+    assert await first == 1
+    # The fresh result is cached, not the older one that finished later
+    assert await cache.run("key", call) == 2
+    assert cache.stats == {"hits": 1, "coalesced": 0, "misses": 1, "bypassed": 1}
+
+
+@pytest.mark.anyio
+async def test_generated_draft_is_regenerated_after_deletion(api, mongo, server, monkeypatch):
+    monkeypatch.setattr(server, "ai_result_cache", server.AIResultCache(ttl=60, max_entries=10))
+    generated = []
+
+    async def request_blog_generation(topic):
+        generated.append(topic)
+        return '{"title": {"en": "T"}, "excerpt": {"en": "E"}, "content": {"en": "<p>C</p>"}, "tags": []}'
+
+    monkeypatch.setattr(server, "request_blog_generation", request_blog_generation)
+    first = (await api.post("/api/ai/generate-blog", json={"topic": "Channel managers"})).json()
+    again = (await api.post("/api/ai/generate-blog", json={"topic": "Channel managers"})).json()
+    assert again["blog_post"]["id"] == first["blog_post"]["id"]
+    assert len(generated) == 1
+
+    await mongo.blog_posts.delete_one({"id": first["blog_post"]["id"]})
+    after_delete = (await api.post("/api/ai/generate-blog", json={"topic": "Channel managers"})).json()
+    assert after_delete["blog_post"]["id"] != first["blog_post"]["id"]
+    assert len(generated) == 2
+    assert await mongo.blog_posts.count_documents({"id": after_delete["blog_post"]["id"]}) == 1
+
+
+@pytest.mark.anyio
+async def test_unparsable_replies_are_not_cached(api, mongo, server, monkeypatch):
+    monkeypatch.setattr(server, "ai_result_cache", server.AIResultCache(ttl=60, max_entries=10))
+    replies = ["not json", '{"title": {"en": "T"}}']
+    translations = [{"error": "Failed to parse translations", "raw": "not json"}, {"hr": "Bok"}]
+
+    async def chat_completion(provider, route, model, messages, **kwargs):
+        return type("Completion", (), {"text": replies.pop(0)})()
+
+    async def request_translations(text, source_lang, target_langs):
+        return translations.pop(0)
+
+    monkeypatch.setattr(server, "chat_completion", chat_completion)
+    monkeypatch.setattr(server, "request_translations", request_translations)
+
+    generate = {"prompt": "Channel managers", "languages": ["en"]}
+    assert (await api.post("/api/ai/generate", json=generate)).json()["content"] == {"raw": "not json"}
+    assert (await api.post("/api/ai/generate", json=generate)).json()["content"] == {"title": {"en": "T"}}
+    assert (await api.post("/api/ai/generate", json=generate)).json()["content"] == {"title": {"en": "T"}}
+
+    translate = {"text": "Hello", "target_langs": ["hr"]}
+    assert "error" in (await api.post("/api/ai/translate", json=translate)).json()["translations"]
+    assert (await api.post("/api/ai/translate", json=translate)).json()["translations"]["hr"] == "Bok"
+    assert (await api.post("/api/ai/translate", json=translate)).json()["translations"]["hr"] == "Bok"
+    assert replies == [] and translations == []
@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+REPLY = '```json\n{"en": {"title": "Caf\\u00e9 \\"guide\\"", "tags": ["a", "b"], "excerpt": "Short"}, "n": 1}\n```'
+
+
+def parse_events(body):
+    events = []
+    for frame in body.split("\n\n"):
+        if frame:
+            event, data = frame.split("\n")
+            assert event.startswith("event: ") and data.startswith("data: ")
+            events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+def test_sse_event_framing(server):
+    assert server.sse_event("field", {"value": "a\nb", "path": ["ć"]}) == (
+        'event: field\ndata: {"value": "a\\nb", "path": ["ć"]}\n\n'
+    )
+
+
+@pytest.mark.parametrize("size", [1, 3, len(REPLY)])
+def test_scanner_reports_completed_strings_across_chunks(server, size):
+    scanner = server.JSONStreamScanner()
+    found = []
+    for start in range(0, len(REPLY), size):
+        found.extend(scanner.feed(REPLY[start:start + size]))
+    assert found == [
+        (["en", "title"], 'Café "guide"'),
+        (["en", "tags", 0], "a"),
+        (["en", "tags", 1], "b"),
+        (["en", "excerpt"], "Short"),
+    ]
+
+
+@pytest.mark.anyio
+async def test_generate_stream_emits_fields_before_done(api, server, monkeypatch):
+    async def stream_chat_completion(provider, endpoint, model_name, messages, temperature, hints=None):
+        for start in range(0, len(REPLY), 7):
+            yield REPLY[start:start + 7]
+
+    monkeypatch.setattr(server, "stream_chat_completion", stream_chat_completion)
+    response = await api.post("/api/ai/generate/stream", json={"prompt": "Cafés"})
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.headers["cache-control"] == "no-cache"
+
+    events = parse_events(response.text)
+    assert "".join(data["text"] for name, data in events if name == "delta") == REPLY
+    assert [data for name, data in events if name == "field"] == [
+        {"path": ["en", "title"], "value": 'Café "guide"'},
+        {"path": ["en", "excerpt"], "value": "Short"},
+    ]
+    assert events[-1] == ("done", {"success": True, "content": json.loads(REPLY.strip("`json\n"))})
+
+
+@pytest.mark.anyio
+async def test_generate_stream_reports_failures_as_an_event(api, server, monkeypatch):
+    async def stream_chat_completion(provider, endpoint, model_name, messages, temperature, hints=None):
+        yield '{"en": '
+        raise RuntimeError("connection reset")
+
+    monkeypatch.setattr(server, "stream_chat_completion", stream_chat_completion)
+    events = parse_events((await api.post("/api/ai/generate/stream", json={"prompt": "x"})).text)
+    assert events[-1] == ("error", {"detail": "AI generation failed: connection reset"})
@@ -0,0 +1,73 @@
+import time
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def fresh_session_state(server, monkeypatch):
+    monkeypatch.setattr(server, "revoked_sessions", {})
+    monkeypatch.setattr(server, "_live_sessions", {})
+
+
+def test_tampered_and_expired_tokens_are_rejected(server):
+    secret = b"secret"
+    token = server.sign_access_token({"sub": "admin", "sid": "s1", "exp": time.time() + 60}, secret)
+    assert server.verify_access_token(token, b"other") is None
+    assert server.verify_access_token(token, secret)["sub"] == "admin"
+    assert server.verify_access_token(token[:-4] + "AAAA", secret) is None
+    assert server.verify_access_token("not-a-token", secret) is None
+
+    expired = server.sign_access_token({"sub": "admin", "sid": "s1", "exp": time.time() - 1}, secret)
+    assert server.verify_access_token(expired, secret) is None
+    server.revoke_session("s1")
+    # cached claims are still checked against revocation
+    assert server.verify_access_token(token, secret) is None
+
+
+@pytest.mark.anyio
+async def test_refresh_rotates_the_refresh_token(api, mongo):
+    login = (await api.post("/api/auth/login", json={"username": "admin", "password": "admin123"})).json()
+    refreshed = await api.post("/api/auth/refresh", json={"refresh_token": login["refresh_token"]})
+    assert refreshed.status_code == 200
+    tokens = refreshed.json()
+    assert tokens["refresh_token"] != login["refresh_token"]
+
+    again = await api.post("/api/auth/refresh", json={"refresh_token": login["refresh_token"]})
+    assert again.status_code == 401
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert (await api.get("/api/admin/auth/hash-stats", headers=headers)).status_code == 200
+    assert await mongo.admin_sessions.count_documents({}) == 2  # the fixture's session and this one
+
+
+@pytest.mark.anyio
+async def test_logout_revokes_access_and_refresh_tokens(api):
+    login = (await api.post("/api/auth/login", json={"username": "admin", "password": "admin123"})).json()
+    headers = {"Authorization": f"Bearer {login['access_token']}"}
+    assert (await api.get("/api/admin/auth/hash-stats", headers=headers)).status_code == 200
+
+    assert (await api.post("/api/auth/logout", json={}, headers=headers)).status_code == 200
+    assert (await api.get("/api/admin/auth/hash-stats", headers=headers)).status_code == 401
+    assert (await api.post("/api/auth/refresh", json={"refresh_token": login["refresh_token"]})).status_code == 401
+    # other sessions are unaffected
+    assert (await api.get("/api/admin/auth/hash-stats")).status_code == 200
+
+
+@pytest.mark.anyio
+async def test_logout_on_another_worker_is_seen_after_the_recheck_interval(api, mongo, server):
+    login = (await api.post("/api/auth/login", json={"username": "admin", "password": "admin123"})).json()
+    headers = {"Authorization": f"Bearer {login['access_token']}"}
+    assert (await api.get("/api/admin/auth/hash-stats", headers=headers)).status_code == 200
+
+    # another worker handles the logout: only the database changes here
+    await mongo.admin_sessions.delete_many({"token_hash": server.hash_refresh_token(login["refresh_token"])})
+    assert (await api.get("/api/admin/auth/hash-stats", headers=headers)).status_code == 200
+    for session_id in server._live_sessions:
+        server._live_sessions[session_id] -= server.SESSION_RECHECK_SECONDS
+    assert (await api.get("/api/admin/auth/hash-stats", headers=headers)).status_code == 401
+
+
+@pytest.mark.anyio
+async def test_admin_routes_require_a_bearer_token(api):
+    response = await api.get("/api/admin/auth/hash-stats", headers={"Authorization": ""})
+    assert response.status_code == 401
+    assert response.headers["www-authenticate"] == "Bearer"
@@ -0,0 +1,59 @@
+import argparse
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+BENCH_SCRIPT = Path(__file__).resolve().parent.parent / "backend" / "scripts" / "bench_endpoints.py"
+
+
+@pytest.fixture
+def bench(server):
+    spec = importlib.util.spec_from_file_location("bench_endpoints", BENCH_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.bench
+@pytest.mark.anyio
+async def test_bench_scenarios_run_without_errors(bench, server, mongo, monkeypatch):
+    import httpx
+
+    # server may have been imported before the benchmark raised these limits
+    for name in ("RATE_LIMIT_IP_BURST", "RATE_LIMIT_IP_PER_MINUTE", "RATE_LIMIT_EMAIL_BURST"):
+        monkeypatch.setattr(server, name, 100_000_000)
+    monkeypatch.setattr(server, "rate_limiter", server.RateLimiter(server.MemoryRateLimitStore()))
+    args = argparse.Namespace(
+        seed=1, posts=30, pages=5, sections_per_page=3, requests=10, warmup=2, concurrency=4
+    )
+    fixtures = await bench.prepare_fixtures(server, args)
+    scenarios = bench.route_scenarios(args.pages, args.posts, fixtures["admin_headers"])
+
+    results = {}
+    transport = httpx.ASGITransport(app=server.create_app(fast_startup=True))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, method, make_url, make_body, headers in scenarios:
+            results[name] = await bench.run_scenario(client, method, make_url, make_body, headers, fixtures, args)
+
+    assert {name: r["errors"] for name, r in results.items()} == {name: 0 for name in results}
+    assert all(r["requests"] == args.requests for r in results.values())
+
+    baseline = {"routes": results}
+    assert bench.compare_to_baseline(results, baseline, max_regression=0.25, min_delta_ms=1.0) == []
+    faster = {"routes": {name: {**r, "p95_ms": r["p95_ms"] / 10} for name, r in results.items()}}
+    slower_route = max(results, key=lambda name: results[name]["p95_ms"])
+    regressions = bench.compare_to_baseline(results, faster, max_regression=0.25, min_delta_ms=0.0)
+    assert any(line.startswith(f"{slower_route}:") for line in regressions)
+
+
+def test_baseline_gate_ignores_small_and_unknown_routes(bench):
+    baseline = {"routes": {"GET faqs": {"p95_ms": 2.0}, "GET page": {"p95_ms": 10.0}}}
+    results = {
+        "GET faqs": {"p95_ms": 2.9},  # 45% slower, but under min_delta_ms
+        "GET page": {"p95_ms": 13.0},
+        "GET new route": {"p95_ms": 100.0},
+    }
+    assert bench.compare_to_baseline(results, baseline, max_regression=0.25, min_delta_ms=1.0) == [
+        "GET page: p95 13.00 ms vs baseline 10.00 ms"
+    ]
@@ -0,0 +1,79 @@
+import pytest
+
+FAQ = {"question": {"en": "Q"}, "answer": {"en": "A"}}
+
+
+def statuses(response):
+    return [(r["op"], r["id"], r["status"]) for r in response.json()["results"]]
+
+
+@pytest.mark.anyio
+async def test_second_change_to_a_document_is_a_conflict(api, mongo):
+    await mongo.faqs.insert_many(
+        [{"id": "a", **FAQ, "order": 0, "created_at": "2026-01-01T00:00:00"}, {"id": "b", **FAQ, "order": 1}]
+    )
+    response = await api.post(
+        "/api/faqs/bulk",
+        json={
+            "update": [{"id": "a", **FAQ, "category": "pricing"}, {"id": "a", **FAQ, "category": "support"}],
+            "reorder": [{"id": "b", "order": 5}],
+            "delete": ["a", "b", "missing"],
+        },
+    )
+    assert response.status_code == 200
+    assert statuses(response) == [
+        ("update", "a", "ok"),
+        ("update", "a", "conflict"),
+        ("reorder", "b", "ok"),
+        ("delete", "a", "conflict"),
+        ("delete", "b", "conflict"),
+        ("delete", "missing", "not_found"),
+    ]
+    assert await mongo.faqs.count_documents({}) == 2
+    assert (await mongo.faqs.find_one({"id": "a"}))["category"] == "pricing"
+
+
+@pytest.mark.anyio
+async def test_reorder_of_a_document_created_in_the_same_batch(api, mongo, server, monkeypatch):
+    monkeypatch.setattr(server.uuid, "uuid4", lambda: "new-faq")
+    response = await api.post("/api/faqs/bulk", json={"create": [FAQ], "reorder": [{"id": "new-faq", "order": 3}]})
+    assert statuses(response) == [("create", "new-faq", "ok")]
+    assert (await mongo.faqs.find_one({"id": "new-faq"}))["order"] == 3
+
+
+@pytest.mark.anyio
+async def test_repeated_reorder_is_a_conflict(api, mongo, server, monkeypatch):
+    monkeypatch.setattr(server.uuid, "uuid4", lambda: "new-faq")
+    await mongo.faqs.insert_one({"id": "a", **FAQ, "order": 0})
+    response = await api.post(
+        "/api/faqs/bulk",
+        json={
+            "create": [FAQ],
+            "reorder": [
+                {"id": "a", "order": 1},
+                {"id": "new-faq", "order": 3},
+                {"id": "a", "order": 2},
+                {"id": "new-faq", "order": 4},
+            ],
+        },
+    )
+    assert statuses(response) == [
+        ("create", "new-faq", "ok"),
+        ("reorder", "a", "ok"),
+        ("reorder", "a", "conflict"),
+        ("reorder", "new-faq", "conflict"),
+    ]
+    assert (await mongo.faqs.find_one({"id": "a"}))["order"] == 1
+    assert (await mongo.faqs.find_one({"id": "new-faq"}))["order"] == 3
+
+
+@pytest.mark.anyio
+async def test_faqs_without_ids_are_backfilled_once(api, mongo, server):
+    await mongo.faqs.insert_one({**FAQ, "active": True})
+    await server.backfill_faq_ids()
+    stored = await mongo.faqs.find_one({})
+    assert stored["id"] and stored["created_at"]
+
+    first = (await api.get("/api/faqs")).json()
+    second = (await api.get("/api/faqs")).json()
+    assert [f["id"] for f in first] == [f["id"] for f in second] == [stored["id"]]
@@ -0,0 +1,57 @@
+import pytest
+
+
+@pytest.fixture
+async def jobs(server, mongo, monkeypatch):
+    async def handler(ctx):
+        return {}
+
+    monkeypatch.setitem(server.JOB_TYPES, "limited", (handler, 1))
+    monkeypatch.setitem(server.JOB_TYPES, "other", (handler, 1))
+    monkeypatch.setattr(server.job_runner, "wake", lambda: None)
+    await mongo.jobs.create_index(
+        [("type", 1), ("dedupe_key", 1)], unique=True, partialFilterExpression={"dedupe_key": {"$exists": True}}
+    )
+    return server.JobRunner(workers=0)
+
+
+@pytest.mark.anyio
+async def test_enqueue_dedupes_active_jobs(server, mongo, jobs):
+    first = await server.enqueue_job("limited", {"a": 1, "b": 2})
+    again = await server.enqueue_job("limited", {"b": 2, "a": 1})
+    assert again["id"] == first["id"]
+    assert "dedupe_key" not in first and "dedupe_key" not in again
+    assert (await server.enqueue_job("limited", {"a": 1, "b": 2}, dedupe=False))["id"] != first["id"]
+
+    await mongo.jobs.update_one({"id": first["id"]}, {"$set": {"status": "succeeded"}, "$unset": {"dedupe_key": ""}})
+    assert (await server.enqueue_job("limited", {"a": 1, "b": 2}))["id"] != first["id"]
+
+
+@pytest.mark.anyio
+async def test_claim_respects_the_per_type_limit(server, mongo, jobs):
+    first = await server.enqueue_job("limited", {"n": 1})
+    second = await server.enqueue_job("limited", {"n": 2})
+    other = await server.enqueue_job("other")
+
+    assert (await jobs._claim())["id"] == first["id"]
+    # limited is at its limit, so the next claim skips to the other type
+    assert (await jobs._claim())["id"] == other["id"]
+    assert await jobs._claim() is None
+    stored = await mongo.jobs.find_one({"id": second["id"]})
+    assert stored["status"] == "queued" and stored["attempts"] == 0
+
+    await jobs._run(await mongo.jobs.find_one({"id": first["id"]}, {"_id": 0}))
+    assert (await mongo.job_slots.find_one({"_id": "limited"}))["running"] == 0
+    assert (await jobs._claim())["id"] == second["id"]
+
+
+@pytest.mark.anyio
+async def test_requeued_stale_job_gives_its_slot_back(server, mongo, jobs):
+    job = await server.enqueue_job("limited")
+    await jobs._claim()
+    await mongo.jobs.update_one({"id": job["id"]}, {"$set": {"heartbeat_at": "2000-01-01T00:00:00+00:00"}})
+
+    await jobs.requeue_stale()
+    await jobs.requeue_stale()
+    assert (await mongo.job_slots.find_one({"_id": "limited"}))["running"] == 0
+    assert (await jobs._claim())["id"] == job["id"]
@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+
+class FakeClient:
+    def __init__(self, api_key):
+        self.api_key = api_key
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def registry(server, monkeypatch):
+    registry = server.LLMClientRegistry()
+    built = []
+
+    def build(api_key):
+        built.append(FakeClient(api_key))
+        return built[-1]
+
+    monkeypatch.setattr(registry, "_build", build)
+    monkeypatch.setattr(server, "LLM_REQUEST_TIMEOUT", 0)
+    registry.built = built
+    return registry
+
+
+@pytest.mark.anyio
+async def test_one_client_per_settings_version(server, registry):
+    settings = server.OpenAISettings(api_key="sk-1", version=1)
+    clients = await asyncio.gather(*(registry.get(settings) for _ in range(5)))
+    assert len(registry.built) == 1
+    assert all(client is registry.built[0] for client in clients)
+
+    changed = await registry.get(server.OpenAISettings(api_key="sk-1", version=2))
+    assert changed is registry.built[1] and changed is not clients[0]
+    await asyncio.sleep(0.01)
+    assert clients[0].closed and not changed.closed
+
+    await registry.close()
+    assert changed.closed
+
+
+@pytest.mark.anyio
+async def test_saving_settings_rebuilds_the_client(server, mongo, registry):
+    first = await server.save_openai_settings(server.OpenAISettingsUpdate(api_key="sk-1", enabled=True))
+    client = await registry.get(await server.get_openai_settings())
+    second = await server.save_openai_settings(server.OpenAISettingsUpdate(model="gpt-4o-mini"))
+    assert second.version == first.version + 1 and second.api_key == "sk-1"
+    assert await registry.get(await server.get_openai_settings()) is not client
+    await registry.close()
@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+
+
+@pytest.mark.anyio
+async def test_recordings_are_written_off_the_event_loop_and_replayed(server, tmp_path, monkeypatch):
+    path = tmp_path / "recordings.jsonl"
+    recorder = server.RecordingLLMProvider(server.FakeLLMProvider(), str(path))
+    writer_threads = []
+    write = recorder._write
+
+    def tracked_write(line):
+        writer_threads.append(threading.current_thread())
+        write(line)
+
+    monkeypatch.setattr(recorder, "_write", tracked_write)
+    request = server.LLMRequest(
+        endpoint="ai/translate",
+        model="gpt-4o",
+        messages=[{"role": "user", "content": "Hello"}],
+        hints={"text": "Hello", "target_langs": ["hr"]},
+    )
+    recorded = await recorder.complete(request)
+
+    assert writer_threads and writer_threads[0] is not threading.main_thread()
+    replayed = await server.FakeLLMProvider(recordings_path=str(path), strict=True).complete(request)
+    assert replayed.text == recorded.text
+
+
+def test_providers_must_implement_complete(server):
+    class Incomplete(server.LLMProvider):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_record_mode_without_a_recordings_path_fails_at_startup():
+    env = {**os.environ, "LLM_PROVIDER": "record"}
+    env.pop("LLM_RECORDINGS_PATH", None)
+    result = subprocess.run(
+        [sys.executable, "-c", "import server"], cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    assert result.returncode != 0
+    assert "LLM_RECORDINGS_PATH" in result.stderr
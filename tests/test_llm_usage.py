@@ -0,0 +1,59 @@
+import pytest
+from fastapi import HTTPException
+
+
+class Provider:
+    def __init__(self, server, error=None):
+        self.server = server
+        self.error = error
+
+    async def complete(self, request):
+        if self.error:
+            raise self.error
+        return self.server.LLMResult(
+            text="ok", model="gpt-4o-2024-08-06", prompt_tokens=1000, completion_tokens=500, retries=1
+        )
+
+
+def test_cost_uses_the_longest_matching_price(server):
+    # 1000 * 2.50 / 1M + 500 * 10.00 / 1M
+    assert server.estimate_llm_cost("gpt-4o-2024-08-06", 1000, 500) == 0.0075
+    assert server.estimate_llm_cost("gpt-4o-mini", 1000, 500) == 0.00045
+    assert server.estimate_llm_cost("unknown-model", 1000, 500) == 0.0
+
+
+@pytest.mark.anyio
+async def test_calls_are_recorded_and_rolled_up(api, mongo, server):
+    messages = [{"role": "user", "content": "Hi"}]
+    token = server.llm_retry_attempt.set(2)
+    try:
+        await server.chat_completion(Provider(server), "ai/generate", "gpt-4o", messages)
+    finally:
+        server.llm_retry_attempt.reset(token)
+    with pytest.raises(RuntimeError):
+        await server.chat_completion(Provider(server, RuntimeError("boom")), "ai/generate", "gpt-4o", messages)
+
+    calls = await mongo.llm_calls.find({}, {"_id": 0}).sort("created_at", 1).to_list(10)
+    assert [(c["model"], c["total_tokens"], c["retries"], c["cost_usd"], c["success"]) for c in calls] == [
+        ("gpt-4o-2024-08-06", 1500, 3, 0.0075, True),
+        ("gpt-4o", 0, 0, 0.0, False),
+    ]
+    assert calls[1]["error"] == "boom" and calls[0]["source"] == "api"
+
+    stats = (await api.get("/api/admin/ai/llm-stats")).json()
+    [endpoint] = stats["endpoints"]
+    assert (endpoint["endpoint"], endpoint["calls"], endpoint["errors"], endpoint["retries"]) == ("ai/generate", 2, 1, 3)
+    assert endpoint["cost_usd"] == 0.0075
+    assert stats["budget"]["endpoint_used"] == {"ai/generate": 1500}
+
+
+@pytest.mark.anyio
+async def test_exhausted_budget_rejects_the_call(mongo, server, monkeypatch):
+    monkeypatch.setattr(server, "LLM_ENDPOINT_TOKEN_BUDGETS", {"ai/generate": 1000})
+    messages = [{"role": "user", "content": "Hi"}]
+    await server.chat_completion(Provider(server), "ai/generate", "gpt-4o", messages)
+    with pytest.raises(HTTPException) as e:
+        await server.chat_completion(Provider(server), "ai/generate", "gpt-4o", messages)
+    assert e.value.status_code == 429
+    # other endpoints have no budget of their own
+    await server.chat_completion(Provider(server), "ai/translate", "gpt-4o", messages)
@@ -0,0 +1,24 @@
+import asyncio
+
+import pytest
+
+
+@pytest.mark.anyio
+async def test_lag_is_sampled_without_the_stall_watchdog(server):
+    monitor = server.LoopLagMonitor(interval_ms=5, stall_threshold_ms=0)
+    await monitor.start()
+    try:
+        assert monitor.running
+        assert monitor._watchdog is None
+        await asyncio.sleep(0.05)
+        assert len(monitor.lags) > 0
+    finally:
+        await monitor.stop()
+    assert not monitor.running
+
+
+@pytest.mark.anyio
+async def test_zero_interval_turns_the_monitor_off(server):
+    monitor = server.LoopLagMonitor(interval_ms=0, stall_threshold_ms=200)
+    await monitor.start()
+    assert not monitor.running
@@ -0,0 +1,44 @@
+import pytest
+
+
+@pytest.mark.anyio
+async def test_unknown_languages_share_the_english_rendering(api, mongo, server, monkeypatch):
+    monkeypatch.setattr(server, "menu_render_cache", {})
+    await mongo.menus.insert_one(
+        {"name": "header", "items": [{"id": "1", "label": {"en": "Home", "hr": "Početna"}, "url": "/", "order": 0}]}
+    )
+
+    croatian = await api.get("/api/menus/header", params={"lang": "hr"})
+    assert croatian.json()["items"][0]["label"] == "Početna"
+    for lang in ("xx", "en-US", "a" * 500):
+        response = await api.get("/api/menus/header", params={"lang": lang})
+        assert response.json()["lang"] == "en"
+        assert response.json()["items"][0]["label"] == "Home"
+    assert set(server.menu_render_cache) == {("header", "hr"), ("header", "en")}
+
+
+@pytest.mark.anyio
+async def test_edit_through_another_worker_is_served_at_once(api, mongo, server, monkeypatch):
+    monkeypatch.setattr(server, "menu_render_cache", {})
+    await mongo.menus.insert_one({
+        "id": "m1",
+        "name": "header",
+        "items": [{"id": "1", "label": {"en": "Home"}, "url": "/", "order": 0}],
+        "updated_at": "2026-01-01T00:00:00",
+    })
+    first = await api.get("/api/menus/header", params={"lang": "en"})
+    cached = server.menu_render_cache[("header", "en")]
+    assert (await api.get("/api/menus/header", params={"lang": "en"})).json() == first.json()
+    assert server.menu_render_cache[("header", "en")] is cached
+
+    # another worker saves the menu; this worker's cache was not invalidated
+    await mongo.menus.update_one(
+        {"name": "header"},
+        {"$set": {"items.0.label.en": "Start", "updated_at": "2026-01-02T00:00:00"}},
+    )
+    edited = await api.get("/api/menus/header", params={"lang": "en"}, headers={"If-None-Match": first.headers["etag"]})
+    assert edited.status_code == 200
+    assert edited.json()["items"][0]["label"] == "Start"
+
+    await mongo.menus.delete_one({"name": "header"})
+    assert (await api.get("/api/menus/header", params={"lang": "en"})).status_code == 404
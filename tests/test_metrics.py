@@ -0,0 +1,67 @@
+import pytest
+from prometheus_client import REGISTRY
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.mark.anyio
+async def test_requests_are_labelled_by_route_template(api, mongo):
+    route = {"method": "GET", "route": "/api/pages/{page_id}"}
+    before = sample("http_requests_total", **route, status="404")
+    unmatched = sample("http_requests_total", method="GET", route="unmatched", status="404")
+    not_allowed = sample("http_requests_total", method="DELETE", route="/api/faqs", status="405")
+
+    await api.get("/api/pages/one")
+    await api.get("/api/pages/two")
+    await api.get("/no/such/path")
+    await api.delete("/api/faqs")
+
+    assert sample("http_requests_total", **route, status="404") == before + 2
+    assert sample("http_requests_total", method="GET", route="unmatched", status="404") == unmatched + 1
+    assert sample("http_requests_total", method="DELETE", route="/api/faqs", status="405") == not_allowed + 1
+    assert sample("http_requests_in_flight", **route) == 0
+
+    body = (await api.get("/metrics")).text
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/pages/{page_id}"}' in body
+    assert "/api/pages/one" not in body
+
+
+def test_mongo_command_listener_attributes_the_collection(server):
+    class Event:
+        def __init__(self, name, command, request_id):
+            self.command_name = name
+            self.command = command
+            self.connection_id = ("localhost", 27017)
+            self.request_id = request_id
+            self.duration_micros = 1500
+
+    listener = server.MongoCommandMetrics()
+    before = sample("mongo_command_duration_seconds_count", command="find", collection="pages")
+    failures = sample("mongo_command_failures_total", command="getMore", collection="faqs")
+    listener.started(Event("find", {"find": "pages"}, 1))
+    listener.started(Event("getMore", {"getMore": 5, "collection": "faqs"}, 2))
+    listener.started(Event("ping", {"ping": 1}, 3))
+    listener.succeeded(Event("find", {}, 1))
+    listener.failed(Event("getMore", {}, 2))
+    listener.succeeded(Event("ping", {}, 3))
+
+    assert sample("mongo_command_duration_seconds_count", command="find", collection="pages") == before + 1
+    assert sample("mongo_command_failures_total", command="getMore", collection="faqs") == failures + 1
+    assert sample("mongo_command_duration_seconds_count", command="ping", collection="") >= 1
+    assert listener._collections == {}
+
+
+def test_outbound_calls_count_exceptions_as_errors(server):
+    calls = sample("outbound_call_duration_seconds_count", service="smtp", operation="send")
+    errors = sample("outbound_call_errors_total", service="smtp", operation="send", reason="ConnectionError")
+    with pytest.raises(ConnectionError):
+        with server.track_outbound("smtp", "send"):
+            raise ConnectionError()
+    with server.track_outbound("smtp", "send") as call:
+        call.failed("http_500")
+
+    assert sample("outbound_call_duration_seconds_count", service="smtp", operation="send") == calls + 2
+    assert sample("outbound_call_errors_total", service="smtp", operation="send", reason="ConnectionError") == errors + 1
+    assert sample("outbound_call_errors_total", service="smtp", operation="send", reason="http_500") >= 1
@@ -0,0 +1,60 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+
+@pytest.fixture
+def hasher(server, monkeypatch):
+    monkeypatch.setattr(server, "pwd_context", CryptContext(schemes=["bcrypt"], bcrypt__rounds=4))
+    hasher = server.PasswordHasher(workers=1, queue_limit=1)
+    monkeypatch.setattr(server, "password_hasher", hasher)
+    yield hasher
+    hasher.shutdown()
+
+
+@pytest.mark.anyio
+async def test_hash_made_on_the_pool_verifies_at_login(api, mongo, hasher):
+    response = await api.post("/api/admin/users", json={"username": "editor", "password": "s3cret", "role": "admin"})
+    assert response.status_code == 201
+    stored = await mongo.admin_users.find_one({"username": "editor"})
+    assert stored["password_hash"].startswith("$2b$04$")
+
+    assert await hasher.verify_and_update("s3cret", stored["password_hash"]) == (True, None)
+    assert (await hasher.verify_and_update("wrong", stored["password_hash"]))[0] is False
+    login = await api.post("/api/auth/login", json={"username": "editor", "password": "s3cret"})
+    assert login.status_code == 200 and login.json()["access_token"]
+    assert hasher.stats["calls"] == 4
+
+
+@pytest.mark.anyio
+async def test_outdated_cost_is_rehashed_on_login(api, mongo, hasher):
+    old_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=5).hash("s3cret")
+    await mongo.admin_users.insert_one({"id": "u1", "username": "editor", "password_hash": old_hash, "role": "admin"})
+    assert (await api.post("/api/auth/login", json={"username": "editor", "password": "s3cret"})).status_code == 200
+    assert (await mongo.admin_users.find_one({"id": "u1"}))["password_hash"].startswith("$2b$04$")
+    assert hasher.stats["rehashed"] == 1
+
+
+@pytest.mark.anyio
+async def test_hashing_runs_off_the_loop_and_sheds_excess_calls(server, hasher, monkeypatch):
+    release = threading.Event()
+    threads = []
+
+    def slow_hash(password):
+        threads.append(threading.current_thread().name)
+        release.wait(5)
+        return password
+
+    monkeypatch.setattr(server, "pwd_context", type("Context", (), {"hash": staticmethod(slow_hash)})())
+    running = [asyncio.ensure_future(hasher.hash(str(n))) for n in range(2)]  # one hashing, one queued
+    await asyncio.sleep(0.01)
+    with pytest.raises(HTTPException) as e:
+        await hasher.hash("third")
+    assert e.value.status_code == 503 and hasher.stats["rejected"] == 1
+
+    release.set()
+    assert await asyncio.gather(*running) == ["0", "1"]
+    assert all(name.startswith("bcrypt") for name in threads)
@@ -0,0 +1,150 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+
+def ops(server, *operations):
+    return [server.JSONPatchOperation(**op) for op in operations]
+
+
+def test_json_pointer_round_trip(server):
+    assert server.parse_json_pointer("/title/en") == ["title", "en"]
+    assert server.parse_json_pointer("/content/a~1b/c~0d") == ["content", "a/b", "c~d"]
+    assert server.format_json_pointer(["content", "a/b", "c~d"]) == "/content/a~1b/c~0d"
+
+
+@pytest.mark.parametrize("pointer", ["", "/", "title/en"])
+def test_json_pointer_rejects_invalid(server, pointer):
+    with pytest.raises(HTTPException) as e:
+        server.parse_json_pointer(pointer)
+    assert e.value.status_code == 400
+
+
+def test_mongo_field_path_rejects_operators(server):
+    with pytest.raises(HTTPException):
+        server.plan_patch(
+            ops(server, {"op": "add", "path": "/content/$where", "value": 1}),
+            server.CMS_CONTENT_PATCH_FIELDS,
+            server.CMSContentUpdate,
+        )
+
+
+def test_section_fields_use_array_filters(server):
+    plan = server.plan_patch(
+        ops(
+            server,
+            {"op": "replace", "path": "/sections/hero/order", "value": 2},
+            {"op": "replace", "path": "/sections/cta/content/label/en", "value": "Go"},
+            {"op": "replace", "path": "/title/en", "value": "Home"},
+        ),
+        server.PAGE_PATCH_FIELDS,
+        server.PageUpdate,
+    )
+    assert len(plan.batches) == 1
+    batch = plan.batches[0]
+    assert batch["update"] == {
+        "$set": {"sections.$[s0].order": 2, "sections.$[s1].content.label.en": "Go", "title.en": "Home"}
+    }
+    assert batch["array_filters"] == {"s0": {"s0.id": "hero"}, "s1": {"s1.id": "cta"}}
+
+
+def test_overlapping_operations_are_split_into_batches(server):
+    plan = server.plan_patch(
+        ops(
+            server,
+            {"op": "replace", "path": "/sections/hero/order", "value": 2},
+            {"op": "remove", "path": "/sections/cta"},
+            {"op": "replace", "path": "/title/en", "value": "Home"},
+            {"op": "replace", "path": "/title/en", "value": "Start"},
+        ),
+        server.PAGE_PATCH_FIELDS,
+        server.PageUpdate,
+    )
+    assert [batch["update"] for batch in plan.batches] == [
+        {"$set": {"sections.$[s0].order": 2}},
+        {"$pull": {"sections": {"id": "cta"}}, "$set": {"title.en": "Home"}},
+        {"$set": {"title.en": "Start"}},
+    ]
+    assert plan.batches[0]["array_filters"] == {"s0": {"s0.id": "hero"}}
+    assert plan.batches[1]["array_filters"] == {}
+
+
+def test_test_operation_compares_values_not_queries(server):
+    doc = {"content": {"a": None, "nested": {"x": 1, "y": 2}}}
+    fields = server.CMS_CONTENT_PATCH_FIELDS
+    with pytest.raises(HTTPException) as e:
+        server.check_patch_operations(doc, ops(server, {"op": "test", "path": "/content/a", "value": {"$ne": 1}}), fields)
+    assert e.value.status_code == 409
+    # Key order does not matter for object equality
+    server.check_patch_operations(
+        doc, ops(server, {"op": "test", "path": "/content/nested", "value": {"y": 2, "x": 1}}), fields
+    )
+
+
+def test_replace_of_missing_path_fails(server):
+    doc = {"title": {"en": "Home"}, "sections": [{"id": "hero", "content": {}}]}
+    fields = server.PAGE_PATCH_FIELDS
+    for path in ("/title/de", "/sections/cta", "/sections/hero/content/headline"):
+        with pytest.raises(HTTPException) as e:
+            server.check_patch_operations(doc, ops(server, {"op": "replace", "path": path, "value": "x"}), fields)
+        assert e.value.status_code == 409
+    server.check_patch_operations(doc, ops(server, {"op": "add", "path": "/title/de", "value": "Start"}), fields)
+
+
+@pytest.mark.anyio
+async def test_patch_endpoint(api, mongo):
+    await mongo.cms_content.insert_one(
+        {"key": "home", "content_type": "section", "content": {"a": {"b": 1}}, "updated_at": "2026-01-01T00:00:00"}
+    )
+
+    response = await api.patch("/api/cms/content/home", json=[{"op": "replace", "path": "/content/a/c", "value": 2}])
+    assert response.status_code == 409
+
+    response = await api.patch("/api/cms/content/home", json={"content": {"a": {"c": 2}, "new": {"d": 3}}})
+    assert response.status_code == 200
+    assert response.json()["content"] == {"a": {"b": 1, "c": 2}, "new": {"d": 3}}
+
+    response = await api.patch(
+        "/api/cms/content/home",
+        json=[
+            {"op": "test", "path": "/content/a", "value": {"c": 2, "b": 1}},
+            {"op": "remove", "path": "/content/new"},
+        ],
+    )
+    assert response.status_code == 200
+    assert response.json()["content"] == {"a": {"b": 1, "c": 2}}
+
+
+class RacingCollection:
+    """A collection where another writer commits right after each read."""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def find_one(self, *args, **kwargs):
+        doc = await self.collection.find_one(*args, **kwargs)
+        await self.collection.update_one({"key": "home"}, {"$set": {"updated_at": datetime.now(timezone.utc).isoformat()}})
+        return doc
+
+    def __getattr__(self, name):
+        return getattr(self.collection, name)
+
+
+@pytest.mark.anyio
+async def test_patch_detects_concurrent_write(server, mongo):
+    await mongo.cms_content.insert_one(
+        {"key": "home", "content_type": "section", "content": {"a": 1}, "updated_at": "2026-01-01T00:00:00"}
+    )
+    with pytest.raises(HTTPException) as e:
+        await server.apply_patch(
+            RacingCollection(mongo.cms_content),
+            "key",
+            "home",
+            [server.JSONPatchOperation(op="replace", path="/content/a", value=2)],
+            server.CMS_CONTENT_PATCH_FIELDS,
+            server.CMSContentUpdate,
+            "Content not found",
+        )
+    assert e.value.status_code == 409
+    assert (await mongo.cms_content.find_one({"key": "home"}))["content"] == {"a": 1}
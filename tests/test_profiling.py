@@ -0,0 +1,54 @@
+import asyncio
+import marshal
+
+import httpx
+import pytest
+
+
+@pytest.mark.anyio
+async def test_only_admins_get_profiled(api, mongo):
+    anonymous = await api.get("/api/faqs", headers={"Authorization": "", "X-Profile": "cprofile"})
+    assert anonymous.status_code == 200 and "x-profile-id" not in anonymous.headers
+    forged = await api.get("/api/faqs", headers={"Authorization": "Bearer forged.token", "X-Profile": "cprofile"})
+    assert forged.status_code == 200 and "x-profile-id" not in forged.headers
+    unknown_mode = await api.get("/api/faqs", headers={"X-Profile": "perf"})
+    assert "x-profile-id" not in unknown_mode.headers
+    assert await mongo.request_profiles.count_documents({}) == 0
+
+    profiled = await api.get("/api/faqs", headers={"X-Profile": "cprofile"})
+    assert profiled.status_code == 200
+    profile_id = profiled.headers["x-profile-id"]
+    stored = (await api.get(f"/api/admin/profiles/{profile_id}")).json()
+    assert (stored["admin"], stored["route"], stored["status"], stored["mode"]) == (
+        "admin", "GET /api/faqs", 200, "cprofile"
+    )
+    assert stored["top"]
+    artifact = await api.get(f"/api/admin/profiles/{profile_id}/artifact")
+    assert isinstance(marshal.loads(artifact.content), dict)
+
+
+@pytest.mark.anyio
+async def test_concurrent_request_is_served_unprofiled_while_busy(server, mongo):
+    tokens = await server.issue_session_tokens("admin", "owner")
+    release = asyncio.Event()
+
+    async def app(scope, receive, send):
+        if scope["path"] == "/slow":
+            await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    middleware = server.ProfilingMiddleware(app)
+    transport = httpx.ASGITransport(app=middleware)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}", "X-Profile": "sampling"}
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", headers=headers) as client:
+        slow = asyncio.ensure_future(client.get("/slow"))
+        while not middleware._busy:
+            await asyncio.sleep(0.001)
+        busy = await client.get("/fast")
+        assert busy.headers["x-profile"] == "busy" and "x-profile-id" not in busy.headers
+        release.set()
+        assert "x-profile-id" in (await slow).headers
+        assert "x-profile-id" in (await client.get("/fast")).headers
+    profiles = await mongo.request_profiles.find({}, {"_id": 0, "path": 1, "samples": 1}).to_list(10)
+    assert sorted(p["path"] for p in profiles) == ["/fast", "/slow"]
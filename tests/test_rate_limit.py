@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+
+@pytest.mark.anyio
+async def test_memory_store_evicts_least_recently_used(server):
+    store = server.MemoryRateLimitStore(max_keys=2)
+    assert await store.take("a", 1, 0) == 0
+    assert await store.take("b", 1, 0) == 0
+    assert await store.take("a", 1, 0) > 0  # a is now the most recently used
+    assert await store.take("c", 1, 0) == 0  # evicts b
+    assert list(store._buckets) == ["a", "c"]
+    assert await store.take("a", 1, 0) > 0
+
+
+@pytest.mark.anyio
+async def test_memory_store_buckets_keep_their_own_refill(server):
+    store = server.MemoryRateLimitStore()
+    assert await store.take("slow", 1, 0.001) == 0
+    assert await store.take("fast", 1, 1000) == 0
+    await asyncio.sleep(0.01)
+    assert await store.take("fast", 1, 1000) == 0
+    assert await store.take("slow", 1, 0.001) > 0
+
+
+@pytest.mark.anyio
+async def test_concurrency_slot_is_held_while_the_bucket_is_checked(server, monkeypatch):
+    limiter = server.RateLimiter(server.MemoryRateLimitStore())
+    monkeypatch.setattr(server, "rate_limiter", limiter)
+    release = asyncio.Event()
+
+    async def slow_hit(key, capacity, per_minute, reason):
+        await release.wait()
+        if reason == "ip" and key.endswith("blocked"):
+            raise server.RateLimiter.reject(1)
+
+    monkeypatch.setattr(limiter, "hit", slow_hit)
+    dependency = server.rate_limited("contact", concurrency=1)
+
+    class Client:
+        def __init__(self, host):
+            self.client = type("Peer", (), {"host": host})()
+            self.headers = {}
+
+    first = dependency(Client("blocked"))
+    pending = asyncio.ensure_future(first.__anext__())
+    await asyncio.sleep(0)
+    with pytest.raises(HTTPException) as e:
+        await dependency(Client("other")).__anext__()
+    assert e.value.status_code == 429
+    assert limiter.stats["rejected_concurrency"] == 1
+
+    release.set()
+    with pytest.raises(HTTPException):
+        await pending
+    assert limiter._in_flight["contact"] == 0
+
+
+@pytest.mark.anyio
+async def test_mongo_store_retries_a_racing_upsert(server, monkeypatch):
+    from pymongo.errors import DuplicateKeyError
+
+    store = server.MongoRateLimitStore()
+    calls = []
+
+    async def take(key, capacity, refill_per_second):
+        calls.append(key)
+        if len(calls) == 1:
+            raise DuplicateKeyError("E11000 duplicate key error")
+        return 0.0
+
+    monkeypatch.setattr(store, "_take", take)
+    assert await store.take("ip:contact:1.2.3.4", 10, 1) == 0
+    assert calls == ["ip:contact:1.2.3.4"] * 2
@@ -0,0 +1,98 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+
+def test_query_shape_redacts_values(server):
+    query = {
+        "email": "ana@example.com",
+        "age": {"$gt": 30},
+        "$or": [{"slug": "a"}, {"tags": {"$in": ["x", "y"]}}],
+        "location": [15.9, 45.8],
+    }
+    assert server.query_shape(query) == {
+        "email": "?",
+        "age": {"$gt": "?"},
+        "$or": [{"slug": "?"}, {"tags": {"$in": "?"}}],
+        "location": "?",
+    }
+    assert server.query_shape([{"$match": {"id": "p1"}}, {"$limit": 5}]) == [{"$match": {"id": "?"}}, {"$limit": "?"}]
+    assert "ana@example.com" not in json.dumps(server.query_shape(query))
+
+
+def test_plan_summary_skips_rejected_plans(server):
+    explain = {"queryPlanner": {
+        "winningPlan": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "slug_1"}},
+        "rejectedPlans": [{"stage": "COLLSCAN"}],
+    }}
+    stages = server.find_plan_stages(explain)
+    assert server.summarize_plan(stages) == "FETCH <- IXSCAN slug_1"
+
+
+def entry(command_name, command, duration_ms=250.0):
+    return {
+        "command": command,
+        "collection": "blog_posts",
+        "route": "GET /api/blog/posts",
+        "database": "test_database",
+        "command_name": command_name,
+        "duration_ms": duration_ms,
+        "failed": False,
+        "at": datetime.now(timezone.utc),
+    }
+
+
+@pytest.mark.anyio
+async def test_each_shape_is_explained_once(server, mongo, monkeypatch):
+    log = server.SlowQueryLog(threshold_ms=100)
+    explained = []
+
+    async def explain(database, command, name):
+        explained.append(command)
+        return {"collscan": True, "plan_summary": "COLLSCAN", "plan": "{}"}
+
+    monkeypatch.setattr(log, "explain", explain)
+    await log.record(entry("find", {"find": "blog_posts", "filter": {"slug": "a"}, "sort": {"created_at": -1}}))
+    await log.record(entry("find", {"find": "blog_posts", "filter": {"slug": "b"}, "sort": {"created_at": -1}}))
+    await log.record(entry("update", {"update": "blog_posts", "updates": [{"q": {"id": "x"}, "u": {"$set": {"a": 1}}}]}))
+
+    docs = await mongo.slow_queries.find({}, {"_id": 0}).to_list(10)
+    assert len(explained) == 2
+    assert docs[0]["shape_hash"] == docs[1]["shape_hash"] != docs[2]["shape_hash"]
+    assert json.loads(docs[0]["shape"]) == {"filter": {"slug": "?"}, "sort": ["created_at"]}
+    assert json.loads(docs[2]["shape"]) == {"filter": {"id": "?"}}
+    assert all(doc["collscan"] and doc["plan_summary"] == "COLLSCAN" for doc in docs)
+    assert "plan" in docs[0] and "plan" not in docs[1]
+
+
+@pytest.mark.anyio
+async def test_listener_queues_only_slow_commands(server):
+    class Event:
+        def __init__(self, name, request_id, command=None, duration_micros=0):
+            self.command_name = name
+            self.command = command or {}
+            self.connection_id = ("localhost", 27017)
+            self.request_id = request_id
+            self.duration_micros = duration_micros
+            self.database_name = "test_database"
+
+    log = server.SlowQueryLog(threshold_ms=100)
+    log._loop = asyncio.get_running_loop()
+    token = server.request_route.set("GET /api/faqs")
+    try:
+        log.started(Event("find", 1, {"find": "faqs", "filter": {}}))
+        log.started(Event("find", 2, {"find": "faqs", "filter": {}}))
+        log.started(Event("insert", 3, {"insert": "faqs"}))
+        log.started(Event("find", 4, {"find": "slow_queries"}))
+    finally:
+        server.request_route.reset(token)
+    log.succeeded(Event("find", 1, duration_micros=50_000))
+    log.failed(Event("find", 2, duration_micros=150_000))
+    await asyncio.sleep(0)
+
+    assert log._queue.qsize() == 1
+    queued = log._queue.get_nowait()
+    assert (queued["route"], queued["duration_ms"], queued["failed"]) == ("GET /api/faqs", 150.0, True)
+    assert log._pending == {}
@@ -0,0 +1,58 @@
+import fnmatch
+
+import pytest
+
+PATTERNS = ["*", "/", "/blog/*", "/blog*", "/blog/?", "/contact", "contact/", "/*/pricing", "/[ab]*", "/blog/*/amp"]
+PATHS = ["/", "", "/blog", "/blog/", "/blog/x", "/blog/post/amp", "/blogs", "/contact", "/contact/?utm=1",
+         "/de/pricing", "/about", "/Blog/x", "/contact#form"]
+
+
+def rule(server, pattern, n, **fields):
+    return server.SnippetRule(name=f"r{n}", path_pattern=pattern, head_html=f"<h{n}>", **fields)
+
+
+@pytest.mark.parametrize("path", PATHS)
+def test_matches_the_same_rules_as_glob_matching(server, path):
+    rules = [rule(server, pattern, n) for n, pattern in enumerate(PATTERNS)]
+    matcher = server.SnippetMatcher()
+    matcher.compile(server.SnippetSettings(rules=rules))
+
+    normalized = server.normalize_snippet_path(path)
+    expected = [
+        n for n, r in enumerate(rules)
+        if fnmatch.fnmatchcase(normalized, server.normalize_snippet_path(r.path_pattern))
+    ]
+    assert matcher.match(path) == expected
+    # matching rules are merged in rule order, after the global HTML
+    assert matcher.resolve(path)["head_html"] == "\n".join(f"<h{n}>" for n in expected)
+
+
+def test_inactive_and_empty_rules_are_skipped(server):
+    matcher = server.SnippetMatcher()
+    matcher.compile(server.SnippetSettings(
+        global_head_html="<g>",
+        rules=[
+            rule(server, "/blog/*", 1, active=False),
+            server.SnippetRule(name="empty", path_pattern="/blog/*"),
+            rule(server, "/blog/*", 2),
+        ],
+    ))
+    assert matcher.resolve("/blog/x")["head_html"] == "<g>\n<h2>"
+
+
+@pytest.mark.anyio
+async def test_per_path_endpoint_follows_saved_rules(api, server, monkeypatch):
+    monkeypatch.setattr(server, "snippet_matcher", server.SnippetMatcher())
+    await api.post("/api/admin/settings/snippets/rules", json={"name": "blog", "path_pattern": "/blog/*", "body_html": "<b>"})
+
+    response = await api.get("/api/settings/snippets", params={"path": "/blog/hello"})
+    assert response.json() == {"path": "/blog/hello", "head_html": "", "body_html": "<b>"}
+    assert response.headers["cache-control"].startswith("public, max-age=")
+    etag = response.headers["etag"]
+    cached = await api.get("/api/settings/snippets", params={"path": "/blog/hello"}, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+
+    await api.put("/api/admin/settings/snippets", json={"global_body_html": "<g>"})
+    changed = await api.get("/api/settings/snippets", params={"path": "/blog/hello"}, headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.json()["body_html"] == "<g>\n<b>"
+    assert (await api.get("/api/settings/snippets", params={"path": "/contact"})).json()["body_html"] == "<g>"
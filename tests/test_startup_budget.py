@@ -0,0 +1,35 @@
+import importlib.util
+import os
+from pathlib import Path
+
+PROFILE_SCRIPT = Path(__file__).resolve().parent.parent / "backend" / "scripts" / "import_profile.py"
+# Generous, since CI machines vary; scripts/import_profile.py reports the details
+STARTUP_BUDGET_MS = float(os.environ.get("STARTUP_BUDGET_MS", "3000"))
+
+
+def load_import_profile():
+    spec = importlib.util.spec_from_file_location("import_profile", PROFILE_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_import_and_create_app_stay_within_budget():
+    import_profile = load_import_profile()
+    report, _ = import_profile.run_startup(importtime=False)
+    total_ms = report["import_ms"] + report["create_app_ms"]
+    assert total_ms <= STARTUP_BUDGET_MS, f"startup took {total_ms:.0f} ms, budget is {STARTUP_BUDGET_MS:.0f} ms"
+
+
+def test_lazy_subsystems_are_not_imported_at_startup():
+    import_profile = load_import_profile()
+    report, _ = import_profile.run_startup(importtime=False)
+    loaded = {"motor", "passlib", "aiohttp", "openai"} & set(report["modules"])
+    assert not loaded, f"imported at startup but meant to load on first use: {sorted(loaded)}"
+
+
+def test_api_routes_keep_their_prefix(server):
+    application = server.create_app(fast_startup=True)
+    paths = {route.path for route in application.routes}
+    assert {route.path for route in server.api_router.routes} <= paths
+    assert not [path for path in paths if path.startswith("/api/api")]
@@ -0,0 +1,60 @@
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+
+async def generate(server, monkeypatch, **spec):
+    database = AsyncMongoMockClient()["synthetic"]
+    monkeypatch.setattr(server, "db", database)
+    await server.generate_synthetic_data(server.SyntheticDataRequest(**spec))
+    return {
+        name: await database[name].find({}, {"_id": 0}).to_list(None)
+        for name in server.SYNTHETIC_COLLECTIONS
+    }
+
+
+SPEC = {"blog_posts": 3, "pages": 2, "sections_per_page": 4, "subscribers": 5, "faqs": 2, "testimonials": 2,
+        "contact_messages": 3}
+
+
+@pytest.mark.anyio
+async def test_same_seed_gives_the_same_documents(server, monkeypatch):
+    first = await generate(server, monkeypatch, seed=7, **SPEC)
+    again = await generate(server, monkeypatch, seed=7, batch_size=2, **SPEC)
+    assert first == again
+    assert all(len(first[name]) for name in server.SYNTHETIC_COLLECTIONS)
+
+    other_seed = await generate(server, monkeypatch, seed=8, **SPEC)
+    assert other_seed["blog_posts"] != first["blog_posts"]
+
+
+@pytest.mark.anyio
+async def test_counts_do_not_shift_other_collections(server, monkeypatch):
+    first = await generate(server, monkeypatch, seed=7, **SPEC)
+    more_posts = await generate(server, monkeypatch, seed=7, **{**SPEC, "blog_posts": 10})
+    assert more_posts["blog_posts"][:3] == first["blog_posts"]
+    assert more_posts["faqs"] == first["faqs"]
+
+
+@pytest.mark.anyio
+async def test_documents_match_the_api_models(server, monkeypatch):
+    data = await generate(server, monkeypatch, seed=1, **SPEC)
+    for doc in data["blog_posts"]:
+        server.BlogPost(**doc)
+    for doc in data["pages"]:
+        server.Page(**doc)
+    for doc in data["faqs"]:
+        server.FAQ(**doc)
+    for doc in data["testimonials"]:
+        server.Testimonial(**doc)
+    assert len({doc["slug"] for doc in data["blog_posts"]}) == 3
+
+
+@pytest.mark.anyio
+async def test_replace_only_removes_synthetic_documents(server, mongo):
+    await mongo.faqs.insert_one({"id": "real", "question": {"en": "Q"}})
+    spec = server.SyntheticDataRequest(seed=1, faqs=3)
+    await server.generate_synthetic_data(spec)
+    result = await server.generate_synthetic_data(spec.model_copy(update={"replace": True}))
+    assert result["deleted"]["faqs"] == 3
+    assert await mongo.faqs.count_documents({}) == 4
+    assert await mongo.faqs.count_documents({"id": "real"}) == 1
@@ -0,0 +1,41 @@
+import fastapi.routing
+import pytest
+
+
+@pytest.mark.anyio
+async def test_fastapi_steps_are_traced(api, mongo, server, monkeypatch):
+    # instrument_fastapi patches private fastapi.routing functions; this fails
+    # when a FastAPI upgrade renames them or stops looking them up per request
+    for attribute in server.FASTAPI_TRACED_STEPS:
+        monkeypatch.setattr(fastapi.routing, attribute, getattr(fastapi.routing, attribute))
+    monkeypatch.setattr(server, "TRACE_SAMPLE_RATE", 1.0)
+    traces = []
+    monkeypatch.setattr(server.span_exporter, "export", traces.append)
+    server.instrument_fastapi()
+    server.instrument_fastapi()  # idempotent
+
+    response = await api.get("/api/faqs")
+    assert response.status_code == 200
+    (trace,) = traces
+    names = [span.name for span in trace.spans]
+    assert names[0] == "GET /api/faqs"
+    for step in ("fastapi.validate", "fastapi.handler", "fastapi.serialize"):
+        assert names.count(step) == 1
+    children = {span.name: span for span in trace.spans if span.parent_id == trace.root.span_id}
+    assert {"fastapi.validate", "fastapi.handler", "fastapi.serialize"} <= set(children)
+    assert children["fastapi.validate"].end_ns <= children["fastapi.handler"].start_ns
+    assert children["fastapi.handler"].end_ns <= children["fastapi.serialize"].start_ns
+
+
+@pytest.mark.anyio
+async def test_span_file_is_rotated_by_size(server, tmp_path):
+    path = tmp_path / "spans.jsonl"
+    exporter = server.SpanFileExporter(path, max_bytes=100)
+    for batch in range(3):
+        exporter._buffer = [f'{{"batch":{batch},"pad":"{"x" * 40}"}}']
+        await exporter.flush()
+
+    assert path.read_text().count("\n") == 1
+    assert '"batch":2' in path.read_text()
+    assert '"batch":1' in (tmp_path / "spans.jsonl.1").read_text()
+    assert not (tmp_path / "spans.jsonl.2").exists()
@@ -0,0 +1,77 @@
+import pytest
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+
+ITEMS = {"title": ("Hello", ["hr", "de"]), "excerpt": ("Welcome", ["hr", "de"])}
+
+
+@pytest.mark.anyio
+async def test_unparsable_fallback_reply_is_a_failure(server, mongo, monkeypatch):
+    async def batch(items, source_lang, target_langs):
+        return {"title": {"hr": "Bok", "de": "Hallo"}}  # excerpt missing from the reply
+
+    async def single(text, source_lang, target_langs):
+        return {"error": "Failed to parse translations", "raw": "not json"}
+
+    monkeypatch.setattr(server, "request_batch_translations", batch)
+    monkeypatch.setattr(server, "request_translations", single)
+    results = await server.translate_batch(ITEMS)
+    assert results["title"] == {"hr": "Bok", "de": "Hallo"}
+    assert isinstance(results["excerpt"], ValueError)
+    assert await mongo.translation_memory.count_documents({"source_text": "Welcome"}) == 0
+
+
+@pytest.mark.anyio
+async def test_rate_limited_batch_does_not_fan_out(server, mongo, monkeypatch):
+    single_calls = []
+
+    async def batch(items, source_lang, target_langs):
+        raise RateLimited()
+
+    async def single(text, source_lang, target_langs):
+        single_calls.append(text)
+        return {"hr": "x", "de": "y"}
+
+    monkeypatch.setattr(server, "request_batch_translations", batch)
+    monkeypatch.setattr(server, "request_translations", single)
+    scheduler = server.TranslationScheduler(max_retries=0, tokens_per_minute=0)
+    results = await server.translate_batch(ITEMS, scheduler=scheduler)
+    assert all(isinstance(value, RateLimited) for value in results.values())
+    assert single_calls == []
+
+
+@pytest.mark.anyio
+async def test_page_edited_while_translating_keeps_the_edit(server, mongo, monkeypatch):
+    await mongo.pages.insert_one({
+        "id": "p1",
+        "slug": "home",
+        "title": {"en": "Home"},
+        "meta_description": {"en": "About us"},
+        "sections": [],
+        "updated_at": "2026-01-01T00:00:00",
+    })
+    calls = []
+
+    async def batch(items, source_lang="en", scheduler=None):
+        calls.append(sorted(items))
+        if len(calls) == 1:
+            # an admin edit lands while the first translation is in flight
+            await mongo.pages.update_one(
+                {"id": "p1"}, {"$set": {"meta_description": {"en": "Edited"}, "updated_at": "2026-01-02T00:00:00"}}
+            )
+        return {path: {lang: f"{lang}:{text}" for lang in langs} for path, (text, langs) in items.items()}
+
+    monkeypatch.setattr(server, "translate_batch", batch)
+    page = await mongo.pages.find_one({"id": "p1"}, {"_id": 0})
+    changed, failed = await server.translate_page_document(page, server.TranslationScheduler())
+
+    assert (changed, failed) == (True, 0)
+    assert len(calls) == 2
+    stored = await mongo.pages.find_one({"id": "p1"})
+    assert stored["meta_description"]["en"] == "Edited"
+    assert stored["meta_description"]["de"] == "de:Edited"
+    assert stored["title"]["hr"] == "hr:Home"
+    assert stored["updated_at"] > "2026-01-02T00:00:00"
@@ -0,0 +1,63 @@
+import pytest
+
+
+def post(server):
+    old = server.source_fingerprint("Hi")
+    return {
+        "id": "b1",
+        "slug": "hello",
+        "title": {"en": "Hello", "hr": "Bok", "de": "Hallo", "sl": "Živjo"},
+        "excerpt": {"en": "Welcome", "hr": "Dobrodošli", "de": "Willkommen", "sl": "Dobrodošli"},
+        "content": {"en": "<p>Text</p>", "hr": "<p>Tekst</p>", "de": "<p>Text</p>"},
+        "translation_sources": {"title": {"hr": old, "de": old, "sl": server.source_fingerprint("Hello")}},
+        "updated_at": "2026-01-01T00:00:00",
+    }
+
+
+def test_fingerprint_ignores_whitespace(server):
+    assert server.source_fingerprint("Hello  world\n") == server.source_fingerprint("Hello world")
+    assert server.source_fingerprint("Hello world") != server.source_fingerprint("Hello World")
+
+
+def test_pending_languages(server):
+    doc = post(server)
+    sources = doc["translation_sources"]
+    assert server.pending_languages(doc["title"], sources["title"]) == ([], ["hr", "de"])
+    # hand-written translations without a fingerprint are never stale
+    assert server.pending_languages(doc["excerpt"], {}) == ([], [])
+    assert server.pending_languages(doc["content"], {}) == (["sl"], [])
+    assert server.pending_languages({"en": " "}, {}) == ([], [])
+
+
+@pytest.mark.anyio
+async def test_dry_run_lists_stale_and_missing_fields(api, mongo, server):
+    await mongo.blog_posts.insert_one(post(server))
+    report = (await api.post("/api/admin/ai/translate-dirty", params={"dry_run": True})).json()
+    assert (report["documents"], report["missing_translations"], report["stale_translations"]) == (1, 1, 2)
+    assert [(f["field"], f["missing"], f["stale"]) for f in report["details"][0]["fields"]] == [
+        ("title", [], ["hr", "de"]),
+        ("content", ["sl"], []),
+    ]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("include_stale, requested", [(False, ["content"]), (True, ["content", "title"])])
+async def test_only_dirty_fields_are_retranslated(server, mongo, monkeypatch, include_stale, requested):
+    await mongo.blog_posts.insert_one(post(server))
+    sent = {}
+
+    async def batch(items, source_lang="en", scheduler=None):
+        sent.update(items)
+        return {path: {lang: f"{lang}:{text}" for lang in langs} for path, (text, langs) in items.items()}
+
+    monkeypatch.setattr(server, "translate_batch", batch)
+    doc = await mongo.blog_posts.find_one({"id": "b1"}, {"_id": 0})
+    assert await server.translate_blog_document(doc, server.TranslationScheduler(), include_stale) == (True, 0)
+    assert sorted(sent) == sorted(requested)
+
+    stored = await mongo.blog_posts.find_one({"id": "b1"})
+    hello, welcome = server.source_fingerprint("Hello"), server.source_fingerprint("Welcome")
+    assert stored["content"]["sl"] == "sl:<p>Text</p>"
+    assert stored["translation_sources"]["excerpt"] == {"hr": welcome, "de": welcome, "sl": welcome}
+    assert stored["title"]["hr"] == ("hr:Hello" if include_stale else "Bok")
+    assert (stored["translation_sources"]["title"]["hr"] == hello) is include_stale
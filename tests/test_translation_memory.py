@@ -0,0 +1,36 @@
+import pytest
+
+
+@pytest.mark.anyio
+async def test_only_missing_languages_reach_the_llm(server, mongo, monkeypatch):
+    monkeypatch.setattr(server, "translation_memory_stats", {"exact_hits": 0, "normalized_hits": 0, "misses": 0})
+    requests = []
+
+    async def request_translations(text, source_lang, target_langs):
+        requests.append((text, target_langs))
+        return {lang: f"{lang}:{text}" for lang in target_langs}
+
+    monkeypatch.setattr(server, "request_translations", request_translations)
+
+    assert await server.translate_text("Hello world", "en", ["hr"]) == {"hr": "hr:Hello world"}
+    assert await server.translate_text("Hello world", "en", ["hr", "de"]) == {
+        "hr": "hr:Hello world",
+        "de": "de:Hello world",
+    }
+    # Whitespace-only differences reuse the stored translations
+    assert await server.translate_text("Hello   world\n", "en", ["hr", "de"]) == {
+        "hr": "hr:Hello world",
+        "de": "de:Hello world",
+    }
+    assert requests == [("Hello world", ["hr"]), ("Hello world", ["de"])]
+    assert server.translation_memory_stats == {"exact_hits": 1, "normalized_hits": 2, "misses": 2}
+    entry = await mongo.translation_memory.find_one({"source_text": "Hello world", "target_lang": "hr"})
+    assert entry["hits"] == 2
+
+
+@pytest.mark.anyio
+async def test_memory_is_per_model_and_source_language(server, mongo):
+    await server.store_translation_memory("Hello", "en", {"hr": "Bok", "de": ""}, "gpt-4o")
+    assert await server.lookup_translation_memory("Hello", "en", ["hr", "de"], "gpt-4o") == {"hr": "Bok"}
+    assert await server.lookup_translation_memory("Hello", "en", ["hr"], "gpt-4o-mini") == {}
+    assert await server.lookup_translation_memory("Hello", "de", ["hr"], "gpt-4o") == {}
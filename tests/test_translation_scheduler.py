@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+    def __init__(self, retry_after):
+        super().__init__("rate limited")
+        self.response = type("Response", (), {"headers": {"retry-after": str(retry_after)}})()
+
+
+@pytest.mark.anyio
+async def test_calls_stay_within_the_concurrency_limit(server):
+    scheduler = server.TranslationScheduler(max_concurrency=2, tokens_per_minute=0)
+    in_flight = peak = 0
+
+    async def call():
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        return "ok"
+
+    results = await asyncio.gather(*(scheduler.submit(call, 10) for _ in range(8)))
+    assert results == ["ok"] * 8
+    assert peak == 2
+
+
+@pytest.mark.anyio
+async def test_rate_limit_halves_concurrency_and_retries_after_the_delay(server):
+    scheduler = server.TranslationScheduler(max_concurrency=4, tokens_per_minute=0)
+    attempts = []
+
+    async def call():
+        attempts.append(server.llm_retry_attempt.get())
+        if len(attempts) == 1:
+            raise RateLimited(0.01)
+        return "ok"
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    assert await scheduler.submit(call, 10) == "ok"
+    assert loop.time() - started >= 0.01
+    assert attempts == [0, 1]
+    # one success after the halving is not yet enough to grow the limit back
+    assert scheduler.concurrency_limit == 2
+    assert await scheduler.submit(call, 10) == "ok"
+    assert scheduler.concurrency_limit == 3
+
+
+@pytest.mark.anyio
+async def test_rate_limit_gives_up_after_max_retries(server):
+    scheduler = server.TranslationScheduler(max_retries=1, tokens_per_minute=0)
+    calls = []
+
+    async def call():
+        calls.append(1)
+        raise RateLimited(0.01)
+
+    with pytest.raises(RateLimited):
+        await scheduler.submit(call, 10)
+    assert len(calls) == 2